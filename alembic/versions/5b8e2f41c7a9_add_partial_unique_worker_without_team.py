@@ -0,0 +1,41 @@
+"""add partial unique index on workers.user_id for workers without team
+
+Revision ID: 5b8e2f41c7a9
+Revises: e3425578dc68
+Create Date: 2026-10-17 16:12:40.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2f41c7a9'
+down_revision: Union[str, None] = 'e3425578dc68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # дубли «worker без команды» могли появиться из-за гонки в ensure_exists — оставляем самый ранний
+    op.execute(
+        """
+        DELETE FROM workers
+        WHERE team_id IS NULL
+          AND id NOT IN (SELECT MIN(id) FROM workers WHERE team_id IS NULL GROUP BY user_id)
+        """
+    )
+    op.create_index(
+        'uq_workers_user_id_no_team',
+        'workers',
+        ['user_id'],
+        unique=True,
+        postgresql_where=sa.text('team_id IS NULL'),
+        sqlite_where=sa.text('team_id IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_workers_user_id_no_team', table_name='workers')
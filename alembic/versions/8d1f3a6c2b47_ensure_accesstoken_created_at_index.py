@@ -0,0 +1,30 @@
+"""ensure index on accesstoken.created_at for the expired token sweeper
+
+Revision ID: 8d1f3a6c2b47
+Revises: 5b8e2f41c7a9
+Create Date: 2026-10-17 17:40:12.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d1f3a6c2b47'
+down_revision: Union[str, None] = '5b8e2f41c7a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # индекс создавался в f2d5194a5331, но пересборка таблицы в efd4bcb87ef7 (batch на sqlite)
+    # и ручные правки схемы могли его потерять — без него каждая пачка свипера идёт seq scan'ом
+    op.create_index(
+        'ix_accesstoken_created_at', 'accesstoken', ['created_at'], unique=False, if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    # индекс принадлежит f2d5194a5331, эта ревизия лишь гарантирует его наличие
+    pass
@@ -0,0 +1,26 @@
+"""add version counter to team for conditional GET
+
+Revision ID: a4c7e91d0f35
+Revises: 8d1f3a6c2b47
+Create Date: 2026-10-17 18:02:47.114290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e91d0f35'
+down_revision: Union[str, None] = '8d1f3a6c2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('team', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('team', 'version')
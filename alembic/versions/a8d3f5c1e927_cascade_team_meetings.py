@@ -0,0 +1,29 @@
+"""delete a team's meetings with it
+
+Revision ID: a8d3f5c1e927
+Revises: f6c2d8a4b315
+Create Date: 2026-10-18 11:26:08.193442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3f5c1e927'
+down_revision: Union[str, None] = 'f6c2d8a4b315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint(op.f('fk_meeting_team_id_team'), 'meeting', type_='foreignkey')
+    op.create_foreign_key(
+        op.f('fk_meeting_team_id_team'), 'meeting', 'team', ['team_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(op.f('fk_meeting_team_id_team'), 'meeting', type_='foreignkey')
+    op.create_foreign_key(op.f('fk_meeting_team_id_team'), 'meeting', 'team', ['team_id'], ['id'])
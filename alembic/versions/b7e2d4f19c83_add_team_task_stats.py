@@ -0,0 +1,87 @@
+"""add denormalized per-team task counters maintained by triggers
+
+Revision ID: b7e2d4f19c83
+Revises: a4c7e91d0f35
+Create Date: 2026-10-17 21:14:05.482113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4f19c83'
+down_revision: Union[str, None] = 'a4c7e91d0f35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('open', 'in_progress', 'done')
+TRIGGERS = {
+    'trg_task_stats_insert': 'AFTER INSERT ON task REFERENCING NEW TABLE AS new_rows',
+    'trg_task_stats_update': 'AFTER UPDATE ON task REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'trg_task_stats_delete': 'AFTER DELETE ON task REFERENCING OLD TABLE AS old_rows',
+}
+
+
+def _upsert(deltas: str) -> str:
+    sums = [f"coalesce(sum(n) FILTER (WHERE status = '{s}'), 0)::int" for s in STATUSES]
+    return (
+        f"INSERT INTO team_task_stats AS s (team_id, {', '.join(STATUSES)}) "
+        f"SELECT team_id, {', '.join(sums)} FROM ({deltas}) d GROUP BY team_id "
+        f"HAVING {' OR '.join(f'{total} <> 0' for total in sums)} "
+        f"ON CONFLICT (team_id) DO UPDATE SET "
+        f"{', '.join(f'{s} = s.{s} + EXCLUDED.{s}' for s in STATUSES)}, updated_at = now();"
+    )
+
+
+FUNCTION = f"""
+CREATE OR REPLACE FUNCTION team_task_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_upsert("SELECT team_id, status::text AS status, 1 AS n FROM new_rows")}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_upsert("SELECT team_id, status::text AS status, -1 AS n FROM old_rows")}
+    ELSE
+        {_upsert("SELECT team_id, status::text AS status, 1 AS n FROM new_rows "
+                 "UNION ALL SELECT team_id, status::text, -1 FROM old_rows")}
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'team_task_stats',
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('open', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('in_progress', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('done', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['team_id'], ['team.id'], name=op.f('fk_team_task_stats_team_id_team'), ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('team_id', name=op.f('pk_team_task_stats')),
+    )
+    # таблица задач блокируется на время заполнения и создания триггеров: иначе записи,
+    # попавшие между backfill и CREATE TRIGGER, не попали бы в счётчики
+    op.execute("LOCK TABLE task IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        "INSERT INTO team_task_stats (team_id, open, in_progress, done) "
+        "SELECT team_id, "
+        "count(*) FILTER (WHERE status = 'open'), "
+        "count(*) FILTER (WHERE status = 'in_progress'), "
+        "count(*) FILTER (WHERE status = 'done') "
+        "FROM task GROUP BY team_id"
+    )
+    op.execute(FUNCTION)
+    for name, spec in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {spec} FOR EACH STATEMENT EXECUTE FUNCTION team_task_stats_apply()")
+
+
+def downgrade() -> None:
+    for name in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON task")
+    op.execute("DROP FUNCTION IF EXISTS team_task_stats_apply()")
+    op.drop_table('team_task_stats')
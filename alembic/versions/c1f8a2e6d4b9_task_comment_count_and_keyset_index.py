@@ -0,0 +1,42 @@
+"""denormalized task comment_count and keyset index for comments
+
+Revision ID: c1f8a2e6d4b9
+Revises: b7e2d4f19c83
+Create Date: 2026-10-17 22:31:40.907215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1f8a2e6d4b9'
+down_revision: Union[str, None] = 'b7e2d4f19c83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('task', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE task SET comment_count = c.n "
+        "FROM (SELECT task_id, count(*) AS n FROM taskcomment GROUP BY task_id) c "
+        "WHERE task.id = c.task_id"
+    )
+    # одиночный индекс по task_id — префикс нового составного, держать оба незачем
+    op.create_index('ix_taskcomment_task_created', 'taskcomment', ['task_id', 'created_at', 'id'], unique=False)
+    op.drop_index(op.f('ix_taskcomment_task_id'), table_name='taskcomment')
+    op.drop_constraint(op.f('fk_taskcomment_task_id_task'), 'taskcomment', type_='foreignkey')
+    op.create_foreign_key(
+        op.f('fk_taskcomment_task_id_task'), 'taskcomment', 'task', ['task_id'], ['id'], ondelete='CASCADE'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(op.f('fk_taskcomment_task_id_task'), 'taskcomment', type_='foreignkey')
+    op.create_foreign_key(op.f('fk_taskcomment_task_id_task'), 'taskcomment', 'task', ['task_id'], ['id'])
+    op.create_index(op.f('ix_taskcomment_task_id'), 'taskcomment', ['task_id'], unique=False)
+    op.drop_index('ix_taskcomment_task_created', table_name='taskcomment')
+    op.drop_column('task', 'comment_count')
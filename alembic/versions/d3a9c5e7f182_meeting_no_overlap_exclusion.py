@@ -0,0 +1,43 @@
+"""forbid overlapping meetings within a team via a GiST exclusion constraint
+
+Revision ID: d3a9c5e7f182
+Revises: c1f8a2e6d4b9
+Create Date: 2026-10-17 23:48:12.306551
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a9c5e7f182'
+down_revision: Union[str, None] = 'c1f8a2e6d4b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # уже пересекающиеся встречи молча удалять нельзя — пусть их разберут до миграции
+    overlapping = conn.scalar(sa.text(
+        "SELECT count(*) FROM meeting a JOIN meeting b "
+        "ON a.team_id = b.team_id AND a.id < b.id "
+        "AND a.starts_at < b.ends_at AND b.starts_at < a.ends_at"
+    ))
+    if overlapping:
+        raise RuntimeError(
+            f"{overlapping} pairs of overlapping meetings exist; resolve them before adding ex_meeting_team_no_overlap"
+        )
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.create_check_constraint(op.f('ck_meeting_ends_after_start'), 'meeting', 'ends_at > starts_at')
+    op.execute(
+        "ALTER TABLE meeting ADD CONSTRAINT ex_meeting_team_no_overlap "
+        "EXCLUDE USING gist (team_id WITH =, tstzrange(starts_at, ends_at, '[)') WITH &&)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('ex_meeting_team_no_overlap', 'meeting')
+    op.drop_constraint(op.f('ck_meeting_ends_after_start'), 'meeting', type_='check')
@@ -0,0 +1,34 @@
+"""task board index on the full NULL-free keyset key
+
+Revision ID: e4b7a1c9d253
+Revises: d3a9c5e7f182
+Create Date: 2026-10-18 10:12:37.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7a1c9d253'
+down_revision: Union[str, None] = 'd3a9c5e7f182'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ключ доски (status, coalesce(deadline, ∞), id) целиком: курсор — один seek по индексу
+    op.create_index(
+        'ix_task_team_board',
+        'task',
+        ['team_id', 'status', sa.text("coalesce(deadline, 'infinity'::timestamptz)"), 'id'],
+        unique=False,
+    )
+    op.drop_index('ix_task_team_status_deadline', table_name='task')
+
+
+def downgrade() -> None:
+    op.create_index('ix_task_team_status_deadline', 'task', ['team_id', 'status', 'deadline'], unique=False)
+    op.drop_index('ix_task_team_board', table_name='task')
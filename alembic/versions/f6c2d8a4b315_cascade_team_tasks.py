@@ -0,0 +1,64 @@
+"""delete a team's tasks with it; stats triggers skip deleted teams
+
+Revision ID: f6c2d8a4b315
+Revises: e4b7a1c9d253
+Create Date: 2026-10-18 11:02:54.771930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c2d8a4b315'
+down_revision: Union[str, None] = 'e4b7a1c9d253'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATUSES = ('open', 'in_progress', 'done')
+
+
+def _upsert(deltas: str, *, skip_deleted_teams: bool) -> str:
+    sums = [f"coalesce(sum(n) FILTER (WHERE status = '{s}'), 0)::int" for s in STATUSES]
+    # каскад DELETE team -> task запускает триггер удаления задач; строку статистики
+    # уже удалённой команды вставлять нельзя — это нарушение внешнего ключа
+    alive = "WHERE EXISTS (SELECT 1 FROM team t WHERE t.id = d.team_id) " if skip_deleted_teams else ""
+    return (
+        f"INSERT INTO team_task_stats AS s (team_id, {', '.join(STATUSES)}) "
+        f"SELECT team_id, {', '.join(sums)} FROM ({deltas}) d {alive}GROUP BY team_id "
+        f"HAVING {' OR '.join(f'{total} <> 0' for total in sums)} "
+        f"ON CONFLICT (team_id) DO UPDATE SET "
+        f"{', '.join(f'{s} = s.{s} + EXCLUDED.{s}' for s in STATUSES)}, updated_at = now();"
+    )
+
+
+def _function(skip_deleted_teams: bool) -> str:
+    kw = {"skip_deleted_teams": skip_deleted_teams}
+    return f"""
+CREATE OR REPLACE FUNCTION team_task_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_upsert("SELECT team_id, status::text AS status, 1 AS n FROM new_rows", **kw)}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_upsert("SELECT team_id, status::text AS status, -1 AS n FROM old_rows", **kw)}
+    ELSE
+        {_upsert("SELECT team_id, status::text AS status, 1 AS n FROM new_rows "
+                 "UNION ALL SELECT team_id, status::text, -1 FROM old_rows", **kw)}
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    op.execute(_function(skip_deleted_teams=True))
+    op.drop_constraint(op.f('fk_task_team_id_team'), 'task', type_='foreignkey')
+    op.create_foreign_key(op.f('fk_task_team_id_team'), 'task', 'team', ['team_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    op.drop_constraint(op.f('fk_task_team_id_team'), 'task', type_='foreignkey')
+    op.create_foreign_key(op.f('fk_task_team_id_team'), 'task', 'team', ['team_id'], ['id'])
+    op.execute(_function(skip_deleted_teams=False))
@@ -0,0 +1,409 @@
+# Синтетические данные для бенчмарков и репетиции миграций.
+#
+#   python -m app.auth.actions.generate_data --users 600000 --jobs 8
+#   python -m app.auth.actions.generate_data --users 2000 --create-schema      # sqlite, локально
+#
+# Пишет в settings.DATABASE_URL. Строки генерируются потоком и грузятся пачками мимо ORM:
+# на Postgres — asyncpg copy_records_to_table в несколько соединений параллельно,
+# на SQLite — executemany в одной транзакции. Идентификаторы выдаются явно, начиная после
+# текущего max(id) каждой таблицы, поэтому генератор можно запускать поверх существующих данных.
+# Пример выше даёт ~10M строк: 600k user, ~585k workers, ~37k team, ~2.3M task,
+# ~5.8M taskcomment, ~0.8M evaluation и ~0.2M meeting.
+import argparse
+import asyncio
+import itertools
+import math
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator, Sequence
+
+from sqlalchemy import Table, func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models import Base, Evaluation, Meeting, Task, TaskComment, Team, User, Worker
+from app.models.task import TaskStatus
+from app.models.team import TeamRole
+
+PASSWORD = "seed-password"
+MAX_TEAM_SIZE = 500
+TASK_STATUS_WEIGHTS = {TaskStatus.open: 0.3, TaskStatus.in_progress: 0.2, TaskStatus.done: 0.5}
+SCORE_WEIGHTS = {1: 0.03, 2: 0.07, 3: 0.25, 4: 0.4, 5: 0.25}
+MEETING_MINUTES = (15, 30, 30, 60, 60, 90)
+MEETING_BLOCK_MINUTES = 120
+MEETING_BLOCKS = 120 * 24 * 60 // MEETING_BLOCK_MINUTES
+
+
+@dataclass(slots=True)
+class TeamPlan:
+    id: int
+    first_user: int
+    size: int
+    first_task: int
+    task_count: int
+
+
+@dataclass(slots=True)
+class Options:
+    users: int
+    team_size: float
+    unassigned_ratio: float
+    tasks_per_member: float
+    comments_per_task: float
+    meetings_per_team: float
+    evaluated_ratio: float
+    seed: int
+
+
+def _chunks(records: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    iterator = iter(records)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _team_size(rng: random.Random, mean: float) -> int:
+    # логнормальное распределение: много небольших команд и длинный хвост крупных
+    sigma = 0.6
+    value = rng.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+    return max(1, min(MAX_TEAM_SIZE, round(value)))
+
+
+def _count(rng: random.Random, mean: float) -> int:
+    # экспоненциальное приближение к числу событий: у большинства мало, у некоторых много
+    return int(rng.expovariate(1 / mean)) if mean > 0 else 0
+
+
+def plan_teams(options: Options, *, first_user: int, first_team: int, first_task: int) -> list[TeamPlan]:
+    rng = random.Random(options.seed)
+    assignable = int(options.users * (1 - options.unassigned_ratio))
+    plans: list[TeamPlan] = []
+    user_id, team_id, task_id = first_user, first_team, first_task
+    last_user = first_user + assignable
+    while user_id < last_user:
+        size = min(_team_size(rng, options.team_size), last_user - user_id)
+        task_count = round(size * options.tasks_per_member * rng.uniform(0.5, 1.5))
+        plans.append(TeamPlan(team_id, user_id, size, task_id, task_count))
+        user_id += size
+        team_id += 1
+        task_id += task_count
+    return plans
+
+
+def user_records(options: Options, first_id: int, now: datetime) -> Iterator[tuple]:
+    from fastapi_users.password import PasswordHelper
+
+    # хэш считаем один раз: argon2 на каждую строку сделал бы генерацию многочасовой
+    hashed = PasswordHelper().hash(PASSWORD)
+    rng = random.Random(options.seed)
+    for user_id in range(first_id, first_id + options.users):
+        created_at = now - timedelta(seconds=rng.randrange(2 * 365 * 86400))
+        yield (
+            user_id,
+            f"user{user_id}@seed.local",
+            hashed,
+            rng.random() > 0.02,
+            False,
+            rng.random() > 0.1,
+            created_at,
+            created_at,
+        )
+
+
+def team_records(plans: Sequence[TeamPlan]) -> Iterator[tuple]:
+    for plan in plans:
+        yield plan.id, f"Team {plan.id}", f"SEED{plan.id:08d}", plan.first_user
+
+
+def worker_records(
+    plans: Sequence[TeamPlan], options: Options, first_id: int, first_user: int
+) -> Iterator[tuple]:
+    rng = random.Random(options.seed)
+    worker_id = first_id
+    for plan in plans:
+        for user_id in range(plan.first_user, plan.first_user + plan.size):
+            if user_id == plan.first_user:
+                role = TeamRole.admin
+            else:
+                role = TeamRole.manager if rng.random() < 0.1 else TeamRole.employee
+            yield worker_id, user_id, plan.id, role.name
+            worker_id += 1
+    # половина пользователей вне команд уже прошла через ensure_exists и имеет worker без команды
+    assigned_until = plans[-1].first_user + plans[-1].size if plans else first_user
+    for user_id in range(assigned_until, first_user + options.users):
+        if rng.random() < 0.5:
+            yield worker_id, user_id, None, TeamRole.employee.name
+            worker_id += 1
+
+
+def _team_tasks(plan: TeamPlan, options: Options, now: datetime) -> Iterator[tuple]:
+    # детерминирован по (seed, team): комментарии и оценки заново проходят задачи команды,
+    # не держа в памяти миллионы строк
+    rng = random.Random(options.seed * 1_000_003 + plan.id)
+    statuses, weights = list(TASK_STATUS_WEIGHTS), list(TASK_STATUS_WEIGHTS.values())
+    for task_id in range(plan.first_task, plan.first_task + plan.task_count):
+        status = rng.choices(statuses, weights)[0]
+        created_at = now - timedelta(seconds=rng.randrange(365 * 86400))
+        deadline = None
+        if rng.random() > 0.2:
+            deadline = created_at + timedelta(days=rng.randint(1, 60), hours=rng.randrange(24))
+        updated_at = created_at + timedelta(seconds=rng.randrange(30 * 86400))
+        author_id = plan.first_user + rng.randrange(plan.size)
+        assignee_id = plan.first_user + rng.randrange(plan.size) if rng.random() < 0.85 else None
+        yield (
+            task_id,
+            plan.id,
+            author_id,
+            assignee_id,
+            f"Task {task_id}",
+            f"Generated task {task_id} for team {plan.id}" if rng.random() < 0.6 else None,
+            status.name,
+            deadline,
+            created_at,
+            min(updated_at, now),
+        )
+
+
+def task_records(plans: Sequence[TeamPlan], options: Options, now: datetime) -> Iterator[tuple]:
+    for plan in plans:
+        yield from _team_tasks(plan, options, now)
+
+
+def comment_records(
+    plans: Sequence[TeamPlan], options: Options, first_id: int, now: datetime
+) -> Iterator[tuple]:
+    comment_id = first_id
+    for plan in plans:
+        rng = random.Random(options.seed * 2_000_003 + plan.id)
+        for task in _team_tasks(plan, options, now):
+            task_id, created_at = task[0], task[8]
+            span = max(1, int((now - created_at).total_seconds()))
+            for _ in range(min(200, _count(rng, options.comments_per_task))):
+                yield (
+                    comment_id,
+                    task_id,
+                    plan.first_user + rng.randrange(plan.size),
+                    f"Comment {comment_id}",
+                    created_at + timedelta(seconds=rng.randrange(span)),
+                )
+                comment_id += 1
+
+
+def evaluation_records(
+    plans: Sequence[TeamPlan], options: Options, first_id: int, now: datetime
+) -> Iterator[tuple]:
+    evaluation_id = first_id
+    scores, weights = list(SCORE_WEIGHTS), list(SCORE_WEIGHTS.values())
+    for plan in plans:
+        rng = random.Random(options.seed * 3_000_017 + plan.id)
+        for task in _team_tasks(plan, options, now):
+            if task[6] != TaskStatus.done.name or rng.random() >= options.evaluated_ratio:
+                continue
+            # оценивает админ команды: (task_id, evaluator_id) уникальна по построению
+            yield (
+                evaluation_id,
+                task[0],
+                plan.first_user,
+                rng.choices(scores, weights)[0],
+                "Generated evaluation" if rng.random() < 0.3 else None,
+                task[9],
+            )
+            evaluation_id += 1
+
+
+def meeting_records(
+    plans: Sequence[TeamPlan], options: Options, first_id: int, now: datetime
+) -> Iterator[tuple]:
+    # встречи команды не пересекаются (на Postgres это exclusion constraint): каждая занимает
+    # свой двухчасовой блок в окне от -90 до +30 дней
+    rng = random.Random(options.seed * 4_000_037)
+    meeting_id = first_id
+    for plan in plans:
+        count = min(_count(rng, options.meetings_per_team), MEETING_BLOCKS)
+        for block in sorted(rng.sample(range(MEETING_BLOCKS), count)):
+            minutes = rng.choice(MEETING_MINUTES)
+            offset = 15 * rng.randrange((MEETING_BLOCK_MINUTES - minutes) // 15 + 1)
+            starts_at = now + timedelta(minutes=block * MEETING_BLOCK_MINUTES - 90 * 24 * 60 + offset)
+            yield (
+                meeting_id,
+                plan.id,
+                f"Meeting {meeting_id}",
+                None,
+                starts_at,
+                starts_at + timedelta(minutes=minutes),
+            )
+            meeting_id += 1
+
+
+async def _next_id(engine: AsyncEngine, table: Table) -> int:
+    async with engine.connect() as conn:
+        return (await conn.scalar(select(func.max(table.c.id)))) or 0
+
+
+async def _copy_chunk(engine: AsyncEngine, table: Table, columns: list[str], chunk: list[tuple]) -> None:
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(table.name, records=chunk, columns=columns)
+
+
+async def _insert_chunk(engine: AsyncEngine, table: Table, columns: list[str], chunk: list[tuple]) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(table.insert(), [dict(zip(columns, row)) for row in chunk])
+
+
+async def load_table(
+    engine: AsyncEngine,
+    table: Table,
+    columns: list[str],
+    records: Iterable[tuple],
+    *,
+    chunk_size: int,
+    jobs: int,
+) -> int:
+    use_copy = engine.url.get_driver_name() == "asyncpg"
+    # у sqlite один писатель — параллельные пачки только упирались бы в блокировку
+    limit = asyncio.Semaphore(jobs if use_copy else 1)
+    load_chunk = _copy_chunk if use_copy else _insert_chunk
+    total = 0
+
+    async def run(chunk: list[tuple]) -> None:
+        try:
+            await load_chunk(engine, table, columns, chunk)
+        finally:
+            limit.release()
+
+    async with asyncio.TaskGroup() as group:
+        for chunk in _chunks(records, chunk_size):
+            await limit.acquire()
+            group.create_task(run(chunk))
+            total += len(chunk)
+            # отдаём цикл событий, чтобы COPY уже запущенных пачек шёл параллельно с генерацией
+            await asyncio.sleep(0)
+    return total
+
+
+async def _reset_sequences(engine: AsyncEngine, tables: Iterable[Table]) -> None:
+    # явные id не двигают serial-последовательности — иначе следующий INSERT из API упадёт на pk
+    async with engine.begin() as conn:
+        for table in tables:
+            await conn.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', 'id'), "
+                    f"(SELECT coalesce(max(id), 1) FROM \"{table.name}\"))"
+                )
+            )
+
+
+async def _refresh_comment_counts(engine: AsyncEngine, first_task: int) -> None:
+    # комментарии грузятся COPY мимо crud.comments — счётчики новых задач досчитываем одним UPDATE
+    count = (
+        select(func.count())
+        .where(TaskComment.task_id == Task.id)
+        .correlate(Task)
+        .scalar_subquery()
+    )
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(Task).where(Task.id >= first_task).values(comment_count=count, updated_at=Task.updated_at)
+        )
+
+
+async def generate(
+    engine: AsyncEngine,
+    options: Options,
+    *,
+    chunk_size: int = 10_000,
+    jobs: int = 4,
+    create_schema: bool = False,
+    now: datetime | None = None,
+) -> dict[str, int]:
+    now = now or datetime.now(timezone.utc)
+    if create_schema:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    tables = {
+        model: model.__table__
+        for model in (User, Team, Worker, Task, TaskComment, Evaluation, Meeting)
+    }
+    start = {model: await _next_id(engine, table) + 1 for model, table in tables.items()}
+    plans = plan_teams(
+        options, first_user=start[User], first_team=start[Team], first_task=start[Task]
+    )
+    # порядок важен: таблицы грузятся по внешним ключам, пачки внутри таблицы — параллельно
+    sources = [
+        (User, ["id", "email", "hashed_password", "is_active", "is_superuser", "is_verified",
+                "created_at", "updated_at"], user_records(options, start[User], now)),
+        (Team, ["id", "name", "code", "owner_id"], team_records(plans)),
+        (Worker, ["id", "user_id", "team_id", "role_in_team"],
+         worker_records(plans, options, start[Worker], start[User])),
+        (Task, ["id", "team_id", "author_id", "assignee_id", "title", "description", "status",
+                "deadline", "created_at", "updated_at"], task_records(plans, options, now)),
+        (TaskComment, ["id", "task_id", "author_id", "body", "created_at"],
+         comment_records(plans, options, start[TaskComment], now)),
+        (Evaluation, ["id", "task_id", "evaluator_id", "score", "comment", "created_at"],
+         evaluation_records(plans, options, start[Evaluation], now)),
+        (Meeting, ["id", "team_id", "title", "notes", "starts_at", "ends_at"],
+         meeting_records(plans, options, start[Meeting], now)),
+    ]
+    counts: dict[str, int] = {}
+    for model, columns, records in sources:
+        table = tables[model]
+        counts[table.name] = await load_table(
+            engine, table, columns, records, chunk_size=chunk_size, jobs=jobs
+        )
+    await _refresh_comment_counts(engine, start[Task])
+    if engine.url.get_backend_name() == "postgresql":
+        await _reset_sequences(engine, tables.values())
+    return counts
+
+
+async def main_async(args) -> None:
+    from app.db.session import engine
+
+    options = Options(
+        users=args.users,
+        team_size=args.team_size,
+        unassigned_ratio=args.unassigned_ratio,
+        tasks_per_member=args.tasks_per_member,
+        comments_per_task=args.comments_per_task,
+        meetings_per_team=args.meetings_per_team,
+        evaluated_ratio=args.evaluated_ratio,
+        seed=args.seed,
+    )
+    started = time.perf_counter()
+    try:
+        counts = await generate(
+            engine,
+            options,
+            chunk_size=args.chunk_size,
+            jobs=args.jobs,
+            create_schema=args.create_schema,
+        )
+    finally:
+        await engine.dispose()
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    for name, count in counts.items():
+        print(f"{name:<12} {count:>12,}")
+    print(f"{'total':<12} {total:>12,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Генерация синтетических данных")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--team-size", type=float, default=15, help="средний размер команды")
+    parser.add_argument("--unassigned-ratio", type=float, default=0.05, help="доля пользователей вне команд")
+    parser.add_argument("--tasks-per-member", type=float, default=4)
+    parser.add_argument("--comments-per-task", type=float, default=3)
+    parser.add_argument("--meetings-per-team", type=float, default=6)
+    parser.add_argument("--evaluated-ratio", type=float, default=0.7, help="доля оценённых задач в статусе done")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--jobs", type=int, default=4, help="параллельных COPY-соединений (Postgres)")
+    parser.add_argument("--create-schema", action="store_true", help="создать таблицы через metadata.create_all")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
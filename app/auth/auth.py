@@ -1,9 +1,14 @@
+from datetime import datetime, timedelta, timezone
+
 from fastapi import Depends
-from fastapi_users import FastAPIUsers
+from fastapi_users import FastAPIUsers, exceptions
 from fastapi_users.authentication import AuthenticationBackend, BearerTransport
 from fastapi_users.authentication.strategy.db import AccessTokenDatabase, DatabaseStrategy
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
 
 from .access_token import AccessToken, get_access_token_db
+from .token_cache import token_cache
 from app.auth.manager import get_user_manager
 from app.core.config import settings
 from app.models.user import User
@@ -11,10 +16,58 @@ from app.models.user import User
 bearer_transport = BearerTransport(tokenUrl="/auth/jwt/login")
 
 
+def _snapshot(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+class CachingDatabaseStrategy(DatabaseStrategy):
+    # кэшируем результат token -> user, чтобы не ходить в БД дважды на каждый запрос
+    async def read_token(self, token, user_manager):
+        if token is None:
+            return None
+
+        cached = token_cache.get(token)
+        if cached is not None:
+            user = User(**cached)
+            make_transient_to_detached(user)
+            return await user_manager.user_db.session.merge(user, load=False)
+
+        # logout или смена пользователя во время чтения из БД не должны попасть в кэш устаревшими
+        since = token_cache.begin_lookup()
+        try:
+            now = datetime.now(timezone.utc)
+            max_age = None
+            if self.lifetime_seconds:
+                max_age = now - timedelta(seconds=self.lifetime_seconds)
+
+            access_token = await self.database.get_by_token(token, max_age)
+            if access_token is None:
+                return None
+
+            try:
+                parsed_id = user_manager.parse_id(access_token.user_id)
+                user = await user_manager.get(parsed_id)
+            except (exceptions.UserNotExists, exceptions.InvalidID):
+                return None
+
+            ttl = None
+            if self.lifetime_seconds:
+                expires_at = access_token.created_at + timedelta(seconds=self.lifetime_seconds)
+                ttl = (expires_at - now).total_seconds()
+            token_cache.set(token, user.id, _snapshot(user), ttl, since=since)
+            return user
+        finally:
+            token_cache.end_lookup(since)
+
+    async def destroy_token(self, token, user) -> None:
+        token_cache.invalidate_token(token)
+        await super().destroy_token(token, user)
+
+
 def get_database_strategy(
     access_token_db: AccessTokenDatabase[AccessToken] = Depends(get_access_token_db),
 ) -> DatabaseStrategy:
-    return DatabaseStrategy(access_token_db, lifetime_seconds=3600)
+    return CachingDatabaseStrategy(access_token_db, lifetime_seconds=settings.ACCESS_TOKEN_LIFETIME_SECONDS)
 
 
 auth_backend = AuthenticationBackend(
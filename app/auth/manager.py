@@ -1,12 +1,17 @@
-from typing import Optional
+from typing import Any, Optional
 import logging
 
-
+import jwt
 from fastapi import Depends, Request
-from fastapi_users import BaseUserManager, IntegerIDMixin
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import BaseUserManager, IntegerIDMixin, exceptions, schemas
+from fastapi_users.jwt import decode_jwt, generate_jwt
 
 from app.auth.db import get_user_db
+from app.auth.passwords import PooledPasswordHelper, password_helper
+from app.auth.token_cache import token_cache
 from app.core.config import settings
+from app.crud import teams as crud_teams
 from app.models.user import User
 
 log = logging.getLogger(__name__)
@@ -15,6 +20,100 @@ log = logging.getLogger(__name__)
 class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
     reset_password_token_secret = settings.SECRET_KEY
     verification_token_secret = settings.SECRET_KEY
+    password_helper: PooledPasswordHelper
+
+    # Всё, что считает argon2, переопределено ради await password_helper.*_async: базовые
+    # реализации fastapi-users вызывают хэшер синхронно и держат event loop сотни миллисекунд.
+
+    async def create(
+        self, user_create: schemas.UC, safe: bool = False, request: Optional[Request] = None
+    ) -> User:
+        await self.validate_password(user_create.password, user_create)
+
+        existing_user = await self.user_db.get_by_email(user_create.email)
+        if existing_user is not None:
+            raise exceptions.UserAlreadyExists()
+
+        user_dict = user_create.create_update_dict() if safe else user_create.create_update_dict_superuser()
+        password = user_dict.pop("password")
+        user_dict["hashed_password"] = await self.password_helper.hash_async(password)
+
+        created_user = await self.user_db.create(user_dict)
+        await self.on_after_register(created_user, request)
+        return created_user
+
+    async def authenticate(self, credentials: OAuth2PasswordRequestForm) -> Optional[User]:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # хэшируем впустую, чтобы время ответа не выдавало существование e-mail
+            await self.password_helper.hash_async(credentials.password)
+            return None
+
+        verified, updated_password_hash = await self.password_helper.verify_and_update_async(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+        # хэш посчитан старым алгоритмом или с другими параметрами argon2 — перезаписываем
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+        return user
+
+    async def forgot_password(self, user: User, request: Optional[Request] = None) -> None:
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        token_data = {
+            "sub": str(user.id),
+            "password_fgpt": await self.password_helper.hash_async(user.hashed_password),
+            "aud": self.reset_password_token_audience,
+        }
+        token = generate_jwt(
+            token_data, self.reset_password_token_secret, self.reset_password_token_lifetime_seconds
+        )
+        await self.on_after_forgot_password(user, token, request)
+
+    async def reset_password(self, token: str, password: str, request: Optional[Request] = None) -> User:
+        try:
+            data = decode_jwt(token, self.reset_password_token_secret, [self.reset_password_token_audience])
+        except jwt.PyJWTError:
+            raise exceptions.InvalidResetPasswordToken()
+
+        try:
+            user_id = data["sub"]
+            password_fingerprint = data["password_fgpt"]
+        except KeyError:
+            raise exceptions.InvalidResetPasswordToken()
+
+        try:
+            parsed_id = self.parse_id(user_id)
+        except exceptions.InvalidID:
+            raise exceptions.InvalidResetPasswordToken()
+
+        user = await self.get(parsed_id)
+
+        valid_password_fingerprint, _ = await self.password_helper.verify_and_update_async(
+            user.hashed_password, password_fingerprint
+        )
+        if not valid_password_fingerprint:
+            raise exceptions.InvalidResetPasswordToken()
+
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        updated_user = await self._update(user, {"password": password})
+        await self.on_after_reset_password(user, request)
+        return updated_user
+
+    async def _update(self, user: User, update_dict: dict[str, Any]) -> User:
+        # пароль хэшируем сами, дальше базовый _update передаёт hashed_password как есть
+        password = update_dict.get("password")
+        if password is not None:
+            await self.validate_password(password, user)
+            update_dict = {key: value for key, value in update_dict.items() if key != "password"}
+            update_dict["hashed_password"] = await self.password_helper.hash_async(password)
+        return await super()._update(user, update_dict)
 
     async def on_after_register(self, user: User, request: Optional[Request] = None):
         log.warning(
@@ -31,6 +130,21 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
     ):
         log.warning("Verification requested for user " + str(user.id) + ". Verification token: " + str(token))
 
+    # любые изменения пользователя (в т.ч. is_active/is_superuser через админский PATCH)
+    # должны сбросить закэшированные токены
+    async def on_after_update(self, user: User, update_dict, request: Optional[Request] = None):
+        token_cache.invalidate_user(user.id)
+
+    async def on_after_reset_password(self, user: User, request: Optional[Request] = None):
+        token_cache.invalidate_user(user.id)
+
+    async def on_before_delete(self, user: User, request: Optional[Request] = None):
+        # в той же транзакции, что и DELETE пользователя: user_db.delete() закоммитит оба
+        await crud_teams.bump_versions_for_user(self.user_db.session, user.id)
+
+    async def on_after_delete(self, user: User, request: Optional[Request] = None):
+        token_cache.invalidate_user(user.id)
+
 
 async def get_user_manager(user_db=Depends(get_user_db)):
-    yield UserManager(user_db)
+    yield UserManager(user_db, password_helper)
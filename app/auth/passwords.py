@@ -0,0 +1,114 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi_users.password import PasswordHelper
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+from app.core.config import settings
+
+
+def build_password_hash(time_cost: int, memory_cost: int, parallelism: int) -> PasswordHash:
+    # первый хэшер — текущий: verify_and_update вернёт новый хэш, если хранимый посчитан
+    # bcrypt'ом или argon2 с другими параметрами, и authenticate перезапишет его при входе
+    return PasswordHash(
+        (
+            Argon2Hasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism),
+            BcryptHasher(),
+        )
+    )
+
+
+# --- функции пула процессов: уровень модуля, чтобы их можно было отправить в ProcessPoolExecutor.
+# Глобальный хэшер безопасен только там — процесс пула обслуживает ровно один helper. В пуле
+# потоков helper'ы делят модуль, поэтому там вызываются методы самого helper'а.
+
+_worker_hash: PasswordHash | None = None
+
+
+def _init_worker(time_cost: int, memory_cost: int, parallelism: int) -> None:
+    global _worker_hash
+    _worker_hash = build_password_hash(time_cost, memory_cost, parallelism)
+
+
+def _hash(password: str) -> str:
+    return _worker_hash.hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return _worker_hash.verify_and_update(plain_password, hashed_password)
+
+
+class PooledPasswordHelper(PasswordHelper):
+    """PasswordHelper, который считает argon2 в ограниченном пуле, а не на event loop.
+
+    Синхронные hash/verify_and_update унаследованы и остаются для кода вне запросов;
+    UserManager использует асинхронные варианты. workers=0 — считать прямо на loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        executor: str = "thread",
+        time_cost: int,
+        memory_cost: int,
+        parallelism: int,
+    ) -> None:
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor!r}")
+        self._params = (time_cost, memory_cost, parallelism)
+        super().__init__(build_password_hash(*self._params))
+        self.workers = workers
+        self.executor_kind = executor
+        self._executor: Executor | None = None
+
+    @classmethod
+    def from_settings(cls) -> "PooledPasswordHelper":
+        return cls(
+            workers=settings.PASSWORD_HASH_WORKERS,
+            executor=settings.PASSWORD_HASH_EXECUTOR,
+            time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+            memory_cost=settings.PASSWORD_ARGON2_MEMORY_COST,
+            parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+        )
+
+    def _get_executor(self) -> Executor:
+        # создаём лениво: пул процессов не нужен при импорте приложения (alembic, тесты, CLI)
+        if self._executor is None:
+            # argon2-cffi отпускает GIL, поэтому потоков обычно достаточно
+            if self.executor_kind == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker, initargs=self._params
+                )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+
+    async def hash_async(self, password: str) -> str:
+        if self.workers <= 0:
+            return self.hash(password)
+        if self.executor_kind == "thread":
+            return await self._run(self.password_hash.hash, password)
+        return await self._run(_hash, password)
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        if self.workers <= 0:
+            return self.verify_and_update(plain_password, hashed_password)
+        if self.executor_kind == "thread":
+            return await self._run(self.password_hash.verify_and_update, plain_password, hashed_password)
+        return await self._run(_verify_and_update, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+password_helper = PooledPasswordHelper.from_settings()
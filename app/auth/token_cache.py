@@ -0,0 +1,138 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.core.config import settings
+
+
+# LRU+TTL кэш «bearer token -> снимок колонок пользователя».
+# Кэш живёт в памяти процесса: инвалидация видна только в том воркере, который
+# обработал изменение, поэтому TTL держим коротким.
+#
+# Промах читает БД и только потом кладёт результат в кэш. Если между чтением и set() токен
+# отозвали или пользователя изменили, set() положил бы устаревший снимок на весь TTL. Поэтому
+# промах берёт номер поколения до чтения (begin_lookup), каждая инвалидация получает новый
+# номер, и set(since=...) молча пропускается, если токен или пользователь инвалидированы позже.
+class TokenCache:
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, int, dict[str, Any]]] = OrderedDict()
+        self._tokens_by_user: dict[int, set[str]] = {}
+        self._generation = 0
+        self._lookups: dict[int, int] = {}  # поколение -> число незавершённых промахов
+        self._invalidated_users: dict[int, int] = {}  # user_id -> поколение инвалидации
+        self._invalidated_tokens: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl_seconds > 0
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, user_id, data = entry
+        if expires_at <= time.monotonic():
+            self._drop(token)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return data
+
+    def begin_lookup(self) -> int:
+        self._lookups[self._generation] = self._lookups.get(self._generation, 0) + 1
+        return self._generation
+
+    def end_lookup(self, since: int) -> None:
+        left = self._lookups.pop(since) - 1
+        if left:
+            self._lookups[since] = left
+        if not self._lookups:
+            self._invalidated_users.clear()
+            self._invalidated_tokens.clear()
+            return
+        # записи не новее самого старого незавершённого промаха уже никому не помешают
+        oldest = min(self._lookups)
+        if self._invalidated_users:
+            self._invalidated_users = {k: g for k, g in self._invalidated_users.items() if g > oldest}
+        if self._invalidated_tokens:
+            self._invalidated_tokens = {k: g for k, g in self._invalidated_tokens.items() if g > oldest}
+
+    def set(
+        self,
+        token: str,
+        user_id: int,
+        data: dict[str, Any],
+        ttl_seconds: float | None = None,
+        *,
+        since: int | None = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        if since is not None and (
+            self._invalidated_users.get(user_id, since) > since or self._invalidated_tokens.get(token, since) > since
+        ):
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+        if token in self._entries:
+            self._drop(token)
+        self._entries[token] = (time.monotonic() + ttl, user_id, data)
+        self._tokens_by_user.setdefault(user_id, set()).add(token)
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def invalidate_token(self, token: str) -> None:
+        if self._lookups:
+            self._generation += 1
+            self._invalidated_tokens[token] = self._generation
+        if token in self._entries:
+            self._drop(token)
+
+    def invalidate_user(self, user_id: int) -> None:
+        if self._lookups:
+            self._generation += 1
+            self._invalidated_users[user_id] = self._generation
+        for token in self._tokens_by_user.pop(user_id, set()):
+            self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens_by_user.clear()
+        self._lookups.clear()
+        self._invalidated_users.clear()
+        self._invalidated_tokens.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _drop(self, token: str) -> None:
+        _, user_id, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+
+token_cache = TokenCache(
+    maxsize=settings.AUTH_CACHE_MAXSIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.models.access_token_class import AccessToken
+
+log = logging.getLogger(__name__)
+
+_table = AccessToken.__table__
+
+# на Postgres выбираем пачку по ctid через индекс по created_at: = ANY(ARRAY(...)) даёт TID Scan
+_PG_DELETE_BATCH = text(
+    "DELETE FROM accesstoken WHERE ctid = ANY(ARRAY("
+    "SELECT ctid FROM accesstoken WHERE created_at < :cutoff LIMIT :limit))"
+)
+
+
+def _delete_batch(cutoff: datetime, limit: int):
+    return delete(_table).where(
+        _table.c.token.in_(select(_table.c.token).where(_table.c.created_at < cutoff).limit(limit))
+    )
+
+
+# DatabaseStrategy не удаляет просроченные токены: read_token лишь перестаёт их находить.
+# Свипер удаляет их небольшими пачками в отдельных транзакциях, чтобы не держать блокировки
+# и не раздувать WAL одним гигантским DELETE.
+class TokenSweeper:
+    def __init__(self) -> None:
+        self.runs = 0
+        self.failures = 0
+        self.purged_total = 0
+        self.last_purged = 0
+        self.last_duration = 0.0
+
+    async def sweep(
+        self,
+        engine: AsyncEngine,
+        *,
+        lifetime_seconds: int,
+        batch_size: int,
+        pause_seconds: float = 0.0,
+    ) -> int:
+        started = time.perf_counter()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=lifetime_seconds)
+        postgres = engine.url.get_backend_name() == "postgresql"
+        purged = 0
+        while True:
+            async with engine.begin() as conn:
+                if postgres:
+                    result = await conn.execute(_PG_DELETE_BATCH, {"cutoff": cutoff, "limit": batch_size})
+                else:
+                    result = await conn.execute(_delete_batch(cutoff, batch_size))
+            purged += result.rowcount
+            if result.rowcount < batch_size:
+                break
+            await asyncio.sleep(pause_seconds)
+
+        self.runs += 1
+        self.purged_total += purged
+        self.last_purged = purged
+        self.last_duration = time.perf_counter() - started
+        return purged
+
+    async def run_forever(self, engine: AsyncEngine) -> None:
+        while True:
+            try:
+                purged = await self.sweep(
+                    engine,
+                    lifetime_seconds=settings.ACCESS_TOKEN_LIFETIME_SECONDS,
+                    batch_size=settings.TOKEN_SWEEP_BATCH_SIZE,
+                    pause_seconds=settings.TOKEN_SWEEP_BATCH_PAUSE_SECONDS,
+                )
+                if purged:
+                    log.info("Purged %d expired access tokens in %.2fs", purged, self.last_duration)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # упавший прогон не должен останавливать свипер — следующий попробует снова
+                self.failures += 1
+                log.exception("Expired access token sweep failed")
+            await asyncio.sleep(settings.TOKEN_SWEEP_INTERVAL_SECONDS)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "purged_total": self.purged_total,
+            "last_purged": self.last_purged,
+            "last_duration": self.last_duration,
+        }
+
+
+token_sweeper = TokenSweeper()
@@ -0,0 +1,144 @@
+import asyncio
+from collections import deque
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+from app.db.pool import pool_metrics
+
+# служебные пути не ходят в БД и должны отвечать даже под перегрузкой
+EXEMPT_PATHS = frozenset({"/", "/health", "/metrics", "/docs", "/redoc", "/openapi.json", "/api/v1/ping"})
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+http_requests_shed_total = metrics.registry.counter(
+    "http_requests_shed_total", "Requests rejected by admission control.", ("class", "reason")
+)
+http_requests_queued_seconds = metrics.registry.histogram(
+    "http_requests_queued_seconds", "Time requests spent waiting for an admission slot.", ("class",)
+)
+
+
+# исход Gate.enter; отказы совпадают с метками reason у http_requests_shed_total
+ADMITTED = "admitted"
+QUEUE_FULL = "queue_full"
+QUEUE_TIMEOUT = "queue_timeout"
+
+
+class _Expired(Exception):
+    pass
+
+
+class Gate:
+    """Лимит одновременных запросов одного класса с FIFO-очередью ограниченной длины.
+
+    Освободившийся слот передаётся первому живому ожидающему напрямую, поэтому новые запросы
+    не обгоняют очередь. Ожидание ограничено дедлайном: лучше быстрый 503, чем ответ,
+    который клиент уже не ждёт.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int) -> None:
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def enter(self, timeout: float) -> str:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return ADMITTED
+        if len(self._waiters) >= self.max_queue:
+            return QUEUE_FULL
+
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._waiters.append(fut)
+        expire = loop.call_later(timeout, lambda: fut.done() or fut.set_exception(_Expired()))
+        try:
+            await fut
+            return ADMITTED
+        except _Expired:
+            return QUEUE_TIMEOUT
+        except asyncio.CancelledError:
+            # клиент ушёл, но слот уже успели передать — возвращаем его следующему
+            if fut.done() and not fut.cancelled() and fut.exception() is None:
+                self.leave()
+            raise
+        finally:
+            expire.cancel()
+            if fut in self._waiters:
+                self._waiters.remove(fut)
+
+    def leave(self) -> None:
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self.active -= 1
+
+
+def build_gates() -> dict[str, Gate]:
+    return {
+        "auth": Gate("auth", settings.ADMISSION_MAX_INFLIGHT_AUTH, settings.ADMISSION_MAX_QUEUE),
+        "reads": Gate("reads", settings.ADMISSION_MAX_INFLIGHT_READS, settings.ADMISSION_MAX_QUEUE),
+        "writes": Gate("writes", settings.ADMISSION_MAX_INFLIGHT_WRITES, settings.ADMISSION_MAX_QUEUE),
+    }
+
+
+def classify(scope: Scope) -> str | None:
+    path = scope["path"]
+    # OPTIONS (CORS preflight) в БД не ходит — слот чтения на него не тратим
+    if path in EXEMPT_PATHS or scope["method"] == "OPTIONS":
+        return None
+    # вход и регистрация упираются в argon2, а не в БД — у них свой лимит
+    if path.startswith("/auth/"):
+        return "auth"
+    return "reads" if scope["method"] in READ_METHODS else "writes"
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.gates = build_gates()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        kind = classify(scope)
+        if kind is None:
+            await self.app(scope, receive, send)
+            return
+
+        # пул уже не успевает выдавать соединения: новые запросы только удлинят очередь к нему
+        if pool_metrics.recent_wait() > settings.ADMISSION_POOL_WAIT_THRESHOLD:
+            await self._reject(kind, "db_pool", scope, receive, send)
+            return
+
+        gate = self.gates[kind]
+        started = asyncio.get_running_loop().time()
+        outcome = await gate.enter(settings.ADMISSION_QUEUE_TIMEOUT)
+        if outcome != ADMITTED:
+            await self._reject(kind, outcome, scope, receive, send)
+            return
+        http_requests_queued_seconds.observe(asyncio.get_running_loop().time() - started, kind)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.leave()
+
+    async def _reject(self, kind: str, reason: str, scope: Scope, receive: Receive, send: Send) -> None:
+        http_requests_shed_total.inc(kind, reason)
+        response = JSONResponse(
+            {"detail": "Service is overloaded, retry later"},
+            status_code=503,
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+        await response(scope, receive, send)
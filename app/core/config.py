@@ -16,9 +16,83 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int = 5432
     DATABASE_URL: str = f"postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 5
+    # asyncpg: кэш prepared statements на стороне драйвера (0 — для pgbouncer в transaction mode)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+
+    SQL_STATS_ENABLED: bool = True
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+    # превышение query_budget() роняет запрос вместо предупреждения — включается в тестах
+    SQL_QUERY_BUDGET_STRICT: bool = False
+
+    # быстрые страницы (PageSerializer) отдают строки БД без валидации; в тестах проверяем их схемой
+    FAST_JSON_VALIDATE: bool = False
+
+    METRICS_ENABLED: bool = True
+    # каталог для снапшотов метрик при нескольких воркерах uvicorn; None — один процесс
+    METRICS_MULTIPROC_DIR: str | None = None
+    METRICS_FLUSH_INTERVAL: float = 5.0
+
+    ACCESS_TOKEN_LIFETIME_SECONDS: int = 3600
+    # фоновое удаление просроченных токенов; несколько воркеров могут свипать одновременно —
+    # пачки короткие, поэтому конфликтуют они только за уже удалённые строки
+    TOKEN_SWEEP_ENABLED: bool = True
+    TOKEN_SWEEP_INTERVAL_SECONDS: float = 300.0
+    TOKEN_SWEEP_BATCH_SIZE: int = 1000
+    TOKEN_SWEEP_BATCH_PAUSE_SECONDS: float = 0.05
+
+    # сверка денормализованных счётчиков задач (team_task_stats) с реальными COUNT(*)
+    TASK_STATS_RECONCILE_ENABLED: bool = True
+    TASK_STATS_RECONCILE_INTERVAL_SECONDS: float = 3600.0
+    TASK_STATS_RECONCILE_BATCH_SIZE: int = 500
+
+    AUTH_CACHE_MAXSIZE: int = 10_000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+
+    # argon2 считается в пуле, чтобы вход/регистрация не блокировали event loop; 0 — прямо на loop
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # thread | process
+    # смена параметров прозрачно перехэширует пароль при следующем входе
+    PASSWORD_ARGON2_TIME_COST: int = 3
+    PASSWORD_ARGON2_MEMORY_COST: int = 65536
+    PASSWORD_ARGON2_PARALLELISM: int = 4
+
+    # admission control: лимит одновременных запросов по классам (auth/reads/writes) с очередью;
+    # сверх очереди, по её дедлайну или когда ожидание пула БД выше порога — быстрый 503 с Retry-After
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_INFLIGHT_AUTH: int = 16
+    ADMISSION_MAX_INFLIGHT_READS: int = 64
+    ADMISSION_MAX_INFLIGHT_WRITES: int = 32
+    ADMISSION_MAX_QUEUE: int = 128
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+    ADMISSION_POOL_WAIT_THRESHOLD: float = 0.5
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
     HOST: str = "0.0.0.0"
     PORT: int = 8000
 
+    # python -m app.server; None — по числу CPU с учётом квоты cgroup
+    SERVER_WORKERS: int | None = None
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_TIMEOUT: int = 5
+    # сверх лимита одновременных соединений воркер отвечает 503, а не копит очередь
+    SERVER_LIMIT_CONCURRENCY: int | None = None
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    SERVER_ACCESS_LOG: bool = False
+    # упавший воркер перезапускается с экспоненциальной задержкой; столько падений одного слота
+    # за окно — мастер останавливается с ошибкой (БД недоступна, воркер падает на старте)
+    SERVER_RESTART_BACKOFF_INITIAL: float = 0.5
+    SERVER_RESTART_BACKOFF_MAX: float = 30.0
+    SERVER_CRASH_LIMIT: int = 5
+    SERVER_CRASH_WINDOW_SECONDS: float = 60.0
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,79 @@
+import importlib
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.datastructures import Default
+from fastapi.openapi.utils import get_openapi
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+from app.core.responses import FastJSONResponse
+
+
+class LazyRouter(BaseRoute):
+    """Роутер, который импортируется при первом запросе под своим префиксом.
+
+    Для редких эндпоинтов (создание суперпользователя, системные операции): их модули,
+    схемы и зависимости не участвуют в холодном импорте app.main. Путь запроса не меняется —
+    роутер подключается к маленькому FastAPI-приложению со своими полными путями.
+    Регистрировать последним: полные совпадения обычных роутов под тем же префиксом
+    (например, /admin/users из fastapi-users) проверяются раньше.
+    """
+
+    def __init__(self, prefix: str, import_path: str) -> None:
+        self.prefix = prefix.rstrip("/")
+        self.import_path = import_path
+        self._app: FastAPI | None = None
+
+    @property
+    def app(self) -> FastAPI:
+        if self._app is None:
+            module_name, attr = self.import_path.split(":")
+            router = getattr(importlib.import_module(module_name), attr)
+            app = FastAPI(
+                openapi_url=None,
+                docs_url=None,
+                redoc_url=None,
+                default_response_class=Default(FastJSONResponse),
+            )
+            app.include_router(router)
+            self._app = app
+        return self._app
+
+    def matches(self, scope: Scope) -> tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        path = scope["path"]
+        if path == self.prefix or path.startswith(self.prefix + "/"):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        raise NoMatchFound(name, path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.app(scope, receive, send)
+
+
+def add_lazy_router(app: FastAPI, prefix: str, import_path: str) -> None:
+    app.router.routes.append(LazyRouter(prefix, import_path))
+
+
+def install_openapi(app: FastAPI) -> None:
+    # схема собирается только по запросу /openapi.json — тогда и подгружаем ленивые роутеры,
+    # чтобы /docs показывал все эндпоинты
+    def openapi() -> dict[str, Any]:
+        if app.openapi_schema is None:
+            routes: list[BaseRoute] = []
+            for route in app.routes:
+                routes.extend(route.app.routes if isinstance(route, LazyRouter) else [route])
+            app.openapi_schema = get_openapi(
+                title=app.title,
+                version=app.version,
+                openapi_version=app.openapi_version,
+                description=app.description,
+                routes=routes,
+            )
+        return app.openapi_schema
+
+    app.openapi = openapi
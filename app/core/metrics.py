@@ -0,0 +1,280 @@
+import asyncio
+import bisect
+import glob
+import json
+import logging
+import os
+import time
+from typing import Callable, Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def samples(self) -> list:
+        return [[list(labels), value] for labels, value in self._values.items()]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set_total(self, value: float, *labels: str) -> None:
+        # для коллекторов, которые зеркалят уже посчитанный где-то монотонный счётчик
+        self._values[labels] = value
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [счётчики по бакетам (не кумулятивные) + бакет +Inf, сумма]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def samples(self) -> list:
+        return [[list(labels), [counts[:], total]] for labels, (counts, total) in self._series.items()]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        # вызывается перед снятием снапшота — для метрик, которые дешевле прочитать, чем считать
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        for collector in self._collectors:
+            collector()
+        return {
+            m.name: {
+                "type": m.type,
+                "help": m.documentation,
+                "labelnames": list(m.labelnames),
+                "buckets": list(getattr(m, "buckets", ())),
+                "samples": m.samples(),
+            }
+            for m in self._metrics
+        }
+
+
+def merge(snapshots: list[dict]) -> dict:
+    # воркеры независимы, поэтому и счётчики, и гейджи (in-flight, пул, кэш) просто суммируются
+    merged: dict = {}
+    for snap in snapshots:
+        for name, family in snap.items():
+            target = merged.setdefault(name, {**family, "samples": {}})
+            for labels, value in family["samples"]:
+                key = tuple(labels)
+                if family["type"] == "histogram":
+                    counts, total = target["samples"].get(key, [[0] * len(value[0]), 0.0])
+                    target["samples"][key] = [[a + b for a, b in zip(counts, value[0])], total + value[1]]
+                else:
+                    target["samples"][key] = target["samples"].get(key, 0.0) + value
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render(merged: dict) -> str:
+    lines = []
+    for name, family in merged.items():
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        names = family["labelnames"]
+        for labels, value in family["samples"].items():
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, labels)} {_number(value)}")
+                continue
+            counts, total = value
+            cumulative = 0
+            for bound, count in zip([*family["buckets"], "+Inf"], counts):
+                cumulative += count
+                le = 'le="' + (bound if bound == "+Inf" else _number(bound)) + '"'
+                lines.append(f"{name}_bucket{_labels(names, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(names, labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(names, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")
+)
+http_exceptions_total = registry.counter(
+    "http_exceptions_total", "Unhandled exceptions raised while serving a request.", ("method", "route")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "Request latency by route.", ("method", "route")
+)
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "Requests currently being served.")
+
+
+# --- режим нескольких воркеров: каждый воркер сбрасывает снапшот в METRICS_MULTIPROC_DIR,
+# /metrics склеивает файлы всех живых воркеров. Упавший или убитый воркер свой файл не удаляет —
+# такие файлы отбрасываем по pid, иначе его gauge'и навсегда остались бы в сумме.
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(settings.METRICS_MULTIPROC_DIR, f"metrics-{pid}.json")
+
+
+def _snapshot_pid(path: str) -> int | None:
+    try:
+        return int(os.path.basename(path)[len("metrics-"):-len(".json")])
+    except ValueError:
+        return None
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def write_snapshot() -> None:
+    path = _snapshot_path(os.getpid())
+    tmp = path + ".tmp"
+    with open(tmp, "w") as fh:
+        json.dump(registry.snapshot(), fh)
+    os.replace(tmp, path)
+
+
+def collect() -> str:
+    if not settings.METRICS_MULTIPROC_DIR:
+        return render(merge([registry.snapshot()]))
+    write_snapshot()
+    snapshots = []
+    for path in glob.glob(os.path.join(settings.METRICS_MULTIPROC_DIR, "metrics-*.json")):
+        pid = _snapshot_pid(path)
+        if pid is None:
+            continue
+        if not _alive(pid):
+            log.info("Dropping metrics snapshot of dead worker %s", path)
+            remove_snapshot(pid)
+            continue
+        try:
+            with open(path) as fh:
+                snapshots.append(json.load(fh))
+        except (OSError, ValueError):
+            log.warning("Skipping unreadable metrics snapshot %s", path)
+    return render(merge(snapshots))
+
+
+async def flush_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_INTERVAL)
+        write_snapshot()
+
+
+def remove_snapshot(pid: int | None = None) -> None:
+    try:
+        os.remove(_snapshot_path(os.getpid() if pid is None else pid))
+    except FileNotFoundError:
+        pass
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception:
+            http_exceptions_total.inc(scope["method"], _route(scope))
+            raise
+        finally:
+            http_requests_in_flight.dec()
+            route = _route(scope)
+            http_requests_total.inc(scope["method"], route, status)
+            http_request_duration_seconds.observe(time.perf_counter() - started, scope["method"], route)
+
+
+def _route(scope: Scope) -> str:
+    # шаблон пути, а не сам путь — иначе кардинальность растёт с каждым team_id
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
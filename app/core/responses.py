@@ -0,0 +1,17 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson — необязательное ускорение, без него работает stdlib json
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    # ответ по умолчанию для роутов без response_model и для «быстрых» страниц (PageSerializer)
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
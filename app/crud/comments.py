@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import delete as sa_delete, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task, TaskComment
+
+
+def cursor_key(comment: TaskComment) -> tuple:
+    return comment.created_at.isoformat(), comment.id
+
+
+def parse_cursor(key: list) -> tuple[datetime, int]:
+    try:
+        created_at, comment_id = key
+        return datetime.fromisoformat(created_at), int(comment_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+async def list_by_task_page(
+    session: AsyncSession,
+    task_id: int,
+    *,
+    limit: int,
+    after: tuple[datetime, int] | None = None,
+) -> list[TaskComment]:
+    # (task_id, created_at, id) — ровно ix_taskcomment_task_created, страница читается из индекса подряд
+    stmt = (
+        select(TaskComment)
+        .where(TaskComment.task_id == task_id)
+        .order_by(TaskComment.created_at, TaskComment.id)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(TaskComment.created_at, TaskComment.id) > tuple_(*after))
+    res = await session.execute(stmt)
+    return list(res.scalars().all())
+
+
+async def _add_to_count(session: AsyncSession, task_id: int, delta: int) -> None:
+    # атомарный инкремент в той же транзакции; updated_at задачи комментарий не меняет
+    await session.execute(
+        update(Task)
+        .where(Task.id == task_id)
+        .values(comment_count=Task.comment_count + delta, updated_at=Task.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def create(session: AsyncSession, *, task_id: int, author_id: int, body: str) -> TaskComment:
+    # время ставим сами: CURRENT_TIMESTAMP у sqlite — текст с точностью до секунды, и курсор
+    # с микросекундами сравнивался бы с ним как строка
+    stmt = (
+        insert(TaskComment)
+        .values(task_id=task_id, author_id=author_id, body=body, created_at=datetime.now(timezone.utc))
+        .returning(TaskComment)
+    )
+    comment = (await session.scalars(stmt)).one()
+    await _add_to_count(session, task_id, 1)
+    return comment
+
+
+async def get(session: AsyncSession, task_id: int, comment_id: int) -> TaskComment | None:
+    res = await session.execute(
+        select(TaskComment).where(TaskComment.id == comment_id, TaskComment.task_id == task_id)
+    )
+    return res.scalar_one_or_none()
+
+
+async def delete(session: AsyncSession, comment: TaskComment) -> None:
+    res = await session.execute(
+        sa_delete(TaskComment).where(TaskComment.id == comment.id).returning(TaskComment.id)
+    )
+    # параллельное удаление того же комментария не должно списать счётчик дважды
+    if res.scalar_one_or_none() is not None:
+        await _add_to_count(session, comment.task_id, -1)
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import delete as sa_delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.meeting import MAX_MEETING_DURATION, Meeting, time_range
+
+OVERLAP_CONSTRAINT = "ex_meeting_team_no_overlap"
+
+
+def overlaps(session: AsyncSession, starts_at: datetime, ends_at: datetime) -> list:
+    if session.bind.dialect.name == "postgresql":
+        # то же выражение, что в exclusion constraint, — планировщик берёт его GiST-индекс
+        return [time_range(Meeting.starts_at, Meeting.ends_at).op("&&")(time_range(starts_at, ends_at))]
+    # B-tree (team_id, starts_at, ends_at) плохо отвечает на «пересекается»: без нижней границы
+    # по starts_at сканировалась бы вся история команды. Длительность ограничена, поэтому
+    # пересекающие окно встречи начинаются не раньше starts_at - MAX_MEETING_DURATION.
+    return [
+        Meeting.starts_at >= starts_at - MAX_MEETING_DURATION,
+        Meeting.starts_at < ends_at,
+        Meeting.ends_at > starts_at,
+    ]
+
+
+async def list_in_window(session: AsyncSession, team_id: int, starts_at: datetime, ends_at: datetime) -> list[Meeting]:
+    res = await session.execute(
+        select(Meeting)
+        .where(Meeting.team_id == team_id, *overlaps(session, starts_at, ends_at))
+        .order_by(Meeting.starts_at, Meeting.id)
+    )
+    return list(res.scalars().all())
+
+
+async def get_in_team(session: AsyncSession, team_id: int, meeting_id: int) -> Meeting | None:
+    res = await session.execute(select(Meeting).where(Meeting.id == meeting_id, Meeting.team_id == team_id))
+    return res.scalar_one_or_none()
+
+
+async def _ensure_free(session: AsyncSession, meeting: Meeting) -> None:
+    # Postgres проверяет пересечение exclusion constraint'ом. На sqlite проверяем после записи:
+    # INSERT/UPDATE уже взял блокировку записи, поэтому параллельный писатель дождётся нашего
+    # коммита и увидит эту встречу в своей проверке.
+    if session.bind.dialect.name == "postgresql":
+        return
+    conflict = await session.scalar(
+        select(Meeting.id)
+        .where(
+            Meeting.team_id == meeting.team_id,
+            Meeting.id != meeting.id,
+            *overlaps(session, meeting.starts_at, meeting.ends_at),
+        )
+        .limit(1)
+    )
+    if conflict is not None:
+        await session.rollback()
+        raise HTTPException(status_code=409, detail=f"Meeting overlaps meeting {conflict}")
+
+
+async def _write(session: AsyncSession, stmt) -> Meeting:
+    try:
+        meeting = (await session.scalars(stmt)).one()
+    except IntegrityError as exc:
+        if OVERLAP_CONSTRAINT not in str(exc.orig):
+            raise
+        await session.rollback()
+        raise HTTPException(status_code=409, detail="Meeting overlaps another meeting of this team")
+    await _ensure_free(session, meeting)
+    return meeting
+
+
+async def create(session: AsyncSession, *, team_id: int, values: dict) -> Meeting:
+    return await _write(session, insert(Meeting).values(team_id=team_id, **values).returning(Meeting))
+
+
+async def update_fields(session: AsyncSession, meeting: Meeting, values: dict) -> Meeting:
+    stmt = (
+        update(Meeting)
+        .where(Meeting.id == meeting.id)
+        .values(**values)
+        .returning(Meeting)
+        .execution_options(populate_existing=True)
+    )
+    return await _write(session, stmt)
+
+
+async def delete(session: AsyncSession, meeting: Meeting) -> None:
+    await session.execute(sa_delete(Meeting).where(Meeting.id == meeting.id))
@@ -0,0 +1,48 @@
+from typing import Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.models.task import Task
+from app.models.task_stats import STATUSES, TeamTaskStats
+
+_stats = TeamTaskStats.__table__
+
+
+async def get(session: AsyncSession, team_id: int) -> TeamTaskStats | None:
+    return await session.get(TeamTaskStats, team_id)
+
+
+async def count_actual(conn: AsyncConnection, team_ids: Sequence[int]) -> dict[int, tuple[int, ...]]:
+    # честный COUNT(*) GROUP BY — только для сверки, не для запросов пользователей
+    res = await conn.execute(
+        select(Task.team_id, Task.status, func.count())
+        .where(Task.team_id.in_(team_ids))
+        .group_by(Task.team_id, Task.status)
+    )
+    counts: dict[int, list[int]] = {}
+    for team_id, status, count in res.all():
+        counts.setdefault(team_id, [0] * len(STATUSES))[STATUSES.index(status.value)] = count
+    return {team_id: tuple(values) for team_id, values in counts.items()}
+
+
+async def lock_stored(conn: AsyncConnection, team_ids: Sequence[int]) -> dict[int, tuple[int, ...]]:
+    # FOR UPDATE: триггеры пишущих транзакций ждут, пока сверка не перезапишет строки
+    stmt = select(_stats.c.team_id, *(_stats.c[s] for s in STATUSES)).where(_stats.c.team_id.in_(team_ids))
+    if conn.dialect.name == "postgresql":
+        stmt = stmt.with_for_update()
+    res = await conn.execute(stmt)
+    return {row[0]: tuple(row[1:]) for row in res.all()}
+
+
+async def overwrite(conn: AsyncConnection, rows: dict[int, tuple[int, ...]]) -> None:
+    insert = sqlite.insert if conn.dialect.name == "sqlite" else postgresql.insert
+    stmt = insert(_stats).values(
+        [{"team_id": team_id, **dict(zip(STATUSES, counts))} for team_id, counts in rows.items()]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_stats.c.team_id],
+        set_={**{s: stmt.excluded[s] for s in STATUSES}, "updated_at": func.now()},
+    )
+    await conn.execute(stmt)
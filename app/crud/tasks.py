@@ -0,0 +1,138 @@
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import Select, func, literal, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.task import NoDeadline, Task, TaskStatus, deadline_key
+
+
+# потолок строк на один bulk UPDATE: держим время блокировок и размер RETURNING в рамках
+BULK_UPDATE_MAX_ROWS = 1000
+
+# Порядок доски — (status, deadline NULLS LAST, id). NULL заменяем «бесконечностью» прямо в ключе:
+# ровно так лежит ix_task_team_board, поэтому страница — seek по индексу без сортировки.
+BOARD_ORDER = (Task.status, deadline_key(Task.deadline), Task.id)
+
+
+def cursor_key(task: Task) -> tuple:
+    return task.status.value, task.deadline.isoformat() if task.deadline else None, task.id
+
+
+def parse_cursor(key: list) -> tuple[TaskStatus, datetime | None, int]:
+    try:
+        status, deadline, task_id = key
+        return TaskStatus(status), datetime.fromisoformat(deadline) if deadline else None, int(task_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _after(status: TaskStatus, deadline: datetime | None, task_id: int):
+    # одно row-value сравнение — нижняя граница диапазона индекса, а не фильтр по строкам.
+    # Postgres сужает по нему весь ключ; sqlite с выражением в индексе — только по status,
+    # остаток ключа проверяет по записям индекса, но без сортировки.
+    key = NoDeadline() if deadline is None else literal(deadline, Task.deadline.type)
+    return tuple_(*BOARD_ORDER) > tuple_(literal(status, Task.status.type), key, literal(task_id))
+
+
+def _filters(
+    statuses: Sequence[TaskStatus] | None,
+    assignee_id: int | None,
+    deadline_from: datetime | None,
+    deadline_to: datetime | None,
+) -> list:
+    clauses = []
+    if statuses:
+        clauses.append(Task.status.in_(statuses))
+    if assignee_id is not None:
+        clauses.append(Task.assignee_id == assignee_id)
+    if deadline_from is not None:
+        clauses.append(Task.deadline >= deadline_from)
+    if deadline_to is not None:
+        clauses.append(Task.deadline < deadline_to)
+    return clauses
+
+
+def board_page_query(
+    team_id: int,
+    *,
+    limit: int,
+    after: tuple[TaskStatus, datetime | None, int] | None = None,
+    statuses: Sequence[TaskStatus] | None = None,
+    assignee_id: int | None = None,
+    deadline_from: datetime | None = None,
+    deadline_to: datetime | None = None,
+) -> Select:
+    # author/assignee — двумя пакетными SELECT ... WHERE id IN (...) на страницу, без lazy-загрузки по строке
+    stmt = (
+        select(Task)
+        .options(selectinload(Task.author), selectinload(Task.assignee))
+        .where(Task.team_id == team_id, *_filters(statuses, assignee_id, deadline_from, deadline_to))
+        .order_by(*BOARD_ORDER)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        stmt = stmt.where(_after(*after))
+    return stmt
+
+
+async def list_by_team_page(
+    session: AsyncSession,
+    team_id: int,
+    *,
+    limit: int,
+    after: tuple[TaskStatus, datetime | None, int] | None = None,
+    statuses: Sequence[TaskStatus] | None = None,
+    assignee_id: int | None = None,
+    deadline_from: datetime | None = None,
+    deadline_to: datetime | None = None,
+) -> list[Task]:
+    stmt = board_page_query(
+        team_id,
+        limit=limit,
+        after=after,
+        statuses=statuses,
+        assignee_id=assignee_id,
+        deadline_from=deadline_from,
+        deadline_to=deadline_to,
+    )
+    res = await session.execute(stmt)
+    return list(res.scalars().all())
+
+
+async def bulk_update(
+    session: AsyncSession,
+    team_id: int,
+    values: dict,
+    *,
+    ids: Sequence[int] | None = None,
+    statuses: Sequence[TaskStatus] | None = None,
+    assignee_id: int | None = None,
+    deadline_from: datetime | None = None,
+    deadline_to: datetime | None = None,
+    limit: int = BULK_UPDATE_MAX_ROWS,
+) -> list[int]:
+    # Один UPDATE ... WHERE id IN (SELECT id ... LIMIT n) RETURNING id. Строки, где значения уже
+    # целевые, не трогаем: RETURNING — только реально изменённые, а повтор запроса не зацикливается.
+    changed = [getattr(Task, name).is_distinct_from(value) for name, value in values.items()]
+    target = select(Task.id).where(
+        Task.team_id == team_id,
+        or_(*changed),
+        *_filters(statuses, assignee_id, deadline_from, deadline_to),
+    )
+    if ids is not None:
+        target = target.where(Task.id.in_(ids))
+    stmt = (
+        update(Task)
+        .where(Task.id.in_(target.order_by(Task.id).limit(limit)))
+        .values(**values, updated_at=func.now())
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list((await session.scalars(stmt)).all())
+
+
+async def get_in_team(session: AsyncSession, team_id: int, task_id: int) -> Task | None:
+    res = await session.execute(select(Task).where(Task.id == task_id, Task.team_id == team_id))
+    return res.scalar_one_or_none()
@@ -1,11 +1,11 @@
-from typing import Iterable
+from typing import Iterable, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import delete as sa_delete, insert, select, update as sa_update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import HTTPException
-from app.models.team import Team
+from app.models.team import Team, Worker
 
 
 async def get(session: AsyncSession, team_id: int) -> Team | None:
@@ -24,32 +24,102 @@ async def list_all(session: AsyncSession) -> list[Team]:
     return list(res.scalars().all())
 
 
+async def list_page(
+    session: AsyncSession,
+    *,
+    limit: int,
+    after: int | None = None,
+    name: str | None = None,
+    code: str | None = None,
+    ids: Iterable[int] | None = None,
+    columns: Sequence | None = None,
+) -> list:
+    # keyset по id: каждая страница — index range scan по PK, без OFFSET;
+    # columns — выбрать Row-кортежи вместо ORM-объектов (для PageSerializer)
+    stmt = select(*columns) if columns else select(Team)
+    stmt = stmt.order_by(Team.id).limit(limit + 1)
+    if after is not None:
+        stmt = stmt.where(Team.id > after)
+    if name:
+        stmt = stmt.where(Team.name.startswith(name, autoescape=True))
+    if code:
+        stmt = stmt.where(Team.code.startswith(code, autoescape=True))
+    if ids is not None:
+        stmt = stmt.where(Team.id.in_(list(ids)))
+    res = await session.execute(stmt)
+    return list(res.all() if columns else res.scalars().all())
+
+
 async def create(session: AsyncSession, *, name: str, code: str, owner_id: int | None) -> Team:
-    team = Team(name=name, code=code, owner_id=owner_id)
-    session.add(team)
+    # INSERT ... RETURNING: объект собирается из ответа, refresh() после commit не нужен
+    stmt = insert(Team).values(name=name, code=code, owner_id=owner_id).returning(Team)
     try:
-        await session.flush()
+        return (await session.scalars(stmt)).one()
     except IntegrityError:
         await session.rollback()
         raise HTTPException(status_code=409, detail="Team code already exists")
-    return team
 
 
 async def update(session: AsyncSession, team: Team, *, name: str | None = None, code: str | None = None) -> Team:
+    values = {}
     if name is not None:
-        team.name = name
+        values["name"] = name
     if code is not None:
-        team.code = code
+        values["code"] = code
+    if not values:
+        return team
+    values["version"] = Team.version + 1
+    stmt = (
+        sa_update(Team)
+        .where(Team.id == team.id)
+        .values(**values)
+        .returning(Team)
+        .execution_options(populate_existing=True)
+    )
     try:
-        await session.flush()
+        return (await session.scalars(stmt)).one()
     except IntegrityError:
         await session.rollback()
         raise HTTPException(status_code=409, detail="Team code already exists")
-    return team
+
+
+async def get_version_for_user(session: AsyncSession, team_id: int, user_id: int) -> tuple[int, bool] | None:
+    # версия и членство актёра одним лёгким запросом по колонкам, без загрузки Team в identity map
+    is_member = select(Worker.id).where(Worker.user_id == user_id, Worker.team_id == Team.id).exists()
+    row = (await session.execute(select(Team.version, is_member).where(Team.id == team_id))).one_or_none()
+    return None if row is None else (row[0], row[1])
+
+
+async def bump_version(session: AsyncSession, team_id: int) -> None:
+    await session.execute(
+        sa_update(Team)
+        .where(Team.id == team_id)
+        .values(version=Team.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def bump_versions_for_user(session: AsyncSession, user_id: int) -> None:
+    # строки workers пользователя уйдут каскадом вместе с ним — списки участников этих команд меняются
+    teams = select(Worker.team_id).where(Worker.user_id == user_id, Worker.team_id.is_not(None))
+    await session.execute(
+        sa_update(Team)
+        .where(Team.id.in_(teams))
+        .values(version=Team.version + 1)
+        .execution_options(synchronize_session=False)
+    )
 
 
 async def delete(session: AsyncSession, team: Team) -> None:
-    await session.delete(team)
+    # без ORM-каскада: иначе session.delete() подгружает members/tasks/meetings отдельными SELECT;
+    # зависимые строки удаляют ON DELETE CASCADE в БД
+    try:
+        await session.execute(
+            sa_delete(Team).where(Team.id == team.id).execution_options(synchronize_session=False)
+        )
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(status_code=409, detail="Team still has dependent records")
 
 
 async def list_by_ids(session: AsyncSession, ids: Iterable[int]) -> list[Team]:
@@ -1,10 +1,26 @@
+from typing import Sequence
+
 from fastapi import HTTPException
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, insert, literal, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.team import Worker
+from app.models.team import Team, Worker
 from app.models.team import TeamRole
+from app.models.user import User
+
+
+# ограничиваем число строк в одном INSERT: держим число bind-параметров и время блокировок в рамках
+BULK_CHUNK_SIZE = 1000
+
+
+# ключ в session.info, под которым team_utils мемоизирует права актёра на время запроса
+ACCESS_CACHE_KEY = "team_access"
+
+
+def forget_access(session: AsyncSession) -> None:
+    session.info.pop(ACCESS_CACHE_KEY, None)
 
 
 async def get_by_user_id(session: AsyncSession, user_id: int) -> Worker | None:
@@ -19,6 +35,24 @@ async def get_by_user_and_team(session: AsyncSession, user_id: int, team_id: int
     return res.scalar_one_or_none()
 
 
+async def get_team_with_actor(
+    session: AsyncSession, team_id: int, user_id: int
+) -> tuple[Team | None, Worker | None]:
+    # команда и worker актёра одним запросом: team LEFT JOIN workers
+    res = await session.execute(
+        select(Team, Worker)
+        .select_from(Team)
+        .outerjoin(Worker, Worker.user_id == user_id)
+        .where(Team.id == team_id)
+    )
+    rows = res.all()
+    if not rows:
+        return None, None
+    team = rows[0][0]
+    worker = next((w for _, w in rows if w is not None and w.team_id == team_id), rows[0][1])
+    return team, worker
+
+
 async def get_by_user_id_or_404(session: AsyncSession, user_id: int) -> Worker:
     worker = await get_by_user_id(session, user_id)
     if worker is None:
@@ -26,24 +60,64 @@ async def get_by_user_id_or_404(session: AsyncSession, user_id: int) -> Worker:
     return worker
 
 
-async def create_membership(session: AsyncSession, *, user_id: int, team_id: int, role: TeamRole) -> Worker:
-    w = Worker(user_id=user_id, team_id=team_id, role_in_team=role)
-    session.add(w)
+async def create_membership(session: AsyncSession, *, user_id: int, team_id: int | None, role: TeamRole) -> Worker:
+    forget_access(session)
+    stmt = insert(Worker).values(user_id=user_id, team_id=team_id, role_in_team=role).returning(Worker)
     try:
-        await session.flush()
+        return (await session.scalars(stmt)).one()
     except IntegrityError:
         await session.rollback()
         raise HTTPException(status_code=409, detail="Membership already exists")
-    return w
+
+
+async def update_membership(session: AsyncSession, worker: Worker, *, team_id: int, role: TeamRole) -> Worker:
+    forget_access(session)
+    stmt = (
+        update(Worker)
+        .where(Worker.id == worker.id)
+        .values(team_id=team_id, role_in_team=role)
+        .returning(Worker)
+        .execution_options(populate_existing=True)
+    )
+    return (await session.scalars(stmt)).one()
+
+
+async def set_role_in_team(session: AsyncSession, *, user_id: int, team_id: int, role: TeamRole) -> Worker | None:
+    # проверка членства и смена роли одним UPDATE ... WHERE team_id = :team_id RETURNING
+    forget_access(session)
+    stmt = (
+        update(Worker)
+        .where(Worker.user_id == user_id, Worker.team_id == team_id)
+        .values(role_in_team=role)
+        .returning(Worker)
+        .execution_options(populate_existing=True)
+    )
+    return (await session.scalars(stmt)).one_or_none()
 
 
 async def ensure_exists(session: AsyncSession, user_id: int) -> Worker:
-    worker = await get_by_user_id(session, user_id)
-    if worker is None:
-        worker = Worker(user_id=user_id, team_id=None, role_in_team=TeamRole.employee)
-        session.add(worker)
-        await session.flush()
-    return worker
+    # Вставляем worker без команды, только если у пользователя ещё нет ни одного worker'а.
+    # Гонку одновременных вставок гасит частичный уникальный индекс uq_workers_user_id_no_team:
+    # проигравший INSERT ничего не вставит, и мы дочитаем строку победителя.
+    stmt = (
+        _insert(session)(Worker)
+        .from_select(
+            ["user_id", "team_id", "role_in_team"],
+            select(
+                literal(user_id),
+                literal(None, Worker.team_id.type),
+                literal(TeamRole.employee, Worker.role_in_team.type),
+            ).where(~select(Worker.id).where(Worker.user_id == user_id).exists()),
+        )
+        .on_conflict_do_nothing(index_elements=[Worker.user_id], index_where=Worker.team_id.is_(None))
+        .returning(Worker)
+    )
+    worker = (await session.scalars(stmt)).one_or_none()
+    if worker is not None:
+        forget_access(session)
+        return worker
+    res = await session.execute(select(Worker).where(Worker.user_id == user_id).order_by(Worker.id).limit(1))
+    return res.scalar_one()
 
 
 async def list_by_team(session: AsyncSession, team_id: int) -> list[Worker]:
@@ -51,11 +125,84 @@ async def list_by_team(session: AsyncSession, team_id: int) -> list[Worker]:
     return list(res.scalars().all())
 
 
+async def list_by_team_page(
+    session: AsyncSession,
+    team_id: int,
+    *,
+    limit: int,
+    after: int | None = None,
+    columns: Sequence | None = None,
+) -> list:
+    stmt = select(*columns) if columns else select(Worker)
+    stmt = stmt.where(Worker.team_id == team_id).order_by(Worker.id).limit(limit + 1)
+    if after is not None:
+        stmt = stmt.where(Worker.id > after)
+    res = await session.execute(stmt)
+    return list(res.all() if columns else res.scalars().all())
+
+
+def _insert(session: AsyncSession):
+    # INSERT ... ON CONFLICT есть и у postgres, и у sqlite, но конструкции разные
+    if session.bind.dialect.name == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
+
+
+async def get_team_ids_by_user(session: AsyncSession, user_ids: list[int]) -> dict[int, set[int | None]]:
+    # user_id -> team_id его worker'ов (None — worker без команды, пустое множество — worker'а нет);
+    # пользователей, которых нет в БД, в ответе нет
+    res = await session.execute(
+        select(User.id, Worker.id, Worker.team_id)
+        .outerjoin(Worker, Worker.user_id == User.id)
+        .where(User.id.in_(user_ids))
+    )
+    teams: dict[int, set[int | None]] = {}
+    for user_id, worker_id, team_id in res.all():
+        ids = teams.setdefault(user_id, set())
+        if worker_id is not None:
+            ids.add(team_id)
+    return teams
+
+
+async def upsert_memberships(
+    session: AsyncSession, team_id: int, members: list[tuple[int, TeamRole]]
+) -> None:
+    forget_access(session)
+    for start in range(0, len(members), BULK_CHUNK_SIZE):
+        chunk = members[start:start + BULK_CHUNK_SIZE]
+        stmt = _insert(session)(Worker).values(
+            [{"user_id": user_id, "team_id": team_id, "role_in_team": role} for user_id, role in chunk]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Worker.user_id, Worker.team_id],
+            set_={"role_in_team": stmt.excluded.role_in_team},
+        )
+        await session.execute(stmt)
+
+
+async def attach_to_team(session: AsyncSession, team_id: int, user_ids: list[int], role: TeamRole) -> None:
+    # worker'ы без команды (team_id IS NULL) не конфликтуют по uq_worker_user_team, их переносим UPDATE'ом
+    forget_access(session)
+    for start in range(0, len(user_ids), BULK_CHUNK_SIZE):
+        await session.execute(
+            update(Worker)
+            .where(Worker.user_id.in_(user_ids[start:start + BULK_CHUNK_SIZE]), Worker.team_id.is_(None))
+            .values(team_id=team_id, role_in_team=role)
+        )
+
+
 async def delete_by_user_id(session: AsyncSession, user_id: int) -> None:
+    forget_access(session)
     await session.execute(delete(Worker).where(Worker.user_id == user_id))
 
 
+async def delete_from_team(session: AsyncSession, *, user_id: int, team_id: int) -> None:
+    forget_access(session)
+    await session.execute(delete(Worker).where(Worker.user_id == user_id, Worker.team_id == team_id))
+
+
 async def delete_by_team(session: AsyncSession, team_id: int) -> None:
+    forget_access(session)
     await session.execute(
         delete(Worker).where(Worker.team_id == team_id)
     )
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+# за сколько секунд пик недавнего ожидания пула затухает в e раз
+WAIT_DECAY_SECONDS = 1.0
+
+
+def engine_options(database_url: str) -> dict[str, Any]:
+    url = make_url(database_url)
+    # sqlite (тесты, локальный запуск) работает на пулах по умолчанию
+    if url.get_backend_name() == "sqlite":
+        return {}
+    options: dict[str, Any] = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._recent_wait = 0.0
+        self._recent_at = 0.0
+        self._waiting: dict[object, float] = {}
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+        now = time.monotonic()
+        self._recent_wait = max(seconds, self._decayed(now))
+        self._recent_at = now
+
+    def _decayed(self, now: float) -> float:
+        return self._recent_wait * math.exp(-(now - self._recent_at) / WAIT_DECAY_SECONDS)
+
+    def wait_started(self) -> object:
+        token = object()
+        self._waiting[token] = time.monotonic()
+        return token
+
+    def wait_finished(self, token: object) -> None:
+        self._waiting.pop(token, None)
+
+    def recent_wait(self) -> float:
+        # затухающий пик последних ожиданий плюс возраст самого старого ещё ждущего checkout:
+        # пока запросы отбрасываются, новых checkout нет — сигнал сам спадает и приём возобновляется
+        now = time.monotonic()
+        oldest = min(self._waiting.values(), default=now)
+        return max(self._decayed(now), now - oldest)
+
+    def snapshot(self, engine: AsyncEngine) -> dict[str, float]:
+        pool = engine.sync_engine.pool
+        return {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_max": self.wait_seconds_max,
+            "wait_seconds_recent": self.recent_wait(),
+            "size": pool.size() if hasattr(pool, "size") else 0,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+            "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+def instrument(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        pool_metrics.connects += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_metrics.checkouts += 1
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        pool_metrics.checkins += 1
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        pool_metrics.invalidations += 1
+
+
+async def acquire(engine: AsyncEngine) -> AsyncConnection:
+    # у пула нет события «ожидание», поэтому время ожидания и таймауты меряем здесь
+    started = time.perf_counter()
+    token = pool_metrics.wait_started()
+    try:
+        connection = await engine.connect()
+    except PoolTimeoutError:
+        pool_metrics.timeouts += 1
+        raise
+    finally:
+        pool_metrics.wait_finished(token)
+        pool_metrics.observe_wait(time.perf_counter() - started)
+    return connection
+
+
+async def warm_up(engine: AsyncEngine, connections: int) -> None:
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    if connections <= 0:
+        return
+    try:
+        await asyncio.gather(*(_ping() for _ in range(connections)))
+    except Exception as exc:
+        log.warning("Pool warm-up failed: %s", exc)
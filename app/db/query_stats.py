@@ -0,0 +1,115 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class QueryStats:
+    def __init__(self, method: str = "", path: str = "") -> None:
+        self.method = method
+        self.path = path
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter[str] = Counter()
+        self.budget: int | None = None
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        self.shapes[statement] += 1
+        repeats = self.shapes[statement]
+        # предупреждаем один раз на «форму» запроса — ровно в момент пересечения порога
+        if repeats == settings.SQL_N_PLUS_ONE_THRESHOLD + 1:
+            log.warning(
+                "Possible N+1 in %s %s: statement repeated more than %d times: %s",
+                self.method, self.path, settings.SQL_N_PLUS_ONE_THRESHOLD, " ".join(statement.split())[:300],
+            )
+        if self.budget is not None and self.count > self.budget and settings.SQL_QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(
+                f"{self.method} {self.path} exceeded its query budget of {self.budget}: "
+                f"{self.count} statements so far"
+            )
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries", '
+            f"total;dur={total_seconds * 1000:.2f}"
+        )
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current() -> QueryStats | None:
+    return _current.get()
+
+
+def query_budget(limit: int):
+    # Depends(query_budget(n)) в декораторе роута: в strict-режиме (тесты) превышение роняет запрос
+    async def _set_budget() -> None:
+        stats = _current.get()
+        if stats is not None:
+            stats.budget = limit
+
+    return _set_budget
+
+
+def instrument(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started_at"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.duration += time.perf_counter() - started
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context):
+        started = context.connection.info.get("query_started_at") if context.connection else None
+        if started:
+            started.pop()
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.SQL_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope["method"], scope["path"])
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing(time.perf_counter() - started))
+            await send(message)
+
+        token = _current.set(stats)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
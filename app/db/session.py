@@ -1,13 +1,39 @@
+from typing import AsyncGenerator
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db import pool, query_stats
 
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False, future=True)
+engine = create_async_engine(
+    settings.DATABASE_URL, echo=False, future=True, **pool.engine_options(settings.DATABASE_URL)
+)
+pool.instrument(engine)
+query_stats.instrument(engine)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
-async def get_session() -> AsyncSession:
-    async with AsyncSessionLocal() as session:
-        yield session
+@event.listens_for(engine.sync_engine, "connect")
+def _sqlite_foreign_keys(dbapi_connection, connection_record):
+    # sqlite по умолчанию не проверяет внешние ключи и не выполняет ON DELETE CASCADE —
+    # включаем, чтобы тесты и локальный запуск вели себя как Postgres
+    if engine.dialect.name == "sqlite":
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    # Одна сессия и одно соединение на запрос: FastAPI кэширует зависимость в рамках
+    # запроса, поэтому get_user_db, get_access_token_db и SessionDep получают один и тот же
+    # объект. Сессия привязана к соединению, а не к engine, чтобы commit() посреди запроса
+    # не возвращал соединение в пул и следующий запрос к БД не брал его заново.
+    connection = await pool.acquire(engine)
+    try:
+        async with AsyncSessionLocal(bind=connection) as session:
+            yield session
+    finally:
+        await connection.close()
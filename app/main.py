@@ -1,41 +1,99 @@
+import asyncio
+import functools
+import os
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import APIRouter, FastAPI, Request, Depends
+from fastapi.datastructures import Default
 from fastapi.responses import HTMLResponse
 from fastapi.security import HTTPBearer
-from fastapi.templating import Jinja2Templates
 from starlette.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from app.api.v1.routes import router as api_v1_router
-from app.auth.actions.admin import router as admin_router
 from app.auth.auth import fastapi_users, auth_backend, current_user
+from app.auth.passwords import password_helper
+from app.auth.token_sweeper import token_sweeper
 from app.auth.users_self_router import build_self_router
 from app.auth.schemas import UserRead, UserCreate, UserAdminUpdate, UserSelfUpdate
+from app.core import lazy, metrics
+from app.core.admission import AdmissionMiddleware
 from app.core.config import settings
-from app.db.session import get_session
+from app.core.responses import FastJSONResponse
+from app.db import pool
+from app.db.query_stats import QueryStatsMiddleware
+from app.db.session import engine, get_session
 from app.models.user import User
-from app.routers.system_routes import sys_router
+from app.routers.meetings import meetings_router
 from app.routers.members import members_router
+from app.routers.metrics import metrics_router
+from app.routers.tasks import tasks_router
 from app.routers.teams import teams_router
-
-
-app = FastAPI(title=settings.APP_NAME)
-
+from app.services.task_stats import task_stats_reconciler
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await pool.warm_up(engine, settings.DB_POOL_WARMUP)
+    flusher = None
+    if settings.METRICS_MULTIPROC_DIR:
+        os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+        flusher = asyncio.create_task(metrics.flush_periodically())
+    sweeper = None
+    if settings.TOKEN_SWEEP_ENABLED:
+        sweeper = asyncio.create_task(token_sweeper.run_forever(engine))
+    reconciler = None
+    if settings.TASK_STATS_RECONCILE_ENABLED:
+        reconciler = asyncio.create_task(task_stats_reconciler.run_forever(engine))
+    yield
+    for task in (sweeper, reconciler):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    if flusher is not None:
+        flusher.cancel()
+        with suppress(asyncio.CancelledError):
+            await flusher
+        metrics.remove_snapshot()
+    await engine.dispose()
+    password_helper.shutdown()
+
+
+# Default(...), а не сам класс: для роутов с response_model FastAPI тогда сериализует
+# через pydantic dump_json, а orjson достаётся ответам без модели
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan, default_response_class=Default(FastJSONResponse))
+
+app.add_middleware(QueryStatsMiddleware)
+# внутри MetricsMiddleware: отброшенные запросы видны в http_requests_total как 503
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+# добавлен последним — самый внешний: preflight отвечается до admission control, а 503 от него
+# получают CORS-заголовки, иначе браузер не отдаст клиенту ни ответ, ни Retry-After
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
-templates = Jinja2Templates(directory="app/web/templates")
+@functools.cache
+def templates():
+    # jinja2 нужен только главной странице — не тянем его в холодный импорт
+    from fastapi.templating import Jinja2Templates
+
+    return Jinja2Templates(directory="app/web/templates")
 
 
 @app.get("/", response_class=HTMLResponse)
 def index(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request, "app_name": settings.APP_NAME})
+    return templates().TemplateResponse("index.html", {"request": request, "app_name": settings.APP_NAME})
 
 
 @app.get("/health")
@@ -100,7 +158,14 @@ async def delete_me(user: User = Depends(current_user)):
     return {"status": "deleted"}
 
 app.include_router(users_me_delete_router)
-app.include_router(admin_router)
-app.include_router(sys_router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
 app.include_router(members_router)
 app.include_router(teams_router)
+app.include_router(tasks_router)
+app.include_router(meetings_router)
+
+# редкие роутеры импортируются при первом обращении; регистрируются последними (см. LazyRouter)
+lazy.add_lazy_router(app, "/admin", "app.auth.actions.admin:router")
+lazy.add_lazy_router(app, "/system", "app.routers.system_routes:sys_router")
+lazy.install_openapi(app)
@@ -2,6 +2,7 @@ from .base import Base
 from .user import User
 from .team import Team, Worker
 from .task import Task, TaskComment
+from .task_stats import TeamTaskStats
 from .meeting import Meeting
 from .evaluation import Evaluation
 from .access_token_class import AccessToken
\ No newline at end of file
@@ -1,11 +1,22 @@
-from sqlalchemy import Integer, String, Text, ForeignKey, DateTime, Index
+from datetime import timedelta
+
+from sqlalchemy import CheckConstraint, DDL, Integer, String, Text, ForeignKey, DateTime, Index, event, func, literal_column
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
 
+# верхняя граница длительности: на sqlite по ней сужается диапазон индекса в запросах пересечения
+MAX_MEETING_DURATION = timedelta(hours=24)
+
+
+def time_range(starts_at, ends_at):
+    # полуоткрытый интервал: встреча 10:00–11:00 не пересекается со встречей 11:00–12:00
+    return func.tstzrange(starts_at, ends_at, literal_column("'[)'"))
+
 
 class Meeting(Base):
-    team_id: Mapped[int] = mapped_column(ForeignKey("team.id"), nullable=False, index=True)
+    team_id: Mapped[int] = mapped_column(ForeignKey("team.id", ondelete="CASCADE"), nullable=False, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     notes: Mapped[str | None] = mapped_column(Text(), nullable=True)
     starts_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -13,5 +24,24 @@ class Meeting(Base):
 
     team: Mapped["Team"] = relationship(back_populates="meetings")
 
+    __table_args__ = (
+        CheckConstraint("ends_at > starts_at", name="ends_after_start"),
+        # Postgres сам не даёт пересечься встречам одной команды; GiST-индекс этого ограничения
+        # заодно обслуживает запросы пересечения с окном в crud.meetings
+        ExcludeConstraint(
+            (literal_column("team_id"), "="),
+            (time_range(literal_column("starts_at"), literal_column("ends_at")), "&&"),
+            name="ex_meeting_team_no_overlap",
+            using="gist",
+        ).ddl_if(dialect="postgresql"),
+    )
+
 
 Index("ix_meeting_team_time", Meeting.team_id, Meeting.starts_at, Meeting.ends_at)
+
+# `=` по integer в GiST даёт расширение btree_gist
+event.listen(
+    Meeting.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
@@ -1,7 +1,9 @@
 import enum
 
 from sqlalchemy import Integer, String, Text, ForeignKey, DateTime, Enum, Index, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Mapped, WriteOnlyMapped, mapped_column, relationship
+from sqlalchemy.sql.expression import ColumnElement
 
 from .base import Base
 
@@ -13,7 +15,7 @@ class TaskStatus(str, enum.Enum):
 
 
 class Task(Base):
-    team_id: Mapped[int] = mapped_column(ForeignKey("team.id"), nullable=False, index=True)
+    team_id: Mapped[int] = mapped_column(ForeignKey("team.id", ondelete="CASCADE"), nullable=False, index=True)
     author_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False, index=True)
     assignee_id: Mapped[int | None] = mapped_column(ForeignKey("user.id"), nullable=True, index=True)
 
@@ -23,20 +25,53 @@ class Task(Base):
     deadline: Mapped["DateTime | None"] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # ведётся crud.comments при добавлении и удалении комментария — списки задач не считают их JOIN'ом
+    comment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     team: Mapped["Team"] = relationship(back_populates="tasks")
     author: Mapped["User"] = relationship(back_populates="authored_tasks", foreign_keys=[author_id])
     assignee: Mapped["User | None"] = relationship(back_populates="assigned_tasks", foreign_keys=[assignee_id])
-    comments: Mapped[list["TaskComment"]] = relationship(back_populates="task", cascade="all, delete-orphan")
+    # write-only: у занятой задачи тысячи комментариев, целиком их не грузим — только страницами;
+    # при удалении задачи комментарии удаляет ON DELETE CASCADE в БД
+    comments: WriteOnlyMapped["TaskComment"] = relationship(
+        back_populates="task", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
-Index("ix_task_team_status_deadline", Task.team_id, Task.status, Task.deadline)
+class NoDeadline(ColumnElement):
+    # «бесконечный» дедлайн: больше любого настоящего, так задача без срока встаёт в конец статуса
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(NoDeadline)
+def _no_deadline_sqlite(element, compiler, **kw):
+    # sqlite хранит время текстом 'YYYY-MM-DD HH:MM:SS.ffffff' и сравнивает его как строку
+    return "'9999-12-31 23:59:59.999999'"
+
+
+@compiles(NoDeadline, "postgresql")
+def _no_deadline_pg(element, compiler, **kw):
+    return "'infinity'::timestamptz"
+
+
+def deadline_key(deadline):
+    return func.coalesce(deadline, NoDeadline())
+
+
+# Ключ доски без NULL: (status, coalesce(deadline, ∞), id) — страница после курсора это одно
+# row-value сравнение, т.е. диапазон индекса на обеих СУБД, и порядок индекса совпадает с ORDER BY.
+Index("ix_task_team_board", Task.team_id, Task.status, deadline_key(Task.deadline), Task.id)
 
 
 class TaskComment(Base):
-    task_id: Mapped[int] = mapped_column(ForeignKey("task.id"), nullable=False, index=True)
+    task_id: Mapped[int] = mapped_column(ForeignKey("task.id", ondelete="CASCADE"), nullable=False)
     author_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False, index=True)
     body: Mapped[str] = mapped_column(Text(), nullable=False)
     created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     task: Mapped["Task"] = relationship(back_populates="comments")
+
+
+# ключ keyset-страниц комментариев; заменяет одиночный индекс по task_id, он был его префиксом
+Index("ix_taskcomment_task_created", TaskComment.task_id, TaskComment.created_at, TaskComment.id)
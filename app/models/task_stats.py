@@ -0,0 +1,107 @@
+from sqlalchemy import DDL, DateTime, ForeignKey, Integer, event, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, metadata
+from .task import TaskStatus
+
+STATUSES = [status.value for status in TaskStatus]
+
+
+class TeamTaskStats(Base):
+    """Число задач команды по статусам — одна строка на команду.
+
+    Поддерживается триггерами на task в той же транзакции, что и запись задачи; расхождения
+    (ручные правки, загрузка с отключёнными триггерами) чинит фоновая сверка в services.task_stats.
+    """
+
+    __tablename__ = "team_task_stats"
+    id = None
+    team_id: Mapped[int] = mapped_column(ForeignKey("team.id", ondelete="CASCADE"), primary_key=True)
+    open: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    in_progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    done: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+# --- Postgres: триггеры уровня оператора с transition tables. Bulk UPDATE на тысячу задач или COPY
+# делают один агрегированный upsert на команду, а не тысячу обновлений одной горячей строки.
+
+def _pg_upsert(deltas: str) -> str:
+    sums = [f"coalesce(sum(n) FILTER (WHERE status = '{s}'), 0)::int" for s in STATUSES]
+    changed = " OR ".join(f"{total} <> 0" for total in sums)
+    updates = ", ".join(f"{s} = s.{s} + EXCLUDED.{s}" for s in STATUSES)
+    return (
+        f"INSERT INTO team_task_stats AS s (team_id, {', '.join(STATUSES)}) "
+        f"SELECT team_id, {', '.join(sums)} FROM ({deltas}) d "
+        # при удалении команды её задачи уходят каскадом — строку статистики не воскрешаем
+        "WHERE EXISTS (SELECT 1 FROM team t WHERE t.id = d.team_id) "
+        f"GROUP BY team_id HAVING {changed} "
+        f"ON CONFLICT (team_id) DO UPDATE SET {updates}, updated_at = now();"
+    )
+
+
+PG_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION team_task_stats_apply() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_pg_upsert("SELECT team_id, status::text AS status, 1 AS n FROM new_rows")}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_pg_upsert("SELECT team_id, status::text AS status, -1 AS n FROM old_rows")}
+    ELSE
+        {_pg_upsert(
+            "SELECT team_id, status::text AS status, 1 AS n FROM new_rows "
+            "UNION ALL SELECT team_id, status::text, -1 FROM old_rows"
+        )}
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+# transition tables нельзя объявить у триггера на несколько событий — по триггеру на событие
+PG_TRIGGERS = [
+    "CREATE TRIGGER trg_task_stats_insert AFTER INSERT ON task REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION team_task_stats_apply()",
+    "CREATE TRIGGER trg_task_stats_update AFTER UPDATE ON task "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION team_task_stats_apply()",
+    "CREATE TRIGGER trg_task_stats_delete AFTER DELETE ON task REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION team_task_stats_apply()",
+]
+
+PG_DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS trg_task_stats_insert ON task",
+    "DROP TRIGGER IF EXISTS trg_task_stats_update ON task",
+    "DROP TRIGGER IF EXISTS trg_task_stats_delete ON task",
+]
+PG_DROP_FUNCTION = "DROP FUNCTION IF EXISTS team_task_stats_apply()"
+
+
+# --- SQLite: только построчные триггеры, но и писатель там один
+
+def _sqlite_add(row: str, sign: str) -> str:
+    flags = ", ".join(f"{sign}({row}.status = '{s}')" for s in STATUSES)
+    updates = ", ".join(f"{s} = {s} + excluded.{s}" for s in STATUSES)
+    return (
+        f"INSERT INTO team_task_stats (team_id, {', '.join(STATUSES)}) SELECT {row}.team_id, {flags} "
+        f"WHERE EXISTS (SELECT 1 FROM team WHERE id = {row}.team_id) "
+        f"ON CONFLICT (team_id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP;"
+    )
+
+
+SQLITE_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS trg_task_stats_insert AFTER INSERT ON task BEGIN {_sqlite_add('NEW', '')} END",
+    f"CREATE TRIGGER IF NOT EXISTS trg_task_stats_delete AFTER DELETE ON task BEGIN {_sqlite_add('OLD', '-')} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_task_stats_update AFTER UPDATE OF status, team_id ON task "
+    "WHEN OLD.status IS NOT NEW.status OR OLD.team_id IS NOT NEW.team_id "
+    f"BEGIN {_sqlite_add('OLD', '-')} {_sqlite_add('NEW', '')} END",
+]
+
+
+# триггеры на task ссылаются на team_task_stats, поэтому вешаем их после создания всех таблиц;
+# create_all по существующей схеме не должен падать на уже созданных триггерах
+event.listen(metadata, "after_create", DDL(PG_FUNCTION).execute_if(dialect="postgresql"))
+for _ddl in PG_DROP_TRIGGERS + PG_TRIGGERS:
+    event.listen(metadata, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
+for _ddl in SQLITE_TRIGGERS:
+    event.listen(metadata, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Enum, String, ForeignKey, UniqueConstraint
+from sqlalchemy import Enum, Index, Integer, String, ForeignKey, UniqueConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -10,10 +10,13 @@ class Team(Base):
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     code: Mapped[str] = mapped_column(String(64), unique=True, index=True, nullable=False)
     owner_id: Mapped[int | None] = mapped_column(ForeignKey("user.id"), nullable=True)
+    # растёт при любом изменении команды или её состава; из него строятся ETag для GET
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
 
     members: Mapped[list["Worker"]] = relationship(back_populates="team", cascade="all, delete-orphan")
-    tasks: Mapped[list["Task"]] = relationship(back_populates="team")
-    meetings: Mapped[list["Meeting"]] = relationship(back_populates="team")
+    # задачи и встречи удаляет ON DELETE CASCADE в БД (комментарии и статистику — их собственные каскады)
+    tasks: Mapped[list["Task"]] = relationship(back_populates="team", passive_deletes=True)
+    meetings: Mapped[list["Meeting"]] = relationship(back_populates="team", passive_deletes=True)
 
 
 class TeamRole(str, enum.Enum):
@@ -37,4 +40,13 @@ class Worker(Base):
     __table_args__ = (
         # чтобы не было дублей членства в одной и той же команде
         UniqueConstraint("user_id", "team_id", name="uq_worker_user_team"),
+        # NULL в team_id не конфликтует по uq_worker_user_team, поэтому «worker без команды»
+        # ограничиваем отдельным частичным индексом — на него опирается upsert в crud.workers.ensure_exists
+        Index(
+            "uq_workers_user_id_no_team",
+            "user_id",
+            unique=True,
+            postgresql_where=text("team_id IS NULL"),
+            sqlite_where=text("team_id IS NULL"),
+        ),
     )
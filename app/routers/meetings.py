@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.core.dependencies import SessionDep, CurrentUser
+from app.db.query_stats import query_budget
+from app.schemas.meetings import MeetingIn, MeetingRead, MeetingUpdate
+from app.services import meetings as svc_meetings
+
+
+meetings_router = APIRouter(prefix="/teams", tags=["meetings"])
+
+
+@meetings_router.get(
+    "/{team_id}/meetings",
+    response_model=list[MeetingRead],
+    dependencies=[Depends(query_budget(4))],
+)
+async def list_meetings(
+    team_id: int,
+    session: SessionDep,
+    user: CurrentUser,
+    starts_at: Annotated[datetime, Query(alias="from")],
+    ends_at: Annotated[datetime, Query(alias="to")],
+):
+    # все встречи, пересекающие окно [from, to)
+    return await svc_meetings.list_meetings(
+        session, actor=user, team_id=team_id, starts_at=starts_at, ends_at=ends_at
+    )
+
+
+@meetings_router.post(
+    "/{team_id}/meetings",
+    response_model=MeetingRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(5))],
+)
+async def create_meeting(team_id: int, body: MeetingIn, session: SessionDep, user: CurrentUser):
+    return await svc_meetings.create_meeting(session, actor=user, team_id=team_id, body=body)
+
+
+@meetings_router.get(
+    "/{team_id}/meetings/{meeting_id}",
+    response_model=MeetingRead,
+    dependencies=[Depends(query_budget(4))],
+)
+async def get_meeting(team_id: int, meeting_id: int, session: SessionDep, user: CurrentUser):
+    return await svc_meetings.get_meeting(session, actor=user, team_id=team_id, meeting_id=meeting_id)
+
+
+@meetings_router.patch(
+    "/{team_id}/meetings/{meeting_id}",
+    response_model=MeetingRead,
+    dependencies=[Depends(query_budget(6))],
+)
+async def update_meeting(team_id: int, meeting_id: int, body: MeetingUpdate, session: SessionDep, user: CurrentUser):
+    return await svc_meetings.update_meeting(
+        session, actor=user, team_id=team_id, meeting_id=meeting_id, body=body
+    )
+
+
+@meetings_router.delete(
+    "/{team_id}/meetings/{meeting_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(query_budget(5))],
+)
+async def delete_meeting(team_id: int, meeting_id: int, session: SessionDep, user: CurrentUser):
+    await svc_meetings.delete_meeting(session, actor=user, team_id=team_id, meeting_id=meeting_id)
+    return None
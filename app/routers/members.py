@@ -1,39 +1,102 @@
-from typing import List
+from typing import Annotated
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 
 from app.core.dependencies import SessionDep, CurrentUser
+from app.db.query_stats import query_budget
 from app.crud import workers as crud_workers
-from app.schemas.members import MemberIn, MemberRead, MemberUpdate
+from app.schemas.members import MemberBulkIn, MemberBulkResult, MemberIn, MemberRead, MemberUpdate, member_page
+from app.schemas.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, Page
+from app.services import export as svc_export
 from app.services import members as members_services
-from app.utils import team_utils
+from app.services import teams as svc_teams
+from app.utils import etag, team_utils
 
 
 members_router = APIRouter(prefix="/members", tags=["members"])
 
 
-@members_router.get("/{team_id}/members", response_model=List[MemberRead])
-async def list_members(team_id: int, session: SessionDep, user: CurrentUser):
+@members_router.get(
+    "/{team_id}/members",
+    response_model=Page[MemberRead],
+    dependencies=[Depends(query_budget(5))],
+)
+async def list_members(
+    team_id: int,
+    request: Request,
+    session: SessionDep,
+    user: CurrentUser,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)] = DEFAULT_PAGE_LIMIT,
+    cursor: int | None = None,
+):
+    if etag.has_condition(request):
+        version = await svc_teams.get_team_version_for_user(session, actor=user, team_id=team_id)
+        if version is not None:
+            current = etag.team_etag("members", team_id, version)
+            if etag.matches(request, current):
+                return etag.not_modified(current)
+    # команда нужна ради версии для ETag; для не-суперюзера этот же запрос проверяет членство
+    access = await team_utils.get_team_access(session, user.id, team_id)
     if not await team_utils.is_superuser(user):
         await team_utils.require_member(session, user.id, team_id)
-    return await crud_workers.list_by_team(session, team_id)
+    rows = await crud_workers.list_by_team_page(
+        session, team_id, limit=limit, after=cursor, columns=member_page.columns
+    )
+    response = member_page.response(rows, limit)
+    if access.team is not None:
+        etag.set_headers(response, etag.team_etag("members", team_id, access.team.version))
+    return response
+
 
+@members_router.get("/{team_id}/export", dependencies=[Depends(query_budget(4))])
+async def export_members(
+    team_id: int, session: SessionDep, user: CurrentUser, format: svc_export.ExportFormat = "ndjson"
+):
+    if not await team_utils.is_superuser(user):
+        await team_utils.require_member(session, user.id, team_id)
+    return StreamingResponse(
+        svc_export.stream_rows(session, svc_export.members_query(team_id), format),
+        media_type=svc_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="team-{team_id}-members.{format}"'},
+    )
 
-@members_router.post("/{team_id}/members", response_model=MemberRead, status_code=status.HTTP_201_CREATED)
+
+@members_router.post(
+    "/{team_id}/members",
+    response_model=MemberRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(6))],
+)
 async def add_member(team_id: int, body: MemberIn, session: SessionDep, user: CurrentUser):
     return await members_services.add_member(
         session, actor=user, team_id=team_id, user_id=body.user_id, role=body.role
     )
 
 
-@members_router.patch("/{team_id}/members/{user_id}", response_model=MemberRead)
+@members_router.post("/{team_id}/members:bulk", response_model=MemberBulkResult)
+async def bulk_add_members(team_id: int, body: MemberBulkIn, session: SessionDep, user: CurrentUser):
+    return await members_services.bulk_add_members(
+        session, actor=user, team_id=team_id, members=[(m.user_id, m.role) for m in body]
+    )
+
+
+@members_router.patch(
+    "/{team_id}/members/{user_id}",
+    response_model=MemberRead,
+    dependencies=[Depends(query_budget(4))],
+)
 async def change_member_role(team_id: int, user_id: int, body: MemberUpdate, session: SessionDep, user: CurrentUser):
     return await members_services.change_member_role(
         session, actor=user, team_id=team_id, user_id=user_id, role=body.role
     )
 
 
-@members_router.delete("/{team_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@members_router.delete(
+    "/{team_id}/members/{user_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(query_budget(4))],
+)
 async def remove_member(team_id: int, user_id: int, session: SessionDep, user: CurrentUser):
     await members_services.remove_member(session, actor=user, team_id=team_id, user_id=user_id)
     return None
@@ -0,0 +1,80 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.auth.token_cache import token_cache
+from app.auth.token_sweeper import token_sweeper
+from app.core import metrics
+from app.db.pool import pool_metrics
+from app.db.session import engine
+from app.services.task_stats import task_stats_reconciler
+
+metrics_router = APIRouter(tags=["system"])
+
+db_pool_connections = metrics.registry.gauge(
+    "db_pool_connections", "Connections in the SQLAlchemy pool by state.", ("state",)
+)
+db_pool_checkouts_total = metrics.registry.counter("db_pool_checkouts_total", "Pool checkouts.")
+db_pool_timeouts_total = metrics.registry.counter("db_pool_timeouts_total", "Pool checkout timeouts.")
+db_pool_wait_seconds_total = metrics.registry.counter(
+    "db_pool_wait_seconds_total", "Time spent waiting for a pooled connection."
+)
+auth_token_cache_requests_total = metrics.registry.counter(
+    "auth_token_cache_requests_total", "Bearer token cache lookups.", ("result",)
+)
+auth_token_cache_entries = metrics.registry.gauge("auth_token_cache_entries", "Cached bearer tokens.")
+auth_token_sweeps_total = metrics.registry.counter(
+    "auth_token_sweeps_total", "Expired access token sweeps by result.", ("result",)
+)
+auth_tokens_purged_total = metrics.registry.counter(
+    "auth_tokens_purged_total", "Expired access tokens deleted by the sweeper."
+)
+auth_token_sweep_last_purged = metrics.registry.gauge(
+    "auth_token_sweep_last_purged", "Expired access tokens deleted by the last sweep."
+)
+auth_token_sweep_last_duration_seconds = metrics.registry.gauge(
+    "auth_token_sweep_last_duration_seconds", "Duration of the last expired access token sweep."
+)
+db_pool_wait_seconds_recent = metrics.registry.gauge(
+    "db_pool_wait_seconds_recent", "Decaying peak of recent pool checkout waits used for load shedding."
+)
+task_stats_reconciles_total = metrics.registry.counter(
+    "task_stats_reconciles_total", "Task counter reconciliation runs by result.", ("result",)
+)
+task_stats_drift_fixed_total = metrics.registry.counter(
+    "task_stats_drift_fixed_total", "Teams whose task counters had drifted and were recomputed."
+)
+
+
+def _collect() -> None:
+    pool = pool_metrics.snapshot(engine)
+    for state in ("size", "checked_out", "overflow"):
+        db_pool_connections.set(pool[state], state)
+    db_pool_checkouts_total.set_total(pool["checkouts"])
+    db_pool_timeouts_total.set_total(pool["timeouts"])
+    db_pool_wait_seconds_total.set_total(pool["wait_seconds_total"])
+    db_pool_wait_seconds_recent.set(pool["wait_seconds_recent"])
+
+    cache = token_cache.stats()
+    auth_token_cache_requests_total.set_total(cache["hits"], "hit")
+    auth_token_cache_requests_total.set_total(cache["misses"], "miss")
+    auth_token_cache_entries.set(cache["size"])
+
+    sweeps = token_sweeper.stats()
+    auth_token_sweeps_total.set_total(sweeps["runs"], "ok")
+    auth_token_sweeps_total.set_total(sweeps["failures"], "error")
+    auth_tokens_purged_total.set_total(sweeps["purged_total"])
+    auth_token_sweep_last_purged.set(sweeps["last_purged"])
+    auth_token_sweep_last_duration_seconds.set(sweeps["last_duration"])
+
+    reconciles = task_stats_reconciler.stats()
+    task_stats_reconciles_total.set_total(reconciles["runs"], "ok")
+    task_stats_reconciles_total.set_total(reconciles["failures"], "error")
+    task_stats_drift_fixed_total.set_total(reconciles["fixed_total"])
+
+
+metrics.registry.add_collector(_collect)
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(metrics.collect(), media_type="text/plain; version=0.0.4; charset=utf-8")
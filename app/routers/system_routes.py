@@ -1,17 +1,12 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, status
 
-from app.models.team import TeamRole
-from app.utils.team_utils import ensure_worker_exists, is_superuser
 from app.core.dependencies import SessionDep, CurrentUser
+from app.services import system as svc_system
 
 sys_router = APIRouter(prefix="/system", tags=["system"])
 
 
 @sys_router.post("/workers/{user_id}:admin", status_code=status.HTTP_204_NO_CONTENT)
 async def grant_admin_worker(user_id: int, session: SessionDep, me: CurrentUser):
-    if not await is_superuser(me):
-        raise HTTPException(status_code=403, detail="Superuser only")
-    w = await ensure_worker_exists(session, user_id)
-    w.role_in_team = TeamRole.admin
-    await session.commit()
+    await svc_system.grant_global_admin(session, actor=me, target_user_id=user_id)
     return None
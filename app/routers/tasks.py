@@ -0,0 +1,105 @@
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, status
+
+from app.core.dependencies import SessionDep, CurrentUser
+from app.db.query_stats import query_budget
+from app.models.task import TaskStatus
+from app.schemas.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, KeysetPage
+from app.schemas.tasks import (
+    CommentIn, CommentRead, TaskBulkResult, TaskBulkUpdate, TaskRead, TeamTaskStatsRead,
+)
+from app.services import task_stats as svc_task_stats
+from app.services import tasks as svc_tasks
+
+
+tasks_router = APIRouter(prefix="/teams", tags=["tasks"])
+
+
+@tasks_router.get(
+    "/{team_id}/tasks",
+    response_model=KeysetPage[TaskRead],
+    dependencies=[Depends(query_budget(6))],
+)
+async def list_tasks(
+    team_id: int,
+    session: SessionDep,
+    user: CurrentUser,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)] = DEFAULT_PAGE_LIMIT,
+    cursor: Annotated[str | None, Query(max_length=512)] = None,
+    status: Annotated[list[TaskStatus] | None, Query()] = None,
+    assignee_id: int | None = None,
+    deadline_from: datetime | None = None,
+    deadline_to: datetime | None = None,
+):
+    return await svc_tasks.list_team_tasks(
+        session,
+        actor=user,
+        team_id=team_id,
+        limit=limit,
+        cursor=cursor,
+        statuses=status,
+        assignee_id=assignee_id,
+        deadline_from=deadline_from,
+        deadline_to=deadline_to,
+    )
+
+
+@tasks_router.patch(
+    "/{team_id}/tasks:bulk",
+    response_model=TaskBulkResult,
+    dependencies=[Depends(query_budget(6))],
+)
+async def bulk_update_tasks(team_id: int, body: TaskBulkUpdate, session: SessionDep, user: CurrentUser):
+    return await svc_tasks.bulk_update_tasks(session, actor=user, team_id=team_id, body=body)
+
+
+@tasks_router.get(
+    "/{team_id}/stats",
+    response_model=TeamTaskStatsRead,
+    dependencies=[Depends(query_budget(4))],
+)
+async def get_task_stats(team_id: int, session: SessionDep, user: CurrentUser):
+    # одна строка team_task_stats вместо COUNT(*) GROUP BY status по всем задачам команды
+    return await svc_task_stats.get_team_stats(session, actor=user, team_id=team_id)
+
+
+@tasks_router.get(
+    "/{team_id}/tasks/{task_id}/comments",
+    response_model=KeysetPage[CommentRead],
+    dependencies=[Depends(query_budget(5))],
+)
+async def list_comments(
+    team_id: int,
+    task_id: int,
+    session: SessionDep,
+    user: CurrentUser,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)] = DEFAULT_PAGE_LIMIT,
+    cursor: Annotated[str | None, Query(max_length=512)] = None,
+):
+    return await svc_tasks.list_comments(
+        session, actor=user, team_id=team_id, task_id=task_id, limit=limit, cursor=cursor
+    )
+
+
+@tasks_router.post(
+    "/{team_id}/tasks/{task_id}/comments",
+    response_model=CommentRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(6))],
+)
+async def add_comment(team_id: int, task_id: int, body: CommentIn, session: SessionDep, user: CurrentUser):
+    return await svc_tasks.add_comment(session, actor=user, team_id=team_id, task_id=task_id, body=body.body)
+
+
+@tasks_router.delete(
+    "/{team_id}/tasks/{task_id}/comments/{comment_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(query_budget(6))],
+)
+async def delete_comment(team_id: int, task_id: int, comment_id: int, session: SessionDep, user: CurrentUser):
+    await svc_tasks.delete_comment(
+        session, actor=user, team_id=team_id, task_id=task_id, comment_id=comment_id
+    )
+    return None
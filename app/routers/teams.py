@@ -1,39 +1,83 @@
-from typing import List
+from typing import Annotated
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.core.dependencies import SessionDep, CurrentUser
-from app.schemas.teams import TeamCreate, TeamUpdate, TeamRead
+from app.db.query_stats import query_budget
+from app.schemas.pagination import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, Page
+from app.schemas.teams import TeamCreate, TeamUpdate, TeamRead, team_page
+from app.services import export as svc_export
 from app.services import teams as svc_teams
+from app.utils import etag
 
 
 teams_router = APIRouter(prefix="/teams", tags=["teams"])
 
 
-@teams_router.post("/", response_model=TeamRead, status_code=status.HTTP_201_CREATED)
+@teams_router.post(
+    "/",
+    response_model=TeamRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(5))],
+)
 async def create_team(payload: TeamCreate, session: SessionDep, user: CurrentUser):
     team = await svc_teams.create_team(session, actor=user, name=payload.name, code=payload.code)
     return team
 
 
-@teams_router.get("/", response_model=List[TeamRead])
-async def list_teams(session: SessionDep, user: CurrentUser):
-    return await svc_teams.list_teams_for_user(session, actor=user)
+@teams_router.get("/", response_model=Page[TeamRead], dependencies=[Depends(query_budget(4))])
+async def list_teams(
+    session: SessionDep,
+    user: CurrentUser,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)] = DEFAULT_PAGE_LIMIT,
+    cursor: int | None = None,
+    name: Annotated[str | None, Query(max_length=200)] = None,
+    code: Annotated[str | None, Query(max_length=64)] = None,
+):
+    rows = await svc_teams.list_teams_for_user(
+        session, actor=user, limit=limit, after=cursor, name=name, code=code, columns=team_page.columns
+    )
+    return team_page.response(rows, limit)
+
 
+@teams_router.get("/export", dependencies=[Depends(query_budget(4))])
+async def export_teams(
+    session: SessionDep, user: CurrentUser, format: svc_export.ExportFormat = "ndjson"
+):
+    stmt = await svc_teams.export_query_for_user(session, actor=user)
+    return StreamingResponse(
+        svc_export.stream_rows(session, stmt, format),
+        media_type=svc_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="teams.{format}"'},
+    )
 
-@teams_router.get("/{team_id}", response_model=TeamRead)
-async def get_team(team_id: int, session: SessionDep, user: CurrentUser):
-    return await svc_teams.get_team_for_user(session, actor=user, team_id=team_id)
+
+@teams_router.get("/{team_id}", response_model=TeamRead, dependencies=[Depends(query_budget(4))])
+async def get_team(team_id: int, request: Request, response: Response, session: SessionDep, user: CurrentUser):
+    if etag.has_condition(request):
+        version = await svc_teams.get_team_version_for_user(session, actor=user, team_id=team_id)
+        if version is not None:
+            current = etag.team_etag("team", team_id, version)
+            if etag.matches(request, current):
+                return etag.not_modified(current)
+    team = await svc_teams.get_team_for_user(session, actor=user, team_id=team_id)
+    etag.set_headers(response, etag.team_etag("team", team.id, team.version))
+    return team
 
 
-@teams_router.patch("/{team_id}", response_model=TeamRead)
+@teams_router.patch("/{team_id}", response_model=TeamRead, dependencies=[Depends(query_budget(4))])
 async def update_team(team_id: int, payload: TeamUpdate, session: SessionDep, user: CurrentUser):
     return await svc_teams.update_team(
         session, actor=user, team_id=team_id, name=payload.name, code=payload.code
     )
 
 
-@teams_router.delete("/{team_id}", status_code=status.HTTP_204_NO_CONTENT)
+@teams_router.delete(
+    "/{team_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(query_budget(5))],
+)
 async def delete_team(team_id: int, session: SessionDep, user: CurrentUser):
     await svc_teams.delete_team(session, actor=user, team_id=team_id)
     return None
@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from app.models.meeting import MAX_MEETING_DURATION
+
+
+def to_utc(value: datetime | None) -> datetime | None:
+    # sqlite хранит время как текст без зоны — приводим всё к UTC, иначе сравнения врут
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def check_interval(starts_at: datetime, ends_at: datetime) -> None:
+    if ends_at <= starts_at:
+        raise ValueError("ends_at must be after starts_at")
+    if ends_at - starts_at > MAX_MEETING_DURATION:
+        raise ValueError(f"Meeting cannot be longer than {MAX_MEETING_DURATION}")
+
+
+class MeetingIn(BaseModel):
+    title: str = Field(min_length=1, max_length=255)
+    notes: Optional[str] = None
+    starts_at: datetime
+    ends_at: datetime
+
+    _normalize = field_validator("starts_at", "ends_at")(to_utc)
+
+    @model_validator(mode="after")
+    def _check(self) -> "MeetingIn":
+        check_interval(self.starts_at, self.ends_at)
+        return self
+
+
+class MeetingUpdate(BaseModel):
+    title: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    notes: Optional[str] = None
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
+
+    _normalize = field_validator("starts_at", "ends_at")(to_utc)
+
+
+class MeetingRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    team_id: int
+    title: str
+    notes: Optional[str] = None
+    starts_at: datetime
+    ends_at: datetime
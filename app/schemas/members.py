@@ -1,6 +1,9 @@
-from pydantic import BaseModel, ConfigDict
+from typing import Annotated
 
-from app.models.team import TeamRole
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.team import TeamRole, Worker
+from app.schemas.pagination import PageSerializer
 
 
 class MemberIn(BaseModel):
@@ -19,3 +22,22 @@ class MemberRead(BaseModel):
     user_id: int
     team_id: int
     role_in_team: TeamRole
+
+
+member_page = PageSerializer(MemberRead, Worker)
+
+
+MAX_BULK_MEMBERS = 5000
+
+MemberBulkIn = Annotated[list[MemberIn], Field(min_length=1, max_length=MAX_BULK_MEMBERS)]
+
+
+class MemberBulkError(BaseModel):
+    index: int
+    user_id: int
+    detail: str
+
+
+class MemberBulkResult(BaseModel):
+    applied: int
+    errors: list[MemberBulkError]
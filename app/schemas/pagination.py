@@ -0,0 +1,82 @@
+import base64
+import json
+from typing import Any, Callable, Generic, Sequence, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Row
+
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    # id последней строки страницы; передаётся обратно как ?cursor=, None — страниц больше нет
+    next_cursor: int | None = None
+
+
+def build_page(rows: Sequence, limit: int) -> dict:
+    # crud выбирает limit + 1 строк: лишняя строка означает, что есть следующая страница
+    items = list(rows[:limit])
+    next_cursor = items[-1].id if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+class KeysetPage(BaseModel, Generic[T]):
+    items: list[T]
+    # непрозрачный курсор по составному ключу сортировки; передаётся обратно как ?cursor=
+    next_cursor: str | None = None
+
+
+def encode_cursor(key: Sequence) -> str:
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    # ValueError на любой мусор: сервис отвечает 400, а не 500
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(key, list):
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def build_keyset_page(rows: Sequence, limit: int, key: Callable[[Any], Sequence]) -> dict:
+    items = list(rows[:limit])
+    next_cursor = encode_cursor(key(items[-1])) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+class PageSerializer:
+    """Быстрый путь для страниц: Row-кортежи из select(колонок схемы) сразу в JSON.
+
+    Обычный путь FastAPI валидирует ORM-объекты через from_attributes и только потом
+    сериализует; здесь строки уже имеют нужные типы, поэтому валидация пропускается.
+    TypeAdapter собирается один раз и проверяет ответ, если включён FAST_JSON_VALIDATE.
+    """
+
+    def __init__(self, schema: type[BaseModel], entity: Any) -> None:
+        self.fields = tuple(schema.model_fields)
+        # порядок колонок совпадает с порядком полей схемы — на нём держится from_rows
+        self.columns = [getattr(entity, name) for name in self.fields]
+        self.adapter = TypeAdapter(Page[schema])
+
+    def from_rows(self, rows: Sequence[Row], limit: int) -> dict:
+        fields = self.fields
+        page = build_page(rows, limit)
+        page["items"] = [dict(zip(fields, row)) for row in page["items"]]
+        if settings.FAST_JSON_VALIDATE:
+            self.adapter.validate_python(page)
+        return page
+
+    def response(self, rows: Sequence[Row], limit: int) -> FastJSONResponse:
+        return FastJSONResponse(self.from_rows(rows, limit))
@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.crud.tasks import BULK_UPDATE_MAX_ROWS
+from app.models.task import TaskStatus
+
+
+class TaskUser(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    email: str
+
+
+class TaskRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    team_id: int
+    title: str
+    description: Optional[str] = None
+    status: TaskStatus
+    deadline: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+    author: TaskUser
+    assignee: Optional[TaskUser] = None
+    comment_count: int = 0
+
+
+class TaskBulkFilter(BaseModel):
+    status: Optional[list[TaskStatus]] = None
+    assignee_id: Optional[int] = None
+    deadline_from: Optional[datetime] = None
+    deadline_to: Optional[datetime] = None
+    # пустой фильтр выбрал бы всю команду — такое надо попросить явно
+    all: bool = False
+
+    @model_validator(mode="after")
+    def _check(self) -> "TaskBulkFilter":
+        criteria = (self.status, self.assignee_id, self.deadline_from, self.deadline_to)
+        if self.all == any(value is not None for value in criteria):
+            raise ValueError('Set at least one filter field, or pass "all": true alone to select every task')
+        return self
+
+
+class TaskBulkUpdate(BaseModel):
+    # какие задачи: явный список id или фильтр
+    ids: Optional[list[int]] = Field(default=None, min_length=1, max_length=BULK_UPDATE_MAX_ROWS)
+    filter: Optional[TaskBulkFilter] = None
+    # что поменять; assignee_id: null — снять исполнителя
+    status: Optional[TaskStatus] = None
+    assignee_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def _check(self) -> "TaskBulkUpdate":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Pass exactly one of ids or filter")
+        if not self.values():
+            raise ValueError("Nothing to update: pass status and/or assignee_id")
+        if "status" in self.model_fields_set and self.status is None:
+            raise ValueError("status cannot be null")
+        return self
+
+    def values(self) -> dict:
+        return {name: getattr(self, name) for name in ("status", "assignee_id") if name in self.model_fields_set}
+
+
+class TaskBulkResult(BaseModel):
+    updated: int
+    ids: list[int]
+    # упёрлись в потолок строк на запрос — повторите тот же запрос для следующей пачки
+    has_more: bool
+
+
+class TeamTaskStatsRead(BaseModel):
+    team_id: int
+    open: int
+    in_progress: int
+    done: int
+    total: int
+
+
+class CommentIn(BaseModel):
+    body: str = Field(min_length=1, max_length=10_000)
+
+
+class CommentRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    task_id: int
+    author_id: int
+    body: str
+    created_at: datetime
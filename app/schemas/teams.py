@@ -1,6 +1,9 @@
 from typing import Optional
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.models.team import Team
+from app.schemas.pagination import PageSerializer
+
 
 class TeamCreate(BaseModel):
     name: str = Field(min_length=1, max_length=200)
@@ -19,3 +22,6 @@ class TeamRead(BaseModel):
     name: str
     code: str
     owner_id: Optional[int] = None
+
+
+team_page = PageSerializer(TeamRead, Team)
@@ -0,0 +1,224 @@
+# Продакшен-запуск: python -m app.server
+#
+# Мастер импортирует приложение один раз, открывает сокет и форкает воркеров: импорт FastAPI,
+# SQLAlchemy-моделей и роутеров не повторяется в каждом процессе, а память до первой записи
+# делится copy-on-write. Каждый воркер — обычный uvicorn.Server на общем сокете (uvloop + httptools).
+# Упавший воркер перезапускается с экспоненциальной задержкой, а при частых падениях мастер
+# останавливается с ненулевым кодом; SIGTERM/SIGINT останавливают всех с грейсфул-таймаутом.
+import contextlib
+import glob
+import logging
+import math
+import os
+import signal
+import sys
+import tempfile
+import time
+from collections import deque
+from importlib.util import find_spec
+
+import uvicorn
+
+from app.core import metrics
+from app.core.config import settings
+
+log = logging.getLogger("app.server")
+
+
+def cpu_quota() -> float | None:
+    # cgroup v2: "max 100000" или "<quota> <period>"
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as fh:
+            quota, period = fh.read().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    # cgroup v1
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as fh:
+            quota = int(fh.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as fh:
+            period = int(fh.read())
+        return None if quota <= 0 else quota / period
+    except (OSError, ValueError):
+        return None
+
+
+def worker_count() -> int:
+    if settings.SERVER_WORKERS:
+        return settings.SERVER_WORKERS
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def build_config(app) -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        host=settings.HOST,
+        port=settings.PORT,
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        lifespan="on",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT,
+        limit_concurrency=settings.SERVER_LIMIT_CONCURRENCY,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+        access_log=settings.SERVER_ACCESS_LOG,
+    )
+
+
+class Supervisor:
+    def __init__(self, config: uvicorn.Config, workers: int) -> None:
+        self.config = config
+        self.workers = workers
+        self.children: dict[int, int] = {}  # pid -> номер слота
+        self.crashes: dict[int, deque[float]] = {}  # слот -> моменты недавних падений
+        self.pending: dict[int, float] = {}  # слот -> когда перезапускать
+        self.stopping = False
+        self.failed = False
+
+    def spawn(self, slot: int, sock) -> None:
+        pid = os.fork()
+        if pid == 0:
+            # воркер: сигналы мастера сбрасываем, uvicorn.Server поставит свои
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 1
+            try:
+                server = uvicorn.Server(self.config)
+                server.run(sockets=[sock])
+                # при ошибке lifespan-старта uvicorn просто возвращается, не подняв сервер
+                code = 0 if server.started else 3
+            finally:
+                os._exit(code)
+        self.children[pid] = slot
+        log.info("Started worker %d (pid %d)", slot, pid)
+
+    def reap(self, pid: int) -> int | None:
+        if settings.METRICS_MULTIPROC_DIR:
+            # упавший или убитый воркер не успевает убрать свой снапшот метрик
+            metrics.remove_snapshot(pid)
+        return self.children.pop(pid, None)
+
+    def on_exit(self, slot: int, pid: int, status: int) -> None:
+        # waitpid отдаёт сырой статус: код выхода или минус номер сигнала
+        code = os.waitstatus_to_exitcode(status)
+        now = time.monotonic()
+        crashes = self.crashes.setdefault(slot, deque())
+        crashes.append(now)
+        while now - crashes[0] > settings.SERVER_CRASH_WINDOW_SECONDS:
+            crashes.popleft()
+        if len(crashes) >= settings.SERVER_CRASH_LIMIT:
+            log.error(
+                "Worker %d (pid %d) exited with code %d, %d crashes in %.0fs, giving up",
+                slot, pid, code, len(crashes), settings.SERVER_CRASH_WINDOW_SECONDS,
+            )
+            self.failed = True
+            self.stopping = True
+            return
+        delay = min(
+            settings.SERVER_RESTART_BACKOFF_INITIAL * 2 ** (len(crashes) - 1), settings.SERVER_RESTART_BACKOFF_MAX
+        )
+        log.warning("Worker %d (pid %d) exited with code %d, restarting in %.1fs", slot, pid, code, delay)
+        self.pending[slot] = now + delay
+
+    def respawn_due(self, sock) -> None:
+        now = time.monotonic()
+        for slot, at in list(self.pending.items()):
+            if at <= now:
+                del self.pending[slot]
+                self.spawn(slot, sock)
+
+    def _stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def run(self) -> int:
+        sock = self.config.bind_socket()
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for slot in range(self.workers):
+            self.spawn(slot, sock)
+
+        while not self.stopping:
+            self.respawn_due(sock)
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                # все воркеры упали и ждут перезапуска — ждём вместе с ними
+                pid = 0
+                if not self.pending:
+                    break
+            if pid == 0:
+                time.sleep(0.5)
+                continue
+            slot = self.reap(pid)
+            if slot is not None and not self.stopping:
+                self.on_exit(slot, pid, status)
+
+        self.shutdown()
+        sock.close()
+        if self.failed:
+            log.error("Workers keep crashing, supervisor exits with status 1")
+            return 1
+        log.info("Supervisor stopped")
+        return 0
+
+    def shutdown(self) -> None:
+        for pid in self.children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+        # uvicorn сам ждёт активные запросы timeout_graceful_shutdown секунд, сверху — запас на lifespan
+        deadline = time.monotonic() + (self.config.timeout_graceful_shutdown or 30) + 10
+        while self.children and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.1)
+            else:
+                self.reap(pid)
+        for pid in self.children:
+            log.warning("Worker pid %d did not stop in time, killing", pid)
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGKILL)
+            if settings.METRICS_MULTIPROC_DIR:
+                metrics.remove_snapshot(pid)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    workers = worker_count()
+    if workers > 1 and not settings.METRICS_MULTIPROC_DIR:
+        # без общего каталога /metrics показывал бы счётчики одного случайного воркера
+        settings.METRICS_MULTIPROC_DIR = os.path.join(tempfile.gettempdir(), "business-metrics")
+    if settings.METRICS_MULTIPROC_DIR:
+        os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+        for path in glob.glob(os.path.join(settings.METRICS_MULTIPROC_DIR, "metrics-*.json")):
+            os.remove(path)
+
+    # preload: всё тяжёлое импортируется в мастере до fork; соединения с БД, пул хэширования
+    # и event loop создаются лениво или в lifespan — уже в каждом воркере отдельно
+    from app.main import app
+
+    config = build_config(app)
+    config.load()
+    if workers == 1:
+        server = uvicorn.Server(config)
+        server.run()
+        # как и `uvicorn app:app`: несостоявшийся старт — ненулевой код выхода
+        sys.exit(0 if server.started else 3)
+    log.info("Starting %d workers on %s:%d", workers, config.host, config.port)
+    sys.exit(Supervisor(config, workers).run())
+
+
+if __name__ == "__main__":
+    main()
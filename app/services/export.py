@@ -0,0 +1,50 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Literal
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.team import Team, Worker
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# сколько строк забираем с server-side курсора и отдаём клиенту одним чанком
+EXPORT_BATCH_SIZE = 1000
+
+
+def teams_query(ids: list[int] | None = None) -> Select:
+    stmt = select(Team.id, Team.name, Team.code, Team.owner_id).order_by(Team.id)
+    if ids is not None:
+        stmt = stmt.where(Team.id.in_(ids))
+    return stmt
+
+
+def members_query(team_id: int) -> Select:
+    return (
+        select(Worker.id, Worker.user_id, Worker.team_id, Worker.role_in_team)
+        .where(Worker.team_id == team_id)
+        .order_by(Worker.id)
+    )
+
+
+def _encode(rows, fields: list[str], fmt: ExportFormat) -> str:
+    if fmt == "csv":
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        return buf.getvalue()
+    return "".join(json.dumps(dict(zip(fields, row)), default=str) + "\n" for row in rows)
+
+
+async def stream_rows(session: AsyncSession, stmt: Select, fmt: ExportFormat) -> AsyncIterator[str]:
+    # выбираем колонки, а не ORM-объекты: строки не попадают в identity map,
+    # и память не зависит от размера выгрузки
+    fields = [c.key for c in stmt.selected_columns]
+    if fmt == "csv":
+        yield _encode([fields], fields, fmt)
+    result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    async for batch in result.partitions():
+        yield _encode(batch, fields, fmt)
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import meetings as crud_meetings
+from app.models.meeting import Meeting
+from app.models.user import User
+from app.schemas.meetings import MeetingIn, MeetingUpdate, to_utc, check_interval
+from app.utils import team_utils
+
+# окно календаря ограничено: ответ без пагинации не должен расти с историей команды
+MAX_WINDOW = timedelta(days=92)
+
+
+async def _require_member(session: AsyncSession, actor: User, team_id: int) -> None:
+    await team_utils.get_team_or_404(session, actor.id, team_id)
+    if not await team_utils.is_superuser(actor):
+        await team_utils.require_member(session, actor.id, team_id)
+
+
+async def _require_admin(session: AsyncSession, actor: User, team_id: int) -> None:
+    await team_utils.get_team_or_404(session, actor.id, team_id)
+    await team_utils.require_superuser_or_team_admin(session, actor, team_id)
+
+
+async def _get_or_404(session: AsyncSession, team_id: int, meeting_id: int) -> Meeting:
+    meeting = await crud_meetings.get_in_team(session, team_id, meeting_id)
+    if meeting is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return meeting
+
+
+async def list_meetings(
+    session: AsyncSession, *, actor: User, team_id: int, starts_at: datetime, ends_at: datetime
+) -> list[Meeting]:
+    starts_at, ends_at = to_utc(starts_at), to_utc(ends_at)
+    if ends_at <= starts_at:
+        raise HTTPException(status_code=422, detail="'to' must be after 'from'")
+    if ends_at - starts_at > MAX_WINDOW:
+        raise HTTPException(status_code=422, detail=f"Window cannot be longer than {MAX_WINDOW.days} days")
+    await _require_member(session, actor, team_id)
+    return await crud_meetings.list_in_window(session, team_id, starts_at, ends_at)
+
+
+async def get_meeting(session: AsyncSession, *, actor: User, team_id: int, meeting_id: int) -> Meeting:
+    await _require_member(session, actor, team_id)
+    return await _get_or_404(session, team_id, meeting_id)
+
+
+async def create_meeting(session: AsyncSession, *, actor: User, team_id: int, body: MeetingIn) -> Meeting:
+    await _require_admin(session, actor, team_id)
+    meeting = await crud_meetings.create(session, team_id=team_id, values=body.model_dump())
+    await session.commit()
+    return meeting
+
+
+async def update_meeting(
+    session: AsyncSession, *, actor: User, team_id: int, meeting_id: int, body: MeetingUpdate
+) -> Meeting:
+    await _require_admin(session, actor, team_id)
+    meeting = await _get_or_404(session, team_id, meeting_id)
+    values = body.model_dump(exclude_unset=True)
+    for field in ("title", "starts_at", "ends_at"):
+        if field in values and values[field] is None:
+            raise HTTPException(status_code=422, detail=f"{field} cannot be null")
+    try:
+        check_interval(
+            values.get("starts_at") or to_utc(meeting.starts_at), values.get("ends_at") or to_utc(meeting.ends_at)
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if values:
+        meeting = await crud_meetings.update_fields(session, meeting, values)
+        await session.commit()
+    return meeting
+
+
+async def delete_meeting(session: AsyncSession, *, actor: User, team_id: int, meeting_id: int) -> None:
+    await _require_admin(session, actor, team_id)
+    meeting = await _get_or_404(session, team_id, meeting_id)
+    await crud_meetings.delete(session, meeting)
+    await session.commit()
@@ -1,8 +1,8 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud import workers as crud_workers
 from app.crud import teams as crud_teams
+from app.crud import workers as crud_workers
 from app.utils import team_utils
 from app.models.team import TeamRole
 from app.models.user import User
@@ -11,7 +11,7 @@ from app.models.user import User
 async def add_member(
     session: AsyncSession, *, actor: User, team_id: int, user_id: int, role: TeamRole
 ):
-    await crud_teams.get_or_404(session, team_id)
+    await team_utils.get_team_or_404(session, actor.id, team_id)
     await team_utils.require_superuser_or_team_admin(session, actor, team_id)
 
     m = await crud_workers.ensure_exists(session, user_id)
@@ -19,38 +19,74 @@ async def add_member(
     if m.team_id is not None and m.team_id != team_id:
         raise HTTPException(status_code=409, detail="User already belongs to another team")
 
-    m.team_id = team_id
-    m.role_in_team = role
-
+    m = await crud_workers.update_membership(session, m, team_id=team_id, role=role)
+    await crud_teams.bump_version(session, team_id)
     await session.commit()
-    await session.refresh(m)
     return m
 
 
 async def change_member_role(
     session: AsyncSession, *, actor: User, team_id: int, user_id: int, role: TeamRole
 ):
-    await crud_teams.get_or_404(session, team_id)
+    await team_utils.get_team_or_404(session, actor.id, team_id)
     await team_utils.require_superuser_or_team_admin(session, actor, team_id)
 
-    m = await crud_workers.get_by_user_id(session, user_id)
-    if not m or m.team_id != team_id:
+    m = await crud_workers.set_role_in_team(session, user_id=user_id, team_id=team_id, role=role)
+    if m is None:
         raise HTTPException(status_code=404, detail="Member not in this team")
-
-    m.role_in_team = role
+    await crud_teams.bump_version(session, team_id)
     await session.commit()
-    await session.refresh(m)
     return m
 
 
 async def remove_member(session: AsyncSession, *, actor: User, team_id: int, user_id: int) -> None:
-    await crud_teams.get_or_404(session, team_id)
+    await team_utils.get_team_or_404(session, actor.id, team_id)
+    await team_utils.require_superuser_or_team_admin(session, actor, team_id)
+
+    # если пользователя нет в команде, DELETE просто ничего не удалит
+    await crud_workers.delete_from_team(session, user_id=user_id, team_id=team_id)
+    await crud_teams.bump_version(session, team_id)
+    await session.commit()
+
+
+async def bulk_add_members(
+    session: AsyncSession, *, actor: User, team_id: int, members: list[tuple[int, TeamRole]]
+) -> dict:
+    await team_utils.get_team_or_404(session, actor.id, team_id)
     await team_utils.require_superuser_or_team_admin(session, actor, team_id)
 
-    m = await crud_workers.get_by_user_id(session, user_id)
-    if not m or m.team_id != team_id:
-        return
+    errors = []
+    requested: dict[int, tuple[int, TeamRole]] = {}
+    for index, (user_id, role) in enumerate(members):
+        if user_id in requested:
+            errors.append({"index": index, "user_id": user_id, "detail": "Duplicate user_id in request"})
+            continue
+        requested[user_id] = (index, role)
 
-    await crud_workers.delete_by_user_id(session, user_id)
+    existing = await crud_workers.get_team_ids_by_user(session, list(requested))
+    upsert: list[tuple[int, TeamRole]] = []
+    attach: dict[TeamRole, list[int]] = {}
+    for user_id, (index, role) in requested.items():
+        if user_id not in existing:
+            errors.append({"index": index, "user_id": user_id, "detail": "User not found"})
+            continue
+        team_ids = existing[user_id]
+        if not team_ids or team_id in team_ids:
+            upsert.append((user_id, role))
+        elif team_ids == {None}:
+            # worker без команды занимаем, только если это единственная строка пользователя:
+            # при членстве в другой команде перенос дал бы вторую команду
+            attach.setdefault(role, []).append(user_id)
+        else:
+            # один worker -> одна команда, как и в add_member
+            errors.append({"index": index, "user_id": user_id, "detail": "User already belongs to another team"})
 
+    await crud_workers.upsert_memberships(session, team_id, upsert)
+    for role, user_ids in attach.items():
+        await crud_workers.attach_to_team(session, team_id, user_ids, role)
+    if upsert or attach:
+        await crud_teams.bump_version(session, team_id)
     await session.commit()
+
+    errors.sort(key=lambda e: e["index"])
+    return {"applied": len(upsert) + sum(len(ids) for ids in attach.values()), "errors": errors}
@@ -3,6 +3,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.models.team import TeamRole
+from app.crud import teams as crud_teams
 from app.crud import workers as crud_workers
 from app.utils.team_utils import is_superuser
 
@@ -12,5 +13,8 @@ async def grant_global_admin(session: AsyncSession, *, actor: User, target_user_
         raise HTTPException(status_code=403, detail="Superuser only")
     w = await crud_workers.ensure_exists(session, target_user_id)
     w.role_in_team = TeamRole.admin     # глобальный админ (team_id может быть None)
+    if w.team_id is not None:
+        # роль видна в списке участников команды — сбрасываем её ETag
+        await crud_teams.bump_version(session, w.team_id)
     # commit — здесь, т.к. это отдельная операция
     await session.commit()
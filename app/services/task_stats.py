@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.crud import task_stats as crud_task_stats
+from app.models.task_stats import STATUSES
+from app.models.team import Team
+from app.models.user import User
+from app.utils import team_utils
+
+log = logging.getLogger(__name__)
+
+
+async def get_team_stats(session: AsyncSession, *, actor: User, team_id: int) -> dict:
+    await team_utils.get_team_or_404(session, actor.id, team_id)
+    if not await team_utils.is_superuser(actor):
+        await team_utils.require_member(session, actor.id, team_id)
+    row = await crud_task_stats.get(session, team_id)
+    counts = {s: getattr(row, s) if row else 0 for s in STATUSES}
+    return {"team_id": team_id, **counts, "total": sum(counts.values())}
+
+
+# Счётчики ведут триггеры, но их можно обойти (ручной SQL, загрузка с session_replication_role = replica).
+# Сверка пересчитывает команды пачками по id, каждая пачка — короткая транзакция.
+class TaskStatsReconciler:
+    def __init__(self) -> None:
+        self.runs = 0
+        self.failures = 0
+        self.fixed_total = 0
+        self.last_fixed = 0
+        self.last_duration = 0.0
+
+    async def reconcile(self, engine: AsyncEngine, *, batch_size: int, pause_seconds: float = 0.0) -> int:
+        started = time.perf_counter()
+        fixed = 0
+        after = 0
+        while True:
+            async with engine.begin() as conn:
+                team_ids = list(
+                    (await conn.scalars(select(Team.id).where(Team.id > after).order_by(Team.id).limit(batch_size))).all()
+                )
+                if not team_ids:
+                    break
+                stored = await crud_task_stats.lock_stored(conn, team_ids)
+                actual = await crud_task_stats.count_actual(conn, team_ids)
+                zeros = (0,) * len(STATUSES)
+                drift = {
+                    team_id: actual.get(team_id, zeros)
+                    for team_id in team_ids
+                    if stored.get(team_id, zeros) != actual.get(team_id, zeros)
+                }
+                if drift:
+                    log.warning("Task stats drift in teams %s, recomputed", sorted(drift)[:20])
+                    await crud_task_stats.overwrite(conn, drift)
+            fixed += len(drift)
+            after = team_ids[-1]
+            if len(team_ids) < batch_size:
+                break
+            await asyncio.sleep(pause_seconds)
+
+        self.runs += 1
+        self.fixed_total += fixed
+        self.last_fixed = fixed
+        self.last_duration = time.perf_counter() - started
+        return fixed
+
+    async def run_forever(self, engine: AsyncEngine) -> None:
+        while True:
+            await asyncio.sleep(settings.TASK_STATS_RECONCILE_INTERVAL_SECONDS)
+            try:
+                await self.reconcile(engine, batch_size=settings.TASK_STATS_RECONCILE_BATCH_SIZE, pause_seconds=0.05)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failures += 1
+                log.exception("Task stats reconciliation failed")
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "fixed_total": self.fixed_total,
+            "last_fixed": self.last_fixed,
+            "last_duration": self.last_duration,
+        }
+
+
+task_stats_reconciler = TaskStatsReconciler()
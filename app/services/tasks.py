@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Sequence
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import comments as crud_comments
+from app.crud import tasks as crud_tasks
+from app.crud import workers as crud_workers
+from app.models.task import Task, TaskComment, TaskStatus
+from app.models.user import User
+from app.schemas.pagination import build_keyset_page, decode_cursor
+from app.schemas.tasks import TaskBulkUpdate
+from app.utils import team_utils
+
+
+async def list_team_tasks(
+    session: AsyncSession,
+    *,
+    actor: User,
+    team_id: int,
+    limit: int,
+    cursor: str | None = None,
+    statuses: Sequence[TaskStatus] | None = None,
+    assignee_id: int | None = None,
+    deadline_from: datetime | None = None,
+    deadline_to: datetime | None = None,
+) -> dict:
+    await team_utils.get_team_or_404(session, actor.id, team_id)
+    if not await team_utils.is_superuser(actor):
+        await team_utils.require_member(session, actor.id, team_id)
+
+    after = None
+    if cursor is not None:
+        try:
+            after = crud_tasks.parse_cursor(decode_cursor(cursor))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = await crud_tasks.list_by_team_page(
+        session,
+        team_id,
+        limit=limit,
+        after=after,
+        statuses=statuses,
+        assignee_id=assignee_id,
+        deadline_from=deadline_from,
+        deadline_to=deadline_to,
+    )
+    return build_keyset_page(rows, limit, crud_tasks.cursor_key)
+
+
+async def bulk_update_tasks(session: AsyncSession, *, actor: User, team_id: int, body: TaskBulkUpdate) -> dict:
+    # права проверяются один раз на весь набор, а не на каждую задачу
+    await team_utils.get_team_or_404(session, actor.id, team_id)
+    await team_utils.require_superuser_or_team_admin(session, actor, team_id)
+
+    values = body.values()
+    if values.get("assignee_id") is not None:
+        if await crud_workers.get_by_user_and_team(session, values["assignee_id"], team_id) is None:
+            raise HTTPException(status_code=422, detail="Assignee is not a member of this team")
+
+    flt = body.filter
+    limit = crud_tasks.BULK_UPDATE_MAX_ROWS
+    ids = await crud_tasks.bulk_update(
+        session,
+        team_id,
+        values,
+        ids=body.ids,
+        statuses=flt.status if flt else None,
+        assignee_id=flt.assignee_id if flt else None,
+        deadline_from=flt.deadline_from if flt else None,
+        deadline_to=flt.deadline_to if flt else None,
+        limit=limit,
+    )
+    await session.commit()
+    return {"updated": len(ids), "ids": ids, "has_more": len(ids) == limit}
+
+
+async def _get_task_for_member(session: AsyncSession, actor: User, team_id: int, task_id: int) -> Task:
+    await team_utils.get_team_or_404(session, actor.id, team_id)
+    if not await team_utils.is_superuser(actor):
+        await team_utils.require_member(session, actor.id, team_id)
+    task = await crud_tasks.get_in_team(session, team_id, task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+async def list_comments(
+    session: AsyncSession, *, actor: User, team_id: int, task_id: int, limit: int, cursor: str | None = None
+) -> dict:
+    await _get_task_for_member(session, actor, team_id, task_id)
+    after = None
+    if cursor is not None:
+        try:
+            after = crud_comments.parse_cursor(decode_cursor(cursor))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    rows = await crud_comments.list_by_task_page(session, task_id, limit=limit, after=after)
+    return build_keyset_page(rows, limit, crud_comments.cursor_key)
+
+
+async def add_comment(session: AsyncSession, *, actor: User, team_id: int, task_id: int, body: str) -> TaskComment:
+    await _get_task_for_member(session, actor, team_id, task_id)
+    comment = await crud_comments.create(session, task_id=task_id, author_id=actor.id, body=body)
+    await session.commit()
+    return comment
+
+
+async def delete_comment(session: AsyncSession, *, actor: User, team_id: int, task_id: int, comment_id: int) -> None:
+    await _get_task_for_member(session, actor, team_id, task_id)
+    comment = await crud_comments.get(session, task_id, comment_id)
+    if comment is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    # свой комментарий удаляет автор, чужой — админ команды
+    if comment.author_id != actor.id:
+        await team_utils.require_superuser_or_team_admin(session, actor, team_id)
+    await crud_comments.delete(session, comment)
+    await session.commit()
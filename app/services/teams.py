@@ -1,3 +1,6 @@
+from typing import Sequence
+
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
@@ -5,6 +8,7 @@ from app.models.user import User
 from app.models.team import Team, TeamRole
 from app.crud import teams as crud_teams
 from app.crud import workers as crud_workers
+from app.services import export as svc_export
 from app.utils import team_utils
 
 
@@ -17,21 +21,19 @@ async def create_team(session: AsyncSession, *, actor: User, name: str, code: st
     # привязываем актёра к команде, если он был глобальным админом без команды
     await crud_workers.create_membership(session, user_id=actor.id, team_id=team.id, role=TeamRole.admin)
     await session.commit()
-    await session.refresh(team)
     return team
 
 
 async def update_team(session: AsyncSession, *, actor: User, team_id: int, name: str | None, code: str | None) -> Team:
-    team = await crud_teams.get_or_404(session, team_id)
+    team = await team_utils.get_team_or_404(session, actor.id, team_id)
     await team_utils.require_superuser_or_team_admin(session, actor, team_id)
     team = await crud_teams.update(session, team, name=name, code=code)
     await session.commit()
-    await session.refresh(team)
     return team
 
 
 async def delete_team(session: AsyncSession, *, actor: User, team_id: int) -> None:
-    team = await crud_teams.get_or_404(session, team_id)
+    team = await team_utils.get_team_or_404(session, actor.id, team_id)
     await team_utils.require_superuser_or_team_admin(session, actor, team_id)
 
     await crud_workers.delete_by_team(session, team_id)
@@ -40,18 +42,47 @@ async def delete_team(session: AsyncSession, *, actor: User, team_id: int) -> No
     await session.commit()
 
 
-async def list_teams_for_user(session: AsyncSession, *, actor: User) -> list[Team]:
+async def list_teams_for_user(
+    session: AsyncSession,
+    *,
+    actor: User,
+    limit: int,
+    after: int | None = None,
+    name: str | None = None,
+    code: str | None = None,
+    columns: Sequence | None = None,
+) -> list:
+    ids = None
+    if not await team_utils.is_superuser(actor):
+        w = await team_utils.get_actor_worker(session, actor.id)
+        if not w or w.team_id is None:
+            return []
+        ids = [w.team_id]
+    return await crud_teams.list_page(
+        session, limit=limit, after=after, name=name, code=code, ids=ids, columns=columns
+    )
+
+
+async def export_query_for_user(session: AsyncSession, *, actor: User) -> Select:
     if await team_utils.is_superuser(actor):
-        return await crud_teams.list_all(session)
-    w = await crud_workers.get_by_user_id(session, actor.id)
-    if not w or w.team_id is None:
-        return []
-    team = await crud_teams.get(session, w.team_id)
-    return [team] if team else []
+        return svc_export.teams_query()
+    w = await team_utils.get_actor_worker(session, actor.id)
+    return svc_export.teams_query([w.team_id] if w and w.team_id is not None else [])
+
+
+async def get_team_version_for_user(session: AsyncSession, *, actor: User, team_id: int) -> int | None:
+    # None — команды нет или актёру она не видна: пусть ответ соберёт обычный путь с 404/403
+    found = await crud_teams.get_version_for_user(session, team_id, actor.id)
+    if found is None:
+        return None
+    version, is_member = found
+    if not is_member and not await team_utils.is_superuser(actor):
+        return None
+    return version
 
 
 async def get_team_for_user(session: AsyncSession, *, actor: User, team_id: int) -> Team:
-    team = await crud_teams.get_or_404(session, team_id)
+    team = await team_utils.get_team_or_404(session, actor.id, team_id)
     if not await team_utils.is_superuser(actor):
         await team_utils.require_member(session, actor.id, team_id)
     return team
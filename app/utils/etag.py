@@ -0,0 +1,37 @@
+from fastapi import Request, Response
+
+
+# Слабые ETag на основе team.version: версия растёт при любом изменении команды или её состава,
+# поэтому сравнивать тела ответов не нужно. Ответы персональные (нужна авторизация) — кэшировать
+# может только клиент, и перед использованием он обязан перепроверить ETag.
+CACHE_CONTROL = "private, no-cache"
+
+
+def team_etag(kind: str, team_id: int, version: int) -> str:
+    return f'W/"{kind}-{team_id}-v{version}"'
+
+
+def has_condition(request: Request) -> bool:
+    return "if-none-match" in request.headers
+
+
+def matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # для If-None-Match сравнение слабое: префикс W/ не учитываем (RFC 9110, 13.1.2)
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def set_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_headers(response, etag)
+    return response
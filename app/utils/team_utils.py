@@ -1,37 +1,82 @@
+from dataclasses import dataclass
+
 from fastapi import HTTPException
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud import workers
-from app.models.team import Worker, TeamRole
+from app.models.team import Team, Worker, TeamRole
 from app.models.user import User
 
 
+@dataclass
+class TeamAccess:
+    team: Team | None
+    worker: Worker | None
+
+    # свойства считаются на лету: worker — объект из identity map сессии,
+    # поэтому изменения role_in_team/team_id в сервисах видны сразу
+    @property
+    def is_member(self) -> bool:
+        return self.team is not None and self.worker is not None and self.worker.team_id == self.team.id
+
+    @property
+    def is_admin(self) -> bool:
+        return self.is_member and self.worker.role_in_team == TeamRole.admin
+
+
+def _access_cache(session: AsyncSession) -> dict:
+    return session.info.setdefault(workers.ACCESS_CACHE_KEY, {})
+
+
+async def get_team_access(session: AsyncSession, user_id: int, team_id: int) -> TeamAccess:
+    cache = _access_cache(session)
+    key = (user_id, team_id)
+    if key not in cache:
+        team, worker = await workers.get_team_with_actor(session, team_id, user_id)
+        cache[key] = TeamAccess(team=team, worker=worker)
+    return cache[key]
+
+
+async def get_actor_worker(session: AsyncSession, user_id: int) -> Worker | None:
+    cache = _access_cache(session)
+    key = (user_id, None)
+    if key not in cache:
+        # worker актёра уже мог прийти вместе с командой
+        known = next(
+            (a for (uid, tid), a in cache.items() if uid == user_id and a.team is not None),
+            None,
+        )
+        worker = known.worker if known else await workers.get_by_user_id(session, user_id)
+        cache[key] = TeamAccess(team=None, worker=worker)
+    return cache[key].worker
+
+
+async def get_team_or_404(session: AsyncSession, user_id: int, team_id: int) -> Team:
+    access = await get_team_access(session, user_id, team_id)
+    if access.team is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return access.team
+
+
 async def is_superuser(user: User) -> bool:
     return getattr(user, "is_superuser", False) is True
 
 
 async def ensure_worker_exists(session: AsyncSession, user_id: int) -> Worker:
-    worker = await workers.get_by_user_id(session, user_id)
-    if worker is None:
-        worker = Worker(user_id=user_id, team_id=None, role_in_team=TeamRole.employee)
-        session.add(worker)
-        await session.flush()
-    return worker
+    return await workers.ensure_exists(session, user_id)
 
 
 async def is_team_admin(session: AsyncSession, user_id: int, team_id: int) -> bool:
-    worker = await workers.get_by_user_and_team(session, user_id, team_id)
-    if not worker:
-        return False
-    return worker.team_id == team_id and worker.role_in_team == TeamRole.admin
+    access = await get_team_access(session, user_id, team_id)
+    return access.is_admin
 
 
 async def require_member(session: AsyncSession, user_id: int, team_id: int) -> Worker:
-    w = await workers.get_by_user_and_team(session, user_id, team_id)
-    if not w or w.team_id != team_id:
+    access = await get_team_access(session, user_id, team_id)
+    if not access.is_member:
         raise HTTPException(status_code=403, detail="You are not a member of this team")
-    return w
+    return access.worker
 
 
 async def require_superuser_or_team_admin(
@@ -47,5 +92,5 @@ async def require_superuser_or_team_admin(
 async def can_create_team(session: AsyncSession, user: User) -> bool:
     if await is_superuser(user):
         return True
-    w = await workers.get_by_user_id(session, user.id)
+    w = await get_actor_worker(session, user.id)
     return bool(w and w.role_in_team == TeamRole.admin)  # глобальный admin (team_id может быть None)
@@ -0,0 +1,89 @@
+# Пиковый RSS при выгрузке команд: потоковый экспорт против материализации списка.
+#
+#   python -m benchmarks.export_rss --rows 1000000
+#   python -m benchmarks.export_rss --rows 1000000 --mode list
+#
+# Каждый режим запускайте отдельным процессом: ru_maxrss монотонен в пределах процесса.
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт килобайты, macOS — байты
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def _seed(engine, rows: int) -> None:
+    from sqlalchemy import func, insert, select
+
+    from app.models import Base
+    from app.models.team import Team
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        existing = (await conn.execute(select(func.count()).select_from(Team))).scalar_one()
+        batch = 50_000
+        for start in range(existing, rows, batch):
+            values = [
+                {"name": f"Team {i}", "code": f"T{i:09d}", "owner_id": None}
+                for i in range(start, min(start + batch, rows))
+            ]
+            await conn.execute(insert(Team), values)
+
+
+async def _run(rows: int, mode: str, fmt: str) -> dict:
+    from app.db.session import AsyncSessionLocal, engine
+    from app.services import export as svc_export
+
+    await _seed(engine, rows)
+    baseline = _peak_rss_mb()
+    started = time.perf_counter()
+    size = 0
+    async with AsyncSessionLocal() as session:
+        stmt = svc_export.teams_query()
+        if mode == "stream":
+            async for chunk in svc_export.stream_rows(session, stmt, fmt):
+                size += len(chunk)
+        else:
+            from app.schemas.teams import TeamRead
+            from app.models.team import Team
+            from sqlalchemy import select
+
+            teams = (await session.execute(select(Team))).scalars().all()
+            body = json.dumps([TeamRead.model_validate(t).model_dump() for t in teams])
+            size = len(body)
+    await engine.dispose()
+    return {
+        "rows": rows,
+        "mode": mode,
+        "format": fmt,
+        "bytes": size,
+        "seconds": round(time.perf_counter() - started, 2),
+        "rss_before_mb": round(baseline, 1),
+        "rss_peak_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--mode", choices=["stream", "list"], default="stream")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url or (
+        "sqlite+aiosqlite:///" + os.path.join(tempfile.gettempdir(), "business_bench_export.db")
+    )
+    print(json.dumps(asyncio.run(_run(args.rows, args.mode, args.format))))
+
+
+if __name__ == "__main__":
+    main()
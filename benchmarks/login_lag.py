@@ -0,0 +1,153 @@
+# Задержка event loop при шторме логинов: argon2 на loop против пула хэширования.
+#
+#   python -m benchmarks.login_lag                              # оба режима, sqlite
+#   python -m benchmarks.login_lag --logins 400 --concurrency 64 --workers 8 --modes pool
+#
+# Пока идут логины, отдельная задача спит по --interval мс и меряет, насколько позже
+# просыпается: это и есть задержка, которую видят все остальные запросы воркера.
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.load import git_commit, percentile
+
+PASSWORD = "bench-password"
+MODES = ("inline", "pool")
+
+
+async def seed(engine, users: int) -> None:
+    from fastapi_users.password import PasswordHelper
+    from sqlalchemy import insert
+
+    from app.models import Base, User
+
+    hashed = PasswordHelper().hash(PASSWORD)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(User),
+            [
+                {"email": f"user{i}@bench.local", "hashed_password": hashed, "is_active": True,
+                 "is_superuser": False, "is_verified": True}
+                for i in range(1, users + 1)
+            ],
+        )
+
+
+async def probe_lag(interval: float, samples: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - started - interval))
+
+
+async def run_mode(client, mode: str, args) -> dict:
+    from app.auth import manager
+    from app.auth.passwords import PooledPasswordHelper
+    from app.core.config import settings
+
+    helper = PooledPasswordHelper(
+        workers=0 if mode == "inline" else args.workers,
+        executor=args.executor,
+        time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+        memory_cost=settings.PASSWORD_ARGON2_MEMORY_COST,
+        parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+    )
+    manager.password_helper = helper
+    lag: list[float] = []
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    stop = asyncio.Event()
+    counter = iter(range(args.logins))
+
+    async def worker() -> None:
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                resp = await client.post(
+                    "/auth/jwt/login",
+                    data={"username": f"user{1 + i % args.users}@bench.local", "password": PASSWORD},
+                )
+                status = str(resp.status_code)
+            except Exception as exc:
+                # на sqlite заблокированный хэшированием loop держит запись открытой, и соседние
+                # логины падают с «database is locked» — это тоже результат, а не повод прервать прогон
+                status = type(exc).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    prober = asyncio.create_task(probe_lag(args.interval / 1000, lag, stop))
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await prober
+        helper.shutdown()
+
+    lag_ms = [v * 1000 for v in lag]
+    ms = [v * 1000 for v in latencies]
+    return {
+        "mode": mode,
+        "workers": 0 if mode == "inline" else args.workers,
+        "logins": args.logins,
+        "concurrency": args.concurrency,
+        "rps": round(args.logins / elapsed, 1) if elapsed else 0.0,
+        "login_p50_ms": round(percentile(ms, 50), 2),
+        "login_p99_ms": round(percentile(ms, 99), 2),
+        "loop_lag_p50_ms": round(percentile(lag_ms, 50), 2),
+        "loop_lag_p99_ms": round(percentile(lag_ms, 99), 2),
+        "loop_lag_max_ms": round(max(lag_ms, default=0.0), 2),
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+async def main_async(args) -> dict:
+    import httpx
+
+    from app.db.session import engine
+    from app.main import app
+
+    await seed(engine, args.users)
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for mode in args.modes:
+            results.append(await run_mode(client, mode, args))
+    await engine.dispose()
+    return {"commit": git_commit(), "database": engine.url.get_backend_name(), "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4, help="размер пула хэширования в режиме pool")
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread")
+    parser.add_argument("--interval", type=float, default=10, help="период пробы event loop, мс")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--output", default=None, help="куда записать JSON (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url or (
+        "sqlite+aiosqlite:///" + os.path.join(tempfile.gettempdir(), "business_bench_login.db")
+    )
+    report = asyncio.run(main_async(args))
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as fh:
+            fh.write(payload + "\n")
+    print(payload, file=sys.stdout if not args.output else sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
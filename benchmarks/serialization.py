@@ -0,0 +1,130 @@
+# Стоимость сериализации страницы команд и участников: обычный путь FastAPI против PageSerializer.
+#
+#   python -m benchmarks.serialization
+#   python -m benchmarks.serialization --rows 50000 --repeat 20
+#
+# Время — миллисекунды на 10k строк. Данные читаются из sqlite в памяти один раз:
+# меряется только сериализация, без БД и ASGI.
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.load import git_commit
+
+
+def measure(fn, repeat: int, rows: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    per_call = (time.perf_counter() - started) / repeat
+    return round(per_call * 1000 * 10_000 / rows, 2)
+
+
+def load(rows: int):
+    from sqlalchemy import create_engine, insert, select
+    from sqlalchemy.orm import Session
+
+    from app.models import Base, Team, User, Worker
+    from app.models.team import TeamRole
+    from app.schemas.members import member_page
+    from app.schemas.teams import team_page
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [{"email": f"u{i}@bench.local", "hashed_password": "x"} for i in range(1, rows + 1)],
+        )
+        conn.execute(insert(Team), [{"name": "Bench", "code": "BENCH", "owner_id": 1}])
+        conn.execute(
+            insert(Team),
+            [{"name": f"Team {i}", "code": f"T{i:08d}", "owner_id": 1} for i in range(2, rows + 1)],
+        )
+        conn.execute(
+            insert(Worker),
+            [{"user_id": i, "team_id": 1, "role_in_team": TeamRole.employee} for i in range(1, rows + 1)],
+        )
+    session = Session(engine)
+    return {
+        "teams": (
+            list(session.scalars(select(Team).order_by(Team.id))),
+            session.execute(select(*team_page.columns).order_by(Team.id)).all(),
+            team_page,
+        ),
+        "members": (
+            list(session.scalars(select(Worker).order_by(Worker.id))),
+            session.execute(select(*member_page.columns).order_by(Worker.id)).all(),
+            member_page,
+        ),
+    }
+
+
+def run(rows: int, repeat: int) -> list[dict]:
+    from fastapi.encoders import jsonable_encoder
+
+    from app.core.config import settings
+    from app.core.responses import FastJSONResponse
+    from app.schemas.pagination import build_page
+
+    results = []
+    for name, (objects, tuples, serializer) in load(rows).items():
+        adapter = serializer.adapter
+        limit = len(objects)
+
+        def fastapi_legacy():
+            # старый путь FastAPI: валидация ORM + jsonable_encoder + json.dumps
+            page = adapter.validate_python(build_page(objects, limit), from_attributes=True)
+            return json.dumps(jsonable_encoder(page)).encode()
+
+        def fastapi_dump_json():
+            # текущий путь FastAPI с response_model: валидация ORM + pydantic dump_json
+            return adapter.dump_json(adapter.validate_python(build_page(objects, limit), from_attributes=True))
+
+        def fast_rows():
+            return FastJSONResponse(serializer.from_rows(tuples, limit)).body
+
+        def fast_rows_validated():
+            settings.FAST_JSON_VALIDATE = True
+            try:
+                return FastJSONResponse(serializer.from_rows(tuples, limit)).body
+            finally:
+                settings.FAST_JSON_VALIDATE = False
+
+        assert json.loads(fast_rows()) == json.loads(fastapi_dump_json())
+        for path, fn in (
+            ("fastapi_legacy", fastapi_legacy),
+            ("fastapi_dump_json", fastapi_dump_json),
+            ("page_serializer", fast_rows),
+            ("page_serializer_validated", fast_rows_validated),
+        ):
+            results.append({"payload": name, "path": path, "ms_per_10k_rows": measure(fn, repeat, rows)})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", default=None, help="куда записать JSON (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    from app.core import responses
+
+    report = {
+        "commit": git_commit(),
+        "rows": args.rows,
+        "orjson": responses.orjson is not None,
+        "results": run(args.rows, args.repeat),
+    }
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(payload + "\n")
+    print(payload, file=sys.stdout if not args.output else sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+# фикстура db делает drop_all — поэтому DATABASE_URL из окружения (dev-база, контейнер) не берём
+# никогда: только отдельный TEST_DATABASE_URL или временный sqlite-файл
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or (
+    "sqlite+aiosqlite:///" + os.path.join(tempfile.gettempdir(), "business_test.db")
+)
+os.environ.setdefault("SQL_QUERY_BUDGET_STRICT", "true")
+os.environ.setdefault("FAST_JSON_VALIDATE", "true")
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.auth.token_cache import token_cache
+from app.db.session import engine
+from app.main import app
+from app.models import Base
+
+
+@pytest_asyncio.fixture
+async def db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    token_cache.clear()
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def client(db):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        yield ac
+
+
+async def register_and_login(client: AsyncClient, email: str, password: str = "password1") -> dict:
+    await client.post("/auth/register", json={"email": email, "password": password})
+    resp = await client.post("/auth/jwt/login", data={"username": email, "password": password})
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: list[str] = []
+
+    def _on_execute(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def __len__(self) -> int:
+        return len(self.statements)
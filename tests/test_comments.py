@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import insert, select
+
+from app.auth.actions.create_superuser import create_superuser
+from app.models import Task, TaskComment
+from tests.conftest import StatementCounter, register_and_login
+
+
+async def _setup(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    member = await register_and_login(client, "member@example.com")
+    await client.post("/teams/", json={"name": "Alpha", "code": "ALP"}, headers=root)
+    await client.post("/members/1/members", json={"user_id": 2}, headers=root)
+    async with db.begin() as conn:
+        await conn.execute(insert(Task), [{"team_id": 1, "author_id": 1, "title": "Busy"}])
+    return root, member
+
+
+@pytest.mark.asyncio
+async def test_comments_keyset_pages_and_counts(client, db):
+    root, member = await _setup(client, db)
+    url = "/teams/1/tasks/1/comments"
+    for i in range(7):
+        resp = await client.post(url, json={"body": f"Comment {i}"}, headers=member if i % 2 else root)
+        assert resp.status_code == 201, resp.text
+
+    # комментарии одной секунды и даже микросекунды различает id — второй ключ курсора
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3} | ({"cursor": cursor} if cursor else {})
+        page = (await client.get(url, params=params, headers=member)).json()
+        seen += [c["body"] for c in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"Comment {i}" for i in range(7)]
+
+    task = (await client.get("/teams/1/tasks", headers=member)).json()["items"][0]
+    assert task["comment_count"] == 7
+
+
+@pytest.mark.asyncio
+async def test_comment_create_and_delete_keep_count_in_one_transaction(client, db):
+    root, member = await _setup(client, db)
+    url = "/teams/1/tasks/1/comments"
+    await client.get("/users/me", headers=member)
+
+    with StatementCounter(db) as counter:
+        created = (await client.post(url, json={"body": "Mine"}, headers=member)).json()
+    writes = [s.split()[0].upper() for s in counter.statements if s.split()[0].upper() in ("INSERT", "UPDATE")]
+    assert writes == ["INSERT", "UPDATE"]
+    other = (await client.post(url, json={"body": "Root's"}, headers=root)).json()
+
+    # чужой комментарий рядовой участник удалить не может, админ команды — может
+    assert (await client.delete(f"{url}/{other['id']}", headers=member)).status_code == 403
+    assert (await client.delete(f"{url}/{created['id']}", headers=member)).status_code == 204
+    assert (await client.delete(f"{url}/{created['id']}", headers=member)).status_code == 404
+    assert (await client.delete(f"{url}/{other['id']}", headers=root)).status_code == 204
+
+    async with db.connect() as conn:
+        assert await conn.scalar(select(Task.comment_count).where(Task.id == 1)) == 0
+        assert await conn.scalar(select(TaskComment.id)) is None
+
+
+@pytest.mark.asyncio
+async def test_comments_access(client, db):
+    root, member = await _setup(client, db)
+    outsider = await register_and_login(client, "outsider@example.com")
+
+    assert (await client.get("/teams/1/tasks/1/comments", headers=outsider)).status_code == 403
+    assert (await client.post("/teams/1/tasks/1/comments", json={"body": "x"}, headers=outsider)).status_code == 403
+    assert (await client.get("/teams/1/tasks/99/comments", headers=member)).status_code == 404
+    assert (await client.post("/teams/1/tasks/1/comments", json={"body": ""}, headers=member)).status_code == 422
+    resp = await client.get("/teams/1/tasks/1/comments", params={"cursor": "bad"}, headers=member)
+    assert resp.status_code == 400
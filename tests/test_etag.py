@@ -0,0 +1,56 @@
+import pytest
+
+from app.auth.actions.create_superuser import create_superuser
+from tests.conftest import StatementCounter, register_and_login
+
+
+@pytest.mark.asyncio
+async def test_team_and_member_reads_revalidate_by_version(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    member = await register_and_login(client, "member@example.com")
+    outsider = await register_and_login(client, "outsider@example.com")
+    await client.post("/teams/", json={"name": "Alpha", "code": "ALP"}, headers=root)
+    await client.post("/members/1/members", json={"user_id": 2}, headers=root)
+
+    team = await client.get("/teams/1", headers=member)
+    members = await client.get("/members/1/members", headers=member)
+    assert team.headers["etag"].startswith('W/"team-1-')
+    assert members.headers["etag"].startswith('W/"members-1-')
+
+    with StatementCounter(db) as counter:
+        resp = await client.get("/teams/1", headers={**member, "If-None-Match": team.headers["etag"]})
+    assert resp.status_code == 304 and resp.content == b""
+    assert len(counter) == 1, counter.statements
+    resp = await client.get("/members/1/members", headers={**member, "If-None-Match": members.headers["etag"]})
+    assert resp.status_code == 304
+
+    # чужой ETag не открывает доступ: обычный путь отвечает 403
+    resp = await client.get("/teams/1", headers={**outsider, "If-None-Match": team.headers["etag"]})
+    assert resp.status_code == 403
+
+    await client.patch("/members/1/members/2", json={"role": "manager"}, headers=root)
+    resp = await client.get("/members/1/members", headers={**member, "If-None-Match": members.headers["etag"]})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != members.headers["etag"]
+
+    await client.patch("/teams/1", json={"name": "Beta"}, headers=root)
+    resp = await client.get("/teams/1", headers={**member, "If-None-Match": team.headers["etag"]})
+    assert resp.status_code == 200 and resp.json()["name"] == "Beta"
+
+
+@pytest.mark.asyncio
+async def test_deleting_member_account_changes_member_list_etag(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    member = await register_and_login(client, "member@example.com")
+    await client.post("/teams/", json={"name": "Alpha", "code": "ALP"}, headers=root)
+    await client.post("/members/1/members", json={"user_id": 2}, headers=root)
+
+    members = await client.get("/members/1/members", headers=root)
+    assert len(members.json()["items"]) == 2
+    assert (await client.delete("/users/me", headers=member)).status_code in (200, 204)
+
+    resp = await client.get("/members/1/members", headers={**root, "If-None-Match": members.headers["etag"]})
+    assert resp.status_code == 200
+    assert [m["user_id"] for m in resp.json()["items"]] == [1]
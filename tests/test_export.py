@@ -0,0 +1,23 @@
+import json
+
+import pytest
+
+from app.auth.actions.create_superuser import create_superuser
+from tests.conftest import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_export_teams_and_members(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    for i in range(3):
+        await client.post("/teams/", json={"name": f"Team {i}", "code": f"T{i:03d}"}, headers=root)
+
+    resp = await client.get("/teams/export", headers=root)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["code"] for r in rows] == ["T000", "T001", "T002"]
+
+    resp = await client.get("/members/1/export", params={"format": "csv"}, headers=root)
+    assert resp.text.splitlines() == ["id,user_id,team_id,role_in_team", "1,1,1,admin"]
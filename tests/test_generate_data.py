@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.auth.actions.generate_data import Options, generate
+from app.db.session import AsyncSessionLocal
+from app.models import Task, TaskComment, Team, User, Worker
+from app.models.task import TaskStatus
+
+
+@pytest.mark.asyncio
+async def test_generate_loads_consistent_data_on_top_of_existing_rows(db):
+    options = Options(
+        users=300,
+        team_size=10,
+        unassigned_ratio=0.1,
+        tasks_per_member=2,
+        comments_per_task=2,
+        meetings_per_team=1,
+        evaluated_ratio=0.5,
+        seed=7,
+    )
+    first = await generate(db, options, chunk_size=100)
+    second = await generate(db, options, chunk_size=100)
+
+    assert first["user"] == second["user"] == 300
+    assert first["task"] > 0 and first["taskcomment"] > 0
+    async with AsyncSessionLocal() as session:
+        assert await session.scalar(select(func.count()).select_from(User)) == 600
+        assert await session.scalar(select(func.count()).select_from(Team)) == first["team"] * 2
+        assert await session.scalar(select(func.count()).select_from(Task)) == first["task"] * 2
+        # задачи и комментарии ссылаются только на участников своей команды
+        foreign_authors = await session.scalar(
+            select(func.count())
+            .select_from(TaskComment)
+            .join(Task, Task.id == TaskComment.task_id)
+            .outerjoin(
+                Worker, (Worker.user_id == TaskComment.author_id) & (Worker.team_id == Task.team_id)
+            )
+            .where(Worker.id.is_(None))
+        )
+        assert foreign_authors == 0
+        assert await session.scalar(select(func.sum(Task.comment_count))) == first["taskcomment"] + second["taskcomment"]
+        statuses = set(await session.scalars(select(Task.status).distinct()))
+    assert statuses <= set(TaskStatus)
@@ -0,0 +1,171 @@
+import pytest
+from sqlalchemy import select
+
+from app.auth.actions.create_superuser import create_superuser
+from app.models import Meeting
+from tests.conftest import StatementCounter, register_and_login
+
+
+async def _seed_team(client):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    member = await register_and_login(client, "member@example.com")
+    outsider = await register_and_login(client, "outsider@example.com")
+    await client.post("/teams/", json={"name": "Alpha", "code": "ALP"}, headers=root)
+    await client.post("/members/1/members", json={"user_id": 2}, headers=root)
+    return root, member, outsider
+
+
+def _meeting(title: str, starts_at: str, ends_at: str) -> dict:
+    return {"title": title, "starts_at": starts_at, "ends_at": ends_at}
+
+
+@pytest.mark.asyncio
+async def test_overlapping_meetings_are_rejected(client, db):
+    root, member, outsider = await _seed_team(client)
+
+    resp = await client.post(
+        "/teams/1/meetings", json=_meeting("Standup", "2026-03-02T10:00:00Z", "2026-03-02T11:00:00Z"), headers=root
+    )
+    assert resp.status_code == 201, resp.text
+    first = resp.json()
+
+    # полуоткрытые интервалы: стык в 11:00 пересечением не считается
+    resp = await client.post(
+        "/teams/1/meetings", json=_meeting("Review", "2026-03-02T11:00:00Z", "2026-03-02T12:00:00Z"), headers=root
+    )
+    assert resp.status_code == 201, resp.text
+    second = resp.json()
+
+    for starts_at, ends_at in (
+        ("2026-03-02T10:30:00Z", "2026-03-02T10:45:00Z"),
+        ("2026-03-02T09:00:00Z", "2026-03-02T13:00:00Z"),
+        # то же время в другой зоне
+        ("2026-03-02T13:30:00+03:00", "2026-03-02T14:30:00+03:00"),
+    ):
+        resp = await client.post("/teams/1/meetings", json=_meeting("Clash", starts_at, ends_at), headers=root)
+        assert resp.status_code == 409, (starts_at, resp.text)
+
+    # перенос встречи на занятое время тоже конфликт, и запись остаётся прежней
+    resp = await client.patch(
+        f"/teams/1/meetings/{second['id']}", json={"starts_at": "2026-03-02T10:30:00Z"}, headers=root
+    )
+    assert resp.status_code == 409, resp.text
+    resp = await client.get(f"/teams/1/meetings/{second['id']}", headers=member)
+    assert resp.json()["starts_at"].startswith("2026-03-02T11:00:00")
+
+    resp = await client.patch(
+        f"/teams/1/meetings/{second['id']}", json={"starts_at": "2026-03-02T11:15:00Z"}, headers=root
+    )
+    assert resp.status_code == 200, resp.text
+
+    # после удаления время освобождается
+    assert (await client.delete(f"/teams/1/meetings/{first['id']}", headers=root)).status_code == 204
+    resp = await client.post(
+        "/teams/1/meetings", json=_meeting("Retro", "2026-03-02T10:00:00Z", "2026-03-02T11:15:00Z"), headers=root
+    )
+    assert resp.status_code == 201, resp.text
+
+
+@pytest.mark.asyncio
+async def test_invalid_intervals(client, db):
+    root, member, outsider = await _seed_team(client)
+
+    for starts_at, ends_at in (
+        ("2026-03-02T10:00:00Z", "2026-03-02T10:00:00Z"),
+        ("2026-03-02T10:00:00Z", "2026-03-02T09:00:00Z"),
+        ("2026-03-02T10:00:00Z", "2026-03-04T10:00:00Z"),
+    ):
+        resp = await client.post("/teams/1/meetings", json=_meeting("Bad", starts_at, ends_at), headers=root)
+        assert resp.status_code == 422, (starts_at, ends_at)
+
+    resp = await client.post(
+        "/teams/1/meetings", json=_meeting("Ok", "2026-03-02T10:00:00Z", "2026-03-02T11:00:00Z"), headers=root
+    )
+    meeting_id = resp.json()["id"]
+    resp = await client.patch(
+        f"/teams/1/meetings/{meeting_id}", json={"ends_at": "2026-03-02T09:00:00Z"}, headers=root
+    )
+    assert resp.status_code == 422
+    resp = await client.patch(f"/teams/1/meetings/{meeting_id}", json={"title": None}, headers=root)
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_window_lists_overlapping_meetings(client, db):
+    root, member, outsider = await _seed_team(client)
+    for title, starts_at, ends_at in (
+        ("Night", "2026-03-01T22:00:00Z", "2026-03-02T02:00:00Z"),
+        ("Morning", "2026-03-02T09:00:00Z", "2026-03-02T10:00:00Z"),
+        ("Evening", "2026-03-02T23:00:00Z", "2026-03-03T01:00:00Z"),
+        ("Next day", "2026-03-03T09:00:00Z", "2026-03-03T10:00:00Z"),
+        ("Before", "2026-03-01T08:00:00Z", "2026-03-01T09:00:00Z"),
+    ):
+        resp = await client.post("/teams/1/meetings", json=_meeting(title, starts_at, ends_at), headers=root)
+        assert resp.status_code == 201, resp.text
+
+    await client.get("/users/me", headers=member)
+    with StatementCounter(db) as counter:
+        resp = await client.get(
+            "/teams/1/meetings",
+            params={"from": "2026-03-02T00:00:00Z", "to": "2026-03-03T00:00:00Z"},
+            headers=member,
+        )
+    assert resp.status_code == 200, resp.text
+    # встречи, начавшиеся до окна или закончившиеся после него, тоже попадают в выдачу
+    assert [m["title"] for m in resp.json()] == ["Night", "Morning", "Evening"]
+    assert len(counter) <= 4
+
+    # окно задаётся в любой зоне
+    resp = await client.get(
+        "/teams/1/meetings",
+        params={"from": "2026-03-02T12:00:00+03:00", "to": "2026-03-02T13:00:00+03:00"},
+        headers=member,
+    )
+    assert [m["title"] for m in resp.json()] == ["Morning"]
+
+    for params in (
+        {"from": "2026-03-02T00:00:00Z", "to": "2026-03-02T00:00:00Z"},
+        {"from": "2026-01-01T00:00:00Z", "to": "2026-06-01T00:00:00Z"},
+        {"from": "2026-03-02T00:00:00Z"},
+    ):
+        resp = await client.get("/teams/1/meetings", params=params, headers=member)
+        assert resp.status_code == 422, params
+
+
+@pytest.mark.asyncio
+async def test_meeting_permissions(client, db):
+    root, member, outsider = await _seed_team(client)
+    body = _meeting("Standup", "2026-03-02T10:00:00Z", "2026-03-02T11:00:00Z")
+    window = {"from": "2026-03-02T00:00:00Z", "to": "2026-03-03T00:00:00Z"}
+
+    assert (await client.post("/teams/1/meetings", json=body, headers=member)).status_code == 403
+    meeting_id = (await client.post("/teams/1/meetings", json=body, headers=root)).json()["id"]
+
+    assert (await client.get("/teams/1/meetings", params=window, headers=member)).status_code == 200
+    assert (await client.get("/teams/1/meetings", params=window, headers=outsider)).status_code == 403
+    assert (await client.get(f"/teams/1/meetings/{meeting_id}", headers=outsider)).status_code == 403
+    resp = await client.patch(f"/teams/1/meetings/{meeting_id}", json={"title": "Mine"}, headers=member)
+    assert resp.status_code == 403
+    assert (await client.delete(f"/teams/1/meetings/{meeting_id}", headers=member)).status_code == 403
+    assert (await client.get("/teams/1/meetings/999", headers=member)).status_code == 404
+
+    # админ команды может планировать встречи
+    await client.patch("/members/1/members/2", json={"role": "admin"}, headers=root)
+    resp = await client.post(
+        "/teams/1/meetings", json=_meeting("Planning", "2026-03-02T12:00:00Z", "2026-03-02T13:00:00Z"), headers=member
+    )
+    assert resp.status_code == 201, resp.text
+
+
+@pytest.mark.asyncio
+async def test_deleting_team_deletes_its_meetings(client, db):
+    root, member, outsider = await _seed_team(client)
+    await client.post("/teams/", json={"name": "Beta", "code": "BET"}, headers=root)
+    body = _meeting("Standup", "2026-03-02T10:00:00Z", "2026-03-02T11:00:00Z")
+    assert (await client.post("/teams/1/meetings", json=body, headers=root)).status_code == 201
+    assert (await client.post("/teams/2/meetings", json=body, headers=root)).status_code == 201
+
+    assert (await client.delete("/teams/1", headers=root)).status_code == 204
+    async with db.connect() as conn:
+        assert (await conn.execute(select(Meeting.team_id))).scalars().all() == [2]
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import insert, select
+
+from app.auth.actions.create_superuser import create_superuser
+from app.models import Worker
+from tests.conftest import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_bulk_add_members_reports_rows(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    for i in range(2, 7):
+        await register_and_login(client, f"user{i}@example.com")
+    await client.post("/teams/", json={"name": "Alpha", "code": "ALP"}, headers=root)
+    await client.post("/teams/", json={"name": "Beta", "code": "BET"}, headers=root)
+    await client.post("/members/2/members", json={"user_id": 5}, headers=root)
+    await client.post("/system/workers/6:admin", headers=root)
+
+    body = [
+        {"user_id": 2, "role": "manager"},
+        {"user_id": 3},
+        {"user_id": 3},
+        {"user_id": 5},
+        {"user_id": 6},
+        {"user_id": 999},
+        {"user_id": 1, "role": "manager"},
+    ]
+    resp = await client.post("/members/1/members:bulk", json=body, headers=root)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["applied"] == 4
+    assert [(e["index"], e["detail"]) for e in data["errors"]] == [
+        (2, "Duplicate user_id in request"),
+        (3, "User already belongs to another team"),
+        (5, "User not found"),
+    ]
+
+    resp = await client.get("/members/1/members", headers=root)
+    roles = {m["user_id"]: m["role_in_team"] for m in resp.json()["items"]}
+    assert roles == {1: "manager", 2: "manager", 3: "employee", 6: "employee"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_add_does_not_consume_placeholder_of_member_of_another_team(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    await register_and_login(client, "user2@example.com")
+    await register_and_login(client, "user3@example.com")
+    await client.post("/teams/", json={"name": "Alpha", "code": "ALP"}, headers=root)
+    await client.post("/teams/", json={"name": "Beta", "code": "BET"}, headers=root)
+    await client.post("/members/2/members", json={"user_id": 2}, headers=root)
+    async with db.begin() as conn:
+        # у пользователя 2 кроме членства в Beta остался worker без команды; у 3 — только он
+        await conn.execute(insert(Worker).values(user_id=2, team_id=None))
+        await conn.execute(insert(Worker).values(user_id=3, team_id=None))
+
+    resp = await client.post("/members/1/members:bulk", json=[{"user_id": 2}, {"user_id": 3}], headers=root)
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "applied": 1,
+        "errors": [{"index": 0, "user_id": 2, "detail": "User already belongs to another team"}],
+    }
+    async with db.connect() as conn:
+        rows = (await conn.execute(select(Worker.user_id, Worker.team_id).order_by(Worker.user_id, Worker.id))).all()
+    assert [tuple(r) for r in rows if r[0] != 1] == [(2, 2), (2, None), (3, 1)]
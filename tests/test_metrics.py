@@ -0,0 +1,57 @@
+import json
+import os
+
+import pytest
+
+from app.core import metrics
+from tests.conftest import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_route_latency_and_cache(client):
+    headers = await register_and_login(client, "user@example.com")
+    await client.get("/teams/", headers=headers)
+    await client.get("/teams/", headers=headers)
+
+    resp = await client.get("/metrics")
+    assert resp.status_code == 200
+    body = resp.text
+    assert 'http_requests_total{method="GET",route="/teams/",status="200"}' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/teams/",le="+Inf"}' in body
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert 'auth_token_cache_requests_total{result="hit"}' in body
+    assert 'db_pool_connections{state="checked_out"}' in body
+
+
+def test_multiprocess_snapshots_are_summed(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics.settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    registry = metrics.Registry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    requests.inc("/a")
+    latency.observe(0.05)
+    latency.observe(3)
+    merged = metrics.merge([registry.snapshot(), registry.snapshot()])
+    text = metrics.render(merged)
+    assert 'requests_total{route="/a"} 2' in text
+    assert 'latency_seconds_bucket{le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_count 4" in text
+
+    metrics.write_snapshot()
+    assert len(list(tmp_path.glob("metrics-*.json"))) == 1
+    assert "# TYPE http_requests_in_flight gauge" in metrics.collect()
+
+
+def test_snapshots_of_dead_workers_are_dropped(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics.settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    registry = metrics.Registry()
+    registry.gauge("http_requests_in_flight", "Requests currently being served.").inc()
+    # pid, которого заведомо нет: воркер упал и не убрал за собой файл
+    dead = tmp_path / "metrics-999999999.json"
+    dead.write_text(json.dumps(registry.snapshot()))
+
+    text = metrics.collect()
+    assert "http_requests_in_flight 1" not in text
+    assert not dead.exists()
+    assert [p.name for p in tmp_path.glob("metrics-*.json")] == [f"metrics-{os.getpid()}.json"]
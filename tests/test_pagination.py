@@ -0,0 +1,32 @@
+import pytest
+
+from app.auth.actions.create_superuser import create_superuser
+from tests.conftest import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_teams_keyset_pagination_and_prefix_filters(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    for i in range(5):
+        await client.post("/teams/", json={"name": f"Team {i}", "code": f"T{i:03d}"}, headers=root)
+    await client.post("/teams/", json={"name": "Other", "code": "OTHER"}, headers=root)
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        resp = await client.get("/teams/", params=params, headers=root)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert len(page["items"]) <= 2
+        seen += [t["id"] for t in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == sorted(seen) and len(seen) == 6
+
+    resp = await client.get("/teams/", params={"name": "Team", "code": "T00"}, headers=root)
+    assert [t["code"] for t in resp.json()["items"]] == [f"T{i:03d}" for i in range(5)]
+
+    resp = await client.get("/members/1/members", params={"limit": 1}, headers=root)
+    assert resp.json()["next_cursor"] is None and len(resp.json()["items"]) == 1
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.auth.passwords import PooledPasswordHelper
+from tests.conftest import register_and_login
+
+
+def _helper(time_cost: int, workers: int = 2) -> PooledPasswordHelper:
+    return PooledPasswordHelper(workers=workers, time_cost=time_cost, memory_cost=8192, parallelism=1)
+
+
+@pytest.mark.asyncio
+async def test_pool_hashes_off_loop_and_rehashes_on_parameter_change():
+    old, new = _helper(time_cost=1), _helper(time_cost=2)
+    try:
+        hashes = await asyncio.gather(*(old.hash_async("secret") for _ in range(4)))
+        assert len(set(hashes)) == 4
+
+        assert await old.verify_and_update_async("secret", hashes[0]) == (True, None)
+        assert (await new.verify_and_update_async("wrong", hashes[0]))[0] is False
+        verified, updated = await new.verify_and_update_async("secret", hashes[0])
+        assert verified and updated is not None and "t=2" in updated
+        assert await new.verify_and_update_async("secret", updated) == (True, None)
+    finally:
+        old.shutdown()
+        new.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_thread_pools_keep_their_own_parameters():
+    # второй helper запускает свои потоки позже — на хэши первого это влиять не должно
+    strong, weak = _helper(time_cost=3), _helper(time_cost=1)
+    try:
+        assert "t=3" in await strong.hash_async("secret")
+        assert "t=1" in await weak.hash_async("secret")
+        assert "t=3" in await strong.hash_async("secret")
+        assert "t=1" in await weak.hash_async("secret")
+        verified, updated = await strong.verify_and_update_async("secret", await weak.hash_async("secret"))
+        assert verified and "t=3" in updated
+    finally:
+        strong.shutdown()
+        weak.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_inline_mode_matches_pool():
+    inline = _helper(time_cost=1, workers=0)
+    hashed = await inline.hash_async("secret")
+    assert inline._executor is None
+    assert await inline.verify_and_update_async("secret", hashed) == (True, None)
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_password_with_outdated_parameters(client, db, monkeypatch):
+    from app.auth import manager
+
+    await register_and_login(client, "user@example.com")
+    monkeypatch.setattr(manager, "password_helper", _helper(time_cost=1))
+    try:
+        resp = await client.post("/auth/jwt/login", data={"username": "user@example.com", "password": "password1"})
+        assert resp.status_code == 200
+        resp = await client.post("/auth/jwt/login", data={"username": "user@example.com", "password": "password1"})
+        assert resp.status_code == 200
+        async with db.connect() as conn:
+            hashed = (await conn.exec_driver_sql("SELECT hashed_password FROM user")).scalar_one()
+        assert "t=1" in hashed
+    finally:
+        manager.password_helper.shutdown()
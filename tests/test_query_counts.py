@@ -0,0 +1,27 @@
+import pytest
+
+from app.auth.actions.create_superuser import create_superuser
+from tests.conftest import StatementCounter, register_and_login
+
+
+@pytest.mark.asyncio
+async def test_mutating_endpoints_statement_budget(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    await register_and_login(client, "member@example.com")
+    # прогреваем кэш токенов, чтобы считать только запросы самого эндпоинта
+    await client.get("/users/me", headers=root)
+
+    cases = [
+        ("post", "/teams/", {"json": {"name": "Alpha", "code": "ALP"}}, 201, 2),
+        ("patch", "/teams/1", {"json": {"name": "Beta"}}, 200, 2),
+        ("post", "/members/1/members", {"json": {"user_id": 2}}, 201, 4),
+        ("patch", "/members/1/members/2", {"json": {"role": "manager"}}, 200, 3),
+        ("delete", "/members/1/members/2", {}, 204, 3),
+        ("delete", "/teams/1", {}, 204, 3),
+    ]
+    for method, url, kwargs, expected_status, budget in cases:
+        with StatementCounter(db) as counter:
+            resp = await getattr(client, method)(url, headers=root, **kwargs)
+        assert resp.status_code == expected_status, (method, url, resp.text)
+        assert len(counter) == budget, (method, url, counter.statements)
@@ -0,0 +1,41 @@
+import logging
+import re
+
+import pytest
+
+from app.core.config import settings
+from app.db.query_stats import QueryBudgetExceeded, QueryStats
+from tests.conftest import StatementCounter, register_and_login
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header(client, db):
+    headers = await register_and_login(client, "user@example.com")
+    with StatementCounter(db) as counter:
+        resp = await client.get("/teams/", headers=headers)
+    assert resp.status_code == 200
+    timing = resp.headers["server-timing"]
+    match = re.fullmatch(r'db;dur=([\d.]+);desc="(\d+) queries", total;dur=([\d.]+)', timing)
+    assert match, timing
+    db_ms, queries, total_ms = float(match[1]), int(match[2]), float(match[3])
+    # холодный кэш токенов: токен, пользователь и его членство в команде — минимум три запроса;
+    # заголовок считает ровно те же операторы, что видит движок
+    assert queries >= 3 and queries == len(counter), counter.statements
+    assert 0 < db_ms <= total_ms
+
+
+def test_repeated_statement_is_reported_once(caplog):
+    stats = QueryStats("GET", "/teams/")
+    with caplog.at_level(logging.WARNING, logger="app.db.query_stats"):
+        for _ in range(settings.SQL_N_PLUS_ONE_THRESHOLD * 3):
+            stats.record("SELECT * FROM workers WHERE id = ?")
+    assert len([r for r in caplog.records if "N+1" in r.getMessage()]) == 1
+
+
+def test_strict_budget_raises(monkeypatch):
+    monkeypatch.setattr(settings, "SQL_QUERY_BUDGET_STRICT", True)
+    stats = QueryStats("GET", "/teams/")
+    stats.budget = 1
+    stats.record("SELECT 1")
+    with pytest.raises(QueryBudgetExceeded):
+        stats.record("SELECT 2")
@@ -0,0 +1,82 @@
+from app import server
+from app.core.config import settings
+
+
+def _supervisor(monkeypatch, clock):
+    monkeypatch.setattr(server.time, "monotonic", lambda: clock[0])
+    sup = server.Supervisor(config=None, workers=2)
+    spawned = []
+    monkeypatch.setattr(sup, "spawn", lambda slot, sock: spawned.append(slot))
+    return sup, spawned
+
+
+def test_crashed_worker_restarts_with_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_RESTART_BACKOFF_INITIAL", 0.5)
+    monkeypatch.setattr(settings, "SERVER_RESTART_BACKOFF_MAX", 2.0)
+    monkeypatch.setattr(settings, "SERVER_CRASH_LIMIT", 10)
+    monkeypatch.setattr(settings, "SERVER_CRASH_WINDOW_SECONDS", 60.0)
+    clock = [100.0]
+    sup, spawned = _supervisor(monkeypatch, clock)
+
+    delays = []
+    for i in range(4):
+        sup.on_exit(0, 1234, 256)
+        delays.append(sup.pending[0] - clock[0])
+        sup.respawn_due(None)
+        assert len(spawned) == i  # задержка ещё не прошла
+        clock[0] = sup.pending[0]
+        sup.respawn_due(None)
+        assert len(spawned) == i + 1 and 0 not in sup.pending
+    assert delays == [0.5, 1.0, 2.0, 2.0]
+
+    # падения за пределами окна забываются — задержка снова минимальная
+    clock[0] += 61
+    sup.on_exit(0, 1234, 256)
+    assert sup.pending[0] - clock[0] == 0.5
+    assert not sup.failed
+
+
+def test_crash_loop_stops_supervisor(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_CRASH_LIMIT", 3)
+    monkeypatch.setattr(settings, "SERVER_CRASH_WINDOW_SECONDS", 60.0)
+    clock = [100.0]
+    sup, spawned = _supervisor(monkeypatch, clock)
+
+    sup.on_exit(1, 1, 256)
+    sup.on_exit(0, 2, 256)  # другой слот — свой счётчик
+    sup.on_exit(1, 3, 256)
+    assert not sup.stopping
+    clock[0] += 5
+    sup.on_exit(1, 4, 256)
+    assert sup.failed and sup.stopping
+    assert len(sup.crashes[1]) == 3
+
+
+def test_crash_loop_exits_non_zero(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_RESTART_BACKOFF_INITIAL", 0.5)
+    monkeypatch.setattr(settings, "SERVER_CRASH_LIMIT", 2)
+    monkeypatch.setattr(settings, "SERVER_CRASH_WINDOW_SECONDS", 60.0)
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", None)
+    clock = [100.0]
+    monkeypatch.setattr(server.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(server.time, "sleep", lambda seconds: clock.__setitem__(0, clock[0] + seconds))
+    monkeypatch.setattr(server.signal, "signal", lambda *args: None)
+
+    class Sock:
+        def close(self):
+            pass
+
+    config = type("Config", (), {"bind_socket": lambda self: Sock(), "timeout_graceful_shutdown": 1})()
+    sup = server.Supervisor(config=config, workers=1)
+    pids = iter(range(1001, 2000))
+    monkeypatch.setattr(sup, "spawn", lambda slot, sock: sup.children.__setitem__(next(pids), slot))
+
+    def waitpid(pid, options):
+        if not sup.children:
+            raise ChildProcessError
+        # каждый воркер сразу падает с кодом 1
+        return next(iter(sup.children)), 1 << 8
+
+    monkeypatch.setattr(server.os, "waitpid", waitpid)
+    assert sup.run() == 1
+    assert sup.failed and not sup.children
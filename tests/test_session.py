@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import event
+
+from app.auth.actions.create_superuser import create_superuser
+from tests.conftest import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_single_connection_checkout_per_request(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    admin = await register_and_login(client, "root@example.com")
+    await register_and_login(client, "member@example.com")
+    resp = await client.post("/teams/", json={"name": "Alpha", "code": "ALP"}, headers=admin)
+    team_id = resp.json()["id"]
+
+    checkouts = []
+    listener = lambda *args: checkouts.append(1)
+    event.listen(db.sync_engine, "checkout", listener)
+    try:
+        resp = await client.post(f"/members/{team_id}/members", json={"user_id": 2}, headers=admin)
+    finally:
+        event.remove(db.sync_engine, "checkout", listener)
+
+    assert resp.status_code == 201
+    assert len(checkouts) == 1
@@ -0,0 +1,52 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# бюджет холодного импорта app.main; на CI-раннерах медленнее — переопределяется переменной
+IMPORT_BUDGET_SECONDS = float(os.environ.get("STARTUP_IMPORT_BUDGET_SECONDS", "2.5"))
+ARTIFACTS_DIR = Path(os.environ.get("TEST_ARTIFACTS_DIR", ROOT / "test-artifacts"))
+LAZY_MODULES = ("app.auth.actions.admin", "app.routers.system_routes", "jinja2")
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+print(json.dumps({"seconds": time.perf_counter() - started, "modules": sorted(sys.modules)}))
+"""
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def _import_profile(stderr: str) -> list[tuple[int, int, str]]:
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def test_cold_import_of_app_main_fits_budget_and_skips_lazy_routers():
+    runs = [json.loads(_run("-c", PROBE).stdout.strip().splitlines()[-1]) for _ in range(3)]
+    best = min(run["seconds"] for run in runs)
+
+    # профиль импорта сохраняем артефактом: при регрессии видно, какой модуль подорожал
+    rows = _import_profile(_run("-X", "importtime", "-c", "import app.main").stderr)
+    ARTIFACTS_DIR.mkdir(parents=True, exist_ok=True)
+    lines = [f"cold import app.main: best of 3 = {best * 1000:.0f} ms", "", "top by cumulative time:"]
+    lines += [f"{cum / 1000:9.1f} ms {own / 1000:9.1f} ms  {name}" for own, cum, name in sorted(rows, key=lambda r: -r[1])[:40]]
+    lines += ["", "top by self time:"]
+    lines += [f"{own / 1000:9.1f} ms  {name.strip()}" for own, _, name in sorted(rows, key=lambda r: -r[0])[:40]]
+    (ARTIFACTS_DIR / "startup-profile.txt").write_text("\n".join(lines) + "\n")
+
+    assert not set(LAZY_MODULES) & set(runs[0]["modules"])
+    assert best < IMPORT_BUDGET_SECONDS, f"app.main cold import took {best:.2f}s, budget {IMPORT_BUDGET_SECONDS}s"
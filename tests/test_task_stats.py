@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy import delete, func, insert, select, update
+
+from app.auth.actions.create_superuser import create_superuser
+from app.models import Task, TaskComment, TeamTaskStats
+from app.models.task import TaskStatus
+from app.services.task_stats import TaskStatsReconciler
+from tests.conftest import StatementCounter, register_and_login
+
+
+async def _setup(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    await client.post("/teams/", json={"name": "Alpha", "code": "ALP"}, headers=root)
+    await client.post("/teams/", json={"name": "Beta", "code": "BET"}, headers=root)
+    statuses = [TaskStatus.open] * 5 + [TaskStatus.in_progress] * 3 + [TaskStatus.done] * 2
+    async with db.begin() as conn:
+        await conn.execute(
+            insert(Task),
+            [{"team_id": 1, "author_id": 1, "title": f"Task {i}", "status": s} for i, s in enumerate(statuses)],
+        )
+    return root
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_task_writes(client, db):
+    root = await _setup(client, db)
+    await client.get("/users/me", headers=root)
+
+    with StatementCounter(db) as counter:
+        resp = await client.get("/teams/1/stats", headers=root)
+    assert resp.json() == {"team_id": 1, "open": 5, "in_progress": 3, "done": 2, "total": 10}
+    assert len(counter) == 2, counter.statements
+
+    await client.patch("/teams/1/tasks:bulk", json={"filter": {"status": ["open"]}, "status": "done"}, headers=root)
+    assert (await client.get("/teams/1/stats", headers=root)).json()["done"] == 7
+
+    async with db.begin() as conn:
+        # правка без смены статуса счётчики не трогает
+        await conn.execute(update(Task).where(Task.id == 1).values(title="Renamed"))
+        await conn.execute(update(Task).where(Task.id == 6).values(team_id=2))
+        await conn.execute(delete(Task).where(Task.id == 10))
+    assert (await client.get("/teams/1/stats", headers=root)).json() == {
+        "team_id": 1, "open": 0, "in_progress": 2, "done": 6, "total": 8,
+    }
+    assert (await client.get("/teams/2/stats", headers=root)).json()["in_progress"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stats_for_team_without_tasks_and_access(client, db):
+    root = await _setup(client, db)
+    outsider = await register_and_login(client, "outsider@example.com")
+
+    assert (await client.get("/teams/2/stats", headers=root)).json()["total"] == 0
+    assert (await client.get("/teams/1/stats", headers=outsider)).status_code == 403
+    assert (await client.get("/teams/9/stats", headers=root)).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_reconciler_recomputes_drifted_teams(client, db):
+    root = await _setup(client, db)
+    async with db.begin() as conn:
+        await conn.execute(update(TeamTaskStats).where(TeamTaskStats.team_id == 1).values(open=100))
+        await conn.execute(insert(TeamTaskStats).values(team_id=2, done=4))
+
+    reconciler = TaskStatsReconciler()
+    assert await reconciler.reconcile(db, batch_size=1) == 2
+    assert reconciler.stats()["fixed_total"] == 2
+    assert (await client.get("/teams/1/stats", headers=root)).json()["open"] == 5
+    assert (await client.get("/teams/2/stats", headers=root)).json()["total"] == 0
+    assert await reconciler.reconcile(db, batch_size=1) == 0
+
+
+@pytest.mark.asyncio
+async def test_deleting_team_cascades_tasks_and_stats(client, db):
+    root = await _setup(client, db)
+    resp = await client.post("/teams/1/tasks/1/comments", json={"body": "first"}, headers=root)
+    assert resp.status_code == 201, resp.text
+
+    assert (await client.delete("/teams/1", headers=root)).status_code == 204
+    async with db.connect() as conn:
+        assert await conn.scalar(select(func.count()).select_from(Task)) == 0
+        assert await conn.scalar(select(func.count()).select_from(TaskComment)) == 0
+        # каскад по задачам не должен воскрешать строку статистики удалённой команды
+        assert await conn.scalar(select(TeamTaskStats.team_id)) is None
+    assert (await client.get("/teams/2/stats", headers=root)).json()["total"] == 0
@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.auth.actions.create_superuser import create_superuser
+from app.crud import tasks as crud_tasks
+from app.models import Task
+from app.models.task import TaskStatus
+from tests.conftest import StatementCounter, register_and_login
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+async def _seed_board(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    member = await register_and_login(client, "member@example.com")
+    await client.post("/teams/", json={"name": "Alpha", "code": "ALP"}, headers=root)
+    await client.post("/members/1/members", json={"user_id": 2}, headers=root)
+    statuses = list(TaskStatus)
+    async with db.begin() as conn:
+        await conn.execute(
+            insert(Task),
+            [
+                {
+                    "team_id": 1,
+                    "author_id": 1,
+                    "assignee_id": 2 if i % 2 else None,
+                    "title": f"Task {i}",
+                    "status": statuses[i % 3],
+                    # равные дедлайны и NULL — чтобы курсор разбивал их по id
+                    "deadline": None if i % 4 == 0 else BASE + timedelta(days=i % 5),
+                }
+                for i in range(23)
+            ],
+        )
+    return root, member
+
+
+@pytest.mark.asyncio
+async def test_task_board_keyset_walk_matches_single_page(client, db):
+    root, member = await _seed_board(client, db)
+
+    everything = (await client.get("/teams/1/tasks", params={"limit": 500}, headers=member)).json()
+    assert everything["next_cursor"] is None and len(everything["items"]) == 23
+    expected = [t["id"] for t in everything["items"]]
+    first = everything["items"][0]
+    assert first["author"] == {"id": 1, "email": "root@example.com"}
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 4} | ({"cursor": cursor} if cursor else {})
+        resp = await client.get("/teams/1/tasks", params=params, headers=member)
+        assert resp.status_code == 200, resp.text
+        page = resp.json()
+        seen += [t["id"] for t in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+
+    # внутри статуса — по дедлайну, NULL в конце
+    for status in TaskStatus:
+        deadlines = [t["deadline"] for t in everything["items"] if t["status"] == status.value]
+        dated = [d for d in deadlines if d is not None]
+        assert deadlines == dated + [None] * (len(deadlines) - len(dated))
+        assert dated == sorted(dated)
+
+
+@pytest.mark.asyncio
+async def test_task_board_filters_and_batched_relations(client, db):
+    root, member = await _seed_board(client, db)
+    await client.get("/users/me", headers=member)
+
+    with StatementCounter(db) as counter:
+        resp = await client.get(
+            "/teams/1/tasks",
+            params={"status": ["open", "done"], "assignee_id": 2, "limit": 500},
+            headers=member,
+        )
+    items = resp.json()["items"]
+    assert items and all(t["status"] in ("open", "done") and t["assignee"]["id"] == 2 for t in items)
+    # доступ, задачи, авторы, исполнители — независимо от размера страницы
+    assert len(counter) == 4, counter.statements
+
+    resp = await client.get(
+        "/teams/1/tasks",
+        params={"deadline_from": (BASE + timedelta(days=1)).isoformat(), "deadline_to": (BASE + timedelta(days=3)).isoformat()},
+        headers=member,
+    )
+    days = {t["deadline"][:10] for t in resp.json()["items"]}
+    assert days == {"2026-01-02", "2026-01-03"}
+
+
+@pytest.mark.asyncio
+async def test_task_board_page_is_an_index_range(client, db):
+    for deadline in (None, BASE):
+        stmt = crud_tasks.board_page_query(1, limit=50, after=(TaskStatus.open, deadline, 7))
+        sql = str(stmt.compile(dialect=db.dialect, compile_kwargs={"literal_binds": True}))
+        async with db.connect() as conn:
+            plan = " ".join(row[-1] for row in (await conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)).all())
+        # NULLS LAST зашит в ключ индекса: ни сортировки, ни скана всей команды
+        assert "USING INDEX ix_task_team_board" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.mark.asyncio
+async def test_task_board_access_and_bad_cursor(client, db):
+    root, member = await _seed_board(client, db)
+    outsider = await register_and_login(client, "outsider@example.com")
+
+    assert (await client.get("/teams/1/tasks", headers=outsider)).status_code == 403
+    assert (await client.get("/teams/99/tasks", headers=root)).status_code == 404
+    assert (await client.get("/teams/1/tasks", params={"cursor": "garbage"}, headers=member)).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_transition_and_reassignment_in_one_statement(client, db):
+    root, member = await _seed_board(client, db)
+    await client.get("/users/me", headers=root)
+
+    with StatementCounter(db) as counter:
+        resp = await client.patch(
+            "/teams/1/tasks:bulk", json={"filter": {"status": ["in_progress"]}, "status": "done"}, headers=root
+        )
+    assert resp.status_code == 200, resp.text
+    result = resp.json()
+    assert result["updated"] == 8 and not result["has_more"]
+    updates = [s for s in counter.statements if s.lstrip().upper().startswith("UPDATE")]
+    assert len(updates) == 1 and "RETURNING" in updates[0].upper()
+
+    board = (await client.get("/teams/1/tasks", params={"limit": 500}, headers=member)).json()["items"]
+    assert not [t for t in board if t["status"] == "in_progress"]
+    moved = {t["id"]: t for t in board if t["id"] in result["ids"]}
+    assert all(t["status"] == "done" and t["updated_at"] for t in moved.values())
+
+    # повтор ничего не меняет: уже целевые строки в RETURNING не попадают
+    resp = await client.patch(
+        "/teams/1/tasks:bulk", json={"filter": {"status": ["in_progress"]}, "status": "done"}, headers=root
+    )
+    assert resp.json()["updated"] == 0
+
+    # уход сотрудника: снимаем его со всех задач
+    resp = await client.patch(
+        "/teams/1/tasks:bulk", json={"filter": {"assignee_id": 2}, "assignee_id": None}, headers=root
+    )
+    assert resp.json()["updated"] == 11
+    resp = await client.get("/teams/1/tasks", params={"assignee_id": 2}, headers=member)
+    assert resp.json()["items"] == []
+
+    resp = await client.patch("/teams/1/tasks:bulk", json={"ids": [1, 2], "assignee_id": 1}, headers=root)
+    assert sorted(resp.json()["ids"]) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_validation_and_permissions(client, db):
+    root, member = await _seed_board(client, db)
+    outsider = await register_and_login(client, "outsider@example.com")
+
+    url = "/teams/1/tasks:bulk"
+    assert (await client.patch(url, json={"ids": [1], "status": "done"}, headers=member)).status_code == 403
+    assert (await client.patch(url, json={"ids": [1]}, headers=root)).status_code == 422
+    assert (await client.patch(url, json={"status": "done"}, headers=root)).status_code == 422
+    # пустой фильтр не выбирает всю команду молча
+    for flt in ({}, {"status": None}, {"all": True, "status": ["open"]}):
+        resp = await client.patch(url, json={"filter": flt, "status": "done"}, headers=root)
+        assert resp.status_code == 422, flt
+    resp = await client.patch(url, json={"ids": [1], "assignee_id": 3}, headers=root)
+    assert resp.status_code == 422 and resp.json()["detail"] == "Assignee is not a member of this team"
+    assert (await client.patch("/teams/9/tasks:bulk", json={"ids": [1], "status": "done"}, headers=outsider)).status_code == 404
+
+    resp = await client.patch(url, json={"filter": {"all": True}, "status": "done"}, headers=root)
+    assert resp.status_code == 200, resp.text
+    stats = (await client.get("/teams/1/stats", headers=root)).json()
+    assert stats["done"] == stats["total"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_is_capped_per_request(client, db, monkeypatch):
+    root, member = await _seed_board(client, db)
+    monkeypatch.setattr("app.crud.tasks.BULK_UPDATE_MAX_ROWS", 10)
+
+    body = {"filter": {"status": ["open", "in_progress"]}, "status": "done"}
+    batches = []
+    while True:
+        result = (await client.patch("/teams/1/tasks:bulk", json=body, headers=root)).json()
+        batches.append(result["updated"])
+        if not result["has_more"]:
+            break
+    assert batches == [10, 6]
@@ -0,0 +1,32 @@
+import pytest
+
+from app.auth.actions.create_superuser import create_superuser
+from tests.conftest import StatementCounter, register_and_login
+
+
+@pytest.mark.asyncio
+async def test_team_admin_write_uses_single_access_query(client, db):
+    await create_superuser(email="root@example.com", password="password1")
+    root = await register_and_login(client, "root@example.com")
+    lead = await register_and_login(client, "lead@example.com")
+    member = await register_and_login(client, "member@example.com")
+    await register_and_login(client, "new@example.com")
+
+    resp = await client.post("/teams/", json={"name": "Alpha", "code": "ALP"}, headers=root)
+    team_id = resp.json()["id"]
+    await client.post(f"/members/{team_id}/members", json={"user_id": 2, "role": "admin"}, headers=root)
+    await client.post(f"/members/{team_id}/members", json={"user_id": 3}, headers=root)
+    await client.get("/users/me", headers=lead)
+
+    with StatementCounter(db) as counter:
+        resp = await client.patch(f"/members/{team_id}/members/3", json={"role": "manager"}, headers=lead)
+    assert resp.status_code == 200
+    assert resp.json()["role_in_team"] == "manager"
+    assert sum("FROM team LEFT OUTER JOIN workers" in s for s in counter.statements) == 1
+
+    resp = await client.post(f"/members/{team_id}/members", json={"user_id": 4}, headers=member)
+    assert resp.status_code == 403
+    resp = await client.get(f"/teams/{team_id}", headers=member)
+    assert resp.status_code == 200
+    resp = await client.get("/teams/999", headers=member)
+    assert resp.status_code == 404
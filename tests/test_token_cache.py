@@ -0,0 +1,69 @@
+from app.auth.token_cache import TokenCache
+
+
+def test_token_cache_hit_miss_and_lru():
+    cache = TokenCache(maxsize=2, ttl_seconds=60)
+    assert cache.get("a") is None
+    cache.set("a", 1, {"id": 1})
+    cache.set("b", 2, {"id": 2})
+    assert cache.get("a") == {"id": 1}
+    cache.set("c", 3, {"id": 3})
+    assert cache.get("b") is None
+    assert cache.stats() == {"size": 2, "hits": 1, "misses": 2, "evictions": 1}
+
+
+def test_token_cache_invalidation():
+    cache = TokenCache(maxsize=10, ttl_seconds=60)
+    cache.set("a", 1, {"id": 1})
+    cache.set("b", 1, {"id": 1})
+    cache.set("c", 2, {"id": 2})
+    cache.invalidate_user(1)
+    assert cache.get("a") is None and cache.get("b") is None
+    cache.invalidate_token("c")
+    assert len(cache) == 0
+
+
+def test_token_cache_expired_entry_is_dropped():
+    cache = TokenCache(maxsize=10, ttl_seconds=60)
+    cache.set("a", 1, {"id": 1}, ttl_seconds=0)
+    assert cache.get("a") is None
+    cache.set("b", 1, {"id": 1}, ttl_seconds=-5)
+    assert len(cache) == 0
+
+
+def test_token_cache_skips_set_invalidated_during_lookup():
+    cache = TokenCache(maxsize=10, ttl_seconds=60)
+
+    # промах начался, пока он читал БД — пользователя деактивировали
+    since = cache.begin_lookup()
+    cache.invalidate_user(1)
+    cache.set("a", 1, {"id": 1, "is_active": True}, since=since)
+    # токен другого пользователя, не затронутый инвалидацией, кэшируется как обычно
+    cache.set("b", 2, {"id": 2}, since=since)
+    cache.end_lookup(since)
+    assert cache.get("a") is None and cache.get("b") == {"id": 2}
+
+    since = cache.begin_lookup()
+    cache.invalidate_token("c")
+    cache.set("c", 3, {"id": 3}, since=since)
+    cache.end_lookup(since)
+    assert cache.get("c") is None
+
+    # промах, начатый после инвалидации, снова кэширует; записи об инвалидациях не копятся
+    since = cache.begin_lookup()
+    cache.set("a", 1, {"id": 1, "is_active": False}, since=since)
+    cache.end_lookup(since)
+    assert cache.get("a") == {"id": 1, "is_active": False}
+    assert not cache._invalidated_users and not cache._invalidated_tokens and not cache._lookups
+
+
+def test_token_cache_overlapping_lookups():
+    cache = TokenCache(maxsize=10, ttl_seconds=60)
+    first = cache.begin_lookup()
+    cache.invalidate_user(1)
+    second = cache.begin_lookup()
+    cache.end_lookup(first)
+    # второй промах начался уже после инвалидации — его результат свежий
+    cache.set("a", 1, {"id": 1}, since=second)
+    cache.end_lookup(second)
+    assert cache.get("a") == {"id": 1}
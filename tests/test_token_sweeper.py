@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.auth.token_sweeper import TokenSweeper
+from app.models import AccessToken
+from tests.conftest import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_only_expired_tokens_in_batches(client, db):
+    headers = await register_and_login(client, "user@example.com")
+    now = datetime.now(timezone.utc)
+    async with db.begin() as conn:
+        await conn.execute(
+            insert(AccessToken),
+            [
+                {"token": f"expired-{i}", "user_id": 1, "created_at": now - timedelta(hours=2, minutes=i)}
+                for i in range(7)
+            ],
+        )
+
+    sweeper = TokenSweeper()
+    purged = await sweeper.sweep(db, lifetime_seconds=3600, batch_size=3)
+
+    assert purged == 7
+    assert sweeper.stats()["runs"] == 1 and sweeper.stats()["last_purged"] == 7
+    async with db.connect() as conn:
+        tokens = (await conn.scalars(select(AccessToken.token))).all()
+    assert tokens == [headers["Authorization"].removeprefix("Bearer ")]
+    assert await sweeper.sweep(db, lifetime_seconds=3600, batch_size=3) == 0
+    assert sweeper.purged_total == 7
@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.crud import workers as crud_workers
+from app.db.session import AsyncSessionLocal
+from app.models.team import Worker
+from tests.conftest import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_ensure_exists_is_atomic_under_concurrency(client, db):
+    await register_and_login(client, "user@example.com")
+
+    async def call() -> int:
+        async with AsyncSessionLocal() as session:
+            worker = await crud_workers.ensure_exists(session, 1)
+            await session.commit()
+            return worker.id
+
+    ids = await asyncio.gather(*(call() for _ in range(100)))
+
+    assert len(set(ids)) == 1
+    async with AsyncSessionLocal() as session:
+        count = await session.scalar(select(func.count()).select_from(Worker).where(Worker.user_id == 1))
+    assert count == 1